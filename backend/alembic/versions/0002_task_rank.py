@@ -0,0 +1,30 @@
+"""任务 rank 排序键
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 存量任务 rank 为空串，首次以 rank 模式写入该列时按 position 补齐
+    op.add_column(
+        "tasks",
+        sa.Column("rank", sa.String(255), nullable=False, server_default=""),
+    )
+    op.create_index("ix_tasks_column_id_rank", "tasks", ["column_id", "rank"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tasks_column_id_rank", table_name="tasks")
+    op.drop_column("tasks", "rank")
@@ -0,0 +1,24 @@
+"""任务 (column_id, position) 复合索引
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 支撑移动时按 position 区间平移的 UPDATE
+    op.create_index("ix_tasks_column_id_position", "tasks", ["column_id", "position"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tasks_column_id_position", table_name="tasks")
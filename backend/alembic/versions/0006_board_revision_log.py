@@ -0,0 +1,47 @@
+"""看板修订记录表（只追加，替代 boards.revision 计数列）
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "board_revisions",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("board_id", sa.UUID(), nullable=False),
+        sa.Column("weight", sa.Integer(), nullable=False, server_default="1"),
+        sa.ForeignKeyConstraint(["board_id"], ["boards.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_board_revisions_board_id", "board_revisions", ["board_id"])
+    # 保留现有修订号：revision = 1 + sum(weight)
+    op.execute(
+        "INSERT INTO board_revisions (board_id, weight) "
+        "SELECT id, revision - 1 FROM boards WHERE revision > 1"
+    )
+    op.drop_column("boards", "revision")
+
+
+def downgrade() -> None:
+    op.add_column(
+        "boards",
+        sa.Column("revision", sa.Integer(), nullable=False, server_default="1"),
+    )
+    op.execute(
+        "UPDATE boards SET revision = 1 + COALESCE("
+        "(SELECT SUM(weight) FROM board_revisions WHERE board_id = boards.id), 0)"
+    )
+    op.drop_index("ix_board_revisions_board_id", table_name="board_revisions")
+    op.drop_table("board_revisions")
@@ -1,17 +1,129 @@
 """
-[INPUT]: 依赖 fastapi 的 Depends，依赖 app.db.session 的 get_db
-[OUTPUT]: 对外提供 get_db 依赖注入
+[INPUT]: 依赖 fastapi 的 Depends / Header / Response，依赖 app.db.session 的 get_db，app.crud 的分页游标与列 / 任务读取，app.schemas
+[OUTPUT]: 对外提供 get_db, get_if_match, get_if_none_match 依赖注入，version_conflict / order_conflict 冲突响应，board_etag / not_modified 条件请求，etag_json_response 预序列化响应，parse_cursor / NEXT_CURSOR_HEADER 游标分页
 [POS]: api 模块的依赖注入层，被所有 endpoints 消费
 [PROTOCOL]: 变更时更新此头部，然后检查 CLAUDE.md
 """
 from collections.abc import AsyncGenerator
+from typing import Iterable, Optional, TypeVar
+from uuid import UUID
 
+from fastapi import Header, HTTPException, Response, status
+from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.crud import (
+    BoardCursor,
+    TaskCursor,
+    decode_cursor,
+    get_column,
+    get_tasks_by_column,
+)
 from app.db.session import get_db as _get_db
+from app.schemas import ColumnRead, TaskRead
+
+# 分页列表的下一页游标响应头；末页不带此头
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+Cursor = TypeVar("Cursor", TaskCursor, BoardCursor)
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """数据库会话依赖"""
     async for session in _get_db():
         yield session
+
+
+def get_if_match(if_match: Optional[str] = Header(None)) -> Optional[int]:
+    """解析 If-Match 头中的版本号（支持 3 / "3" / W/"3"）"""
+    if if_match is None:
+        return None
+    value = if_match.strip().removeprefix("W/").strip('"')
+    try:
+        return int(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid If-Match header")
+
+
+def get_if_none_match(if_none_match: Optional[str] = Header(None)) -> Optional[str]:
+    """原样返回 If-None-Match 头（可能包含多个以逗号分隔的 ETag）"""
+    return if_none_match
+
+
+def board_etag(revision: int) -> str:
+    """由看板修订号生成 ETag"""
+    return f'"{revision}"'
+
+
+def not_modified(
+    response: Response, if_none_match: Optional[str], revision: int
+) -> Optional[Response]:
+    """
+    为响应设置 ETag；If-None-Match 命中（弱比较，支持 *）时返回 304 响应
+
+    修订号须在读取数据之前查询：期间的并发写入只会让 ETag 偏旧，客户端下次拿到完整响应
+    """
+    etag = board_etag(revision)
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in tags or "*" in tags:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return None
+
+
+def version_conflict(current: BaseModel) -> HTTPException:
+    """乐观并发冲突 - 409 并附带资源当前状态"""
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail={"message": "Version conflict", "current": current.model_dump(mode="json")},
+    )
+
+
+async def order_conflict(db: AsyncSession, column_ids: Iterable[UUID]) -> HTTPException:
+    """
+    回滚与并发重排冲突的事务，返回 409 并附带受影响列及其任务的当前状态
+
+    批量移动 / 删除、排序、整列迁移等多行写入使用；column_ids 须在写入前取得
+    （回滚后 ORM 对象已过期）
+    """
+    await db.rollback()
+    columns, tasks = [], []
+    for column_id in sorted(set(column_ids), key=str):
+        column = await get_column(db, column_id)
+        if column is None:
+            continue
+        columns.append(ColumnRead.model_validate(column).model_dump(mode="json"))
+        tasks.extend(
+            TaskRead.model_validate(t).model_dump(mode="json")
+            for t in await get_tasks_by_column(db, column_id)
+        )
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail={"message": "Version conflict", "current": {"columns": columns, "tasks": tasks}},
+    )
+
+
+def etag_json_response(
+    body: bytes, revision: int, headers: Optional[dict[str, str]] = None
+) -> Response:
+    """
+    直接返回已序列化的 JSON 响应体（读缓存路径，跳过 response_model 的校验与序列化）
+
+    返回 Response 时注入的 response 上的头不会合并，ETag 等响应头须在此重新设置
+    """
+    return Response(
+        body,
+        media_type="application/json",
+        headers={**(headers or {}), "ETag": board_etag(revision)},
+    )
+
+
+def parse_cursor(kind: type[Cursor], cursor: Optional[str]) -> Optional[Cursor]:
+    """解析 cursor 查询参数，不合法时返回 400"""
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(kind, cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
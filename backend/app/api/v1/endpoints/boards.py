@@ -2,26 +2,42 @@
 #  Boards API Endpoints
 # ==============================================================================
 """
-[INPUT]: 依赖 app.crud, app.schemas, app.api.deps
-[OUTPUT]: 对外提供 boards CRUD API 路由
+[INPUT]: 依赖 app.crud, app.schemas, app.api.deps, app.services.cache
+[OUTPUT]: 对外提供 boards CRUD API 路由（列表支持游标分页）
 [POS]: api/v1/endpoints 的看板端点
 [PROTOCOL]: 变更时更新此头部，然后检查 CLAUDE.md
 """
+from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db
+from app.api.deps import (
+    NEXT_CURSOR_HEADER,
+    etag_json_response,
+    get_db,
+    get_if_none_match,
+    not_modified,
+    parse_cursor,
+)
 from app.crud import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    BoardCursor,
     create_board,
     delete_board,
+    encode_cursor,
     get_board,
+    get_board_revision,
+    get_board_snapshot,
     get_boards_by_owner,
+    get_boards_page,
     get_user_by_id,
     update_board,
 )
-from app.schemas import BoardCreate, BoardRead, BoardUpdate
+from app.schemas import BoardCreate, BoardRead, BoardSnapshot, BoardUpdate
+from app.services.cache import board_cache
 
 router = APIRouter(prefix="/boards", tags=["boards"])
 
@@ -44,11 +60,27 @@ async def get_current_user_id(db: AsyncSession = Depends(get_db)) -> UUID:
 # -----------------------------------------------------------------------------
 @router.get("", response_model=list[BoardRead])
 async def list_boards(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
     db: AsyncSession = Depends(get_db),
     user_id: UUID = Depends(get_current_user_id),
 ) -> list[BoardRead]:
-    """获取当前用户的所有看板"""
-    boards = await get_boards_by_owner(db, user_id)
+    """
+    获取当前用户的看板（按创建时间倒序）
+
+    limit / cursor: 传入任一即按 (created_at, id) 分页，下一页游标在 X-Next-Cursor 响应头中；
+                    均不传时一次返回全部看板
+    """
+    if limit is None and cursor is None:
+        boards = await get_boards_by_owner(db, user_id)
+        return [BoardRead.model_validate(b) for b in boards]
+    after = parse_cursor(BoardCursor, cursor)
+    boards, next_cursor = await get_boards_page(
+        db, user_id, limit or DEFAULT_PAGE_SIZE, after=after
+    )
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(next_cursor)
     return [BoardRead.model_validate(b) for b in boards]
 
 
@@ -66,18 +98,52 @@ async def create_board_endpoint(
 @router.get("/{board_id}", response_model=BoardRead)
 async def get_board_endpoint(
     board_id: UUID,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     user_id: UUID = Depends(get_current_user_id),
+    if_none_match: Optional[str] = Depends(get_if_none_match),
 ) -> BoardRead:
-    """获取看板详情"""
+    """获取看板详情（带 ETag，If-None-Match 命中时返回 304）"""
     board = await get_board(db, board_id)
     if not board:
         raise HTTPException(status_code=404, detail="Board not found")
     if board.owner_id != user_id:
         raise HTTPException(status_code=403, detail="Not authorized")
+    if cached := not_modified(response, if_none_match, board.revision):
+        return cached
     return BoardRead.model_validate(board)
 
 
+@router.get("/{board_id}/snapshot", response_model=BoardSnapshot)
+async def get_board_snapshot_endpoint(
+    board_id: UUID,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    user_id: UUID = Depends(get_current_user_id),
+    if_none_match: Optional[str] = Depends(get_if_none_match),
+) -> BoardSnapshot:
+    """
+    获取看板快照：看板、有序的列及各列有序的任务（替代分别请求看板 / 列 / 任务）
+
+    带 ETag；If-None-Match 命中或读缓存命中时只查询修订号
+    """
+    current = await get_board_revision(db, board_id)
+    if not current:
+        raise HTTPException(status_code=404, detail="Board not found")
+    if current.owner_id != user_id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    if cached := not_modified(response, if_none_match, current.revision):
+        return cached
+    body = board_cache.get(board_id, "snapshot", current.revision)
+    if body is None:
+        board = await get_board_snapshot(db, board_id)
+        if not board:
+            raise HTTPException(status_code=404, detail="Board not found")
+        body = BoardSnapshot.model_validate(board).model_dump_json().encode()
+        board_cache.put(board_id, "snapshot", current.revision, body)
+    return etag_json_response(body, current.revision)
+
+
 @router.patch("/{board_id}", response_model=BoardRead)
 async def update_board_endpoint(
     board_id: UUID,
@@ -108,3 +174,4 @@ async def delete_board_endpoint(
     if board.owner_id != user_id:
         raise HTTPException(status_code=403, detail="Not authorized")
     await delete_board(db, board)
+    board_cache.invalidate(board_id)
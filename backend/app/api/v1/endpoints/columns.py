@@ -2,29 +2,60 @@
 #  Columns API Endpoints
 # ==============================================================================
 """
-[INPUT]: 依赖 app.crud, app.schemas, app.api.deps
-[OUTPUT]: 对外提供 columns CRUD API 路由
+[INPUT]: 依赖 app.crud, app.schemas, app.api.deps, app.services (含 cache 读缓存)
+[OUTPUT]: 对外提供 columns CRUD + 整体排序 + 列内任务排序 + 整列迁移 API 路由
 [POS]: api/v1/endpoints 的列端点
 [PROTOCOL]: 变更时更新此头部，然后检查 CLAUDE.md
 """
+from typing import Literal, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
 
-from app.api.deps import get_db
+from app.api.deps import (
+    etag_json_response,
+    get_db,
+    get_if_match,
+    get_if_none_match,
+    not_modified,
+    order_conflict,
+    version_conflict,
+)
 from app.crud import (
     create_column,
     delete_column,
     get_board,
+    get_board_revision,
     get_column,
     get_columns_by_board,
+    get_tasks_by_column,
+    reorder_columns,
     update_column,
 )
-from app.schemas import ColumnCreate, ColumnRead, ColumnUpdate
+from app.schemas import (
+    ColumnCreate,
+    ColumnMoveAll,
+    ColumnOrder,
+    ColumnRead,
+    ColumnUpdate,
+    TaskRead,
+)
+from app.schemas.events import (
+    ColumnSortedPayload,
+    ColumnsReorderedPayload,
+    ColumnTasksMovedPayload,
+)
+from app.services import move_all_tasks, sort_column
+from app.services.cache import board_cache
+from app.services.realtime import broadcast_event
 
 router = APIRouter(tags=["columns"])
 
+_COLUMN_LIST = TypeAdapter(list[ColumnRead])
+
 
 # -----------------------------------------------------------------------------
 #  Board-scoped Endpoints
@@ -32,14 +63,24 @@ router = APIRouter(tags=["columns"])
 @router.get("/boards/{board_id}/columns", response_model=list[ColumnRead])
 async def list_columns(
     board_id: UUID,
+    response: Response,
     db: AsyncSession = Depends(get_db),
+    if_none_match: Optional[str] = Depends(get_if_none_match),
 ) -> list[ColumnRead]:
-    """获取看板的所有列"""
-    board = await get_board(db, board_id)
+    """获取看板的所有列（带 ETag 与按修订号的读缓存，同任务列表）"""
+    board = await get_board_revision(db, board_id)
     if not board:
         raise HTTPException(status_code=404, detail="Board not found")
-    columns = await get_columns_by_board(db, board_id)
-    return [ColumnRead.model_validate(c) for c in columns]
+    if cached := not_modified(response, if_none_match, board.revision):
+        return cached
+    body = board_cache.get(board_id, "columns", board.revision)
+    if body is None:
+        columns = await get_columns_by_board(db, board_id)
+        body = _COLUMN_LIST.dump_json(
+            _COLUMN_LIST.validate_python(columns, from_attributes=True)
+        )
+        board_cache.put(board_id, "columns", board.revision, body)
+    return etag_json_response(body, board.revision)
 
 
 @router.post(
@@ -60,6 +101,36 @@ async def create_column_endpoint(
     return ColumnRead.model_validate(column)
 
 
+@router.put("/boards/{board_id}/columns/order", response_model=list[ColumnRead])
+async def reorder_columns_endpoint(
+    board_id: UUID,
+    order_in: ColumnOrder,
+    db: AsyncSession = Depends(get_db),
+) -> list[ColumnRead]:
+    """按给定顺序重排看板的全部列（单条 UPDATE）"""
+    board = await get_board(db, board_id)
+    if not board:
+        raise HTTPException(status_code=404, detail="Board not found")
+
+    column_ids = {c.id for c in await get_columns_by_board(db, board_id)}
+    if len(order_in.column_ids) != len(column_ids) or set(order_in.column_ids) != column_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="column_ids must list every column of the board exactly once",
+        )
+
+    columns = await reorder_columns(db, board_id, order_in.column_ids)
+
+    # 广播事件
+    await broadcast_event(
+        board_id,
+        "columns_reordered",
+        ColumnsReorderedPayload(column_ids=[c.id for c in columns]),
+    )
+
+    return [ColumnRead.model_validate(c) for c in columns]
+
+
 # -----------------------------------------------------------------------------
 #  Column-scoped Endpoints
 # -----------------------------------------------------------------------------
@@ -68,12 +139,23 @@ async def update_column_endpoint(
     column_id: UUID,
     column_in: ColumnUpdate,
     db: AsyncSession = Depends(get_db),
+    if_match: Optional[int] = Depends(get_if_match),
 ) -> ColumnRead:
-    """更新列"""
+    """更新列（支持 expected_version / If-Match 乐观并发）"""
     column = await get_column(db, column_id)
     if not column:
         raise HTTPException(status_code=404, detail="Column not found")
-    column = await update_column(db, column, column_in)
+    expected = column_in.expected_version or if_match
+    if expected is not None and column.version != expected:
+        raise version_conflict(ColumnRead.model_validate(column))
+    try:
+        column = await update_column(db, column, column_in)
+    except StaleDataError:
+        await db.rollback()
+        column = await get_column(db, column_id)
+        if not column:
+            raise HTTPException(status_code=404, detail="Column not found")
+        raise version_conflict(ColumnRead.model_validate(column))
     return ColumnRead.model_validate(column)
 
 
@@ -87,3 +169,74 @@ async def delete_column_endpoint(
     if not column:
         raise HTTPException(status_code=404, detail="Column not found")
     await delete_column(db, column)
+
+
+@router.post("/columns/{column_id}/sort", response_model=list[TaskRead])
+async def sort_column_endpoint(
+    column_id: UUID,
+    by: Literal["title", "created_at", "updated_at"] = Query(...),
+    dir: Literal["asc", "desc"] = Query("asc"),
+    db: AsyncSession = Depends(get_db),
+) -> list[TaskRead]:
+    """按字段对列内任务排序（单条 UPDATE），广播 column_sorted"""
+    column = await get_column(db, column_id)
+    if not column:
+        raise HTTPException(status_code=404, detail="Column not found")
+
+    board_id = column.board_id
+    try:
+        await sort_column(db, column_id, by, descending=dir == "desc")
+    except StaleDataError:
+        raise await order_conflict(db, {column_id})
+    tasks = await get_tasks_by_column(db, column_id)
+
+    # 广播事件（只携带新顺序）
+    await broadcast_event(
+        board_id,
+        "column_sorted",
+        ColumnSortedPayload(column_id=column_id, task_ids=[t.id for t in tasks]),
+    )
+
+    return [TaskRead.model_validate(t) for t in tasks]
+
+
+@router.post("/columns/{column_id}/move-all", response_model=list[TaskRead])
+async def move_all_tasks_endpoint(
+    column_id: UUID,
+    move_in: ColumnMoveAll,
+    db: AsyncSession = Depends(get_db),
+) -> list[TaskRead]:
+    """将列内全部任务迁移到同一看板的另一列（单事务集合操作），返回目标列任务"""
+    column = await get_column(db, column_id)
+    if not column:
+        raise HTTPException(status_code=404, detail="Column not found")
+    target = await get_column(db, move_in.to_column_id)
+    if not target or target.board_id != column.board_id:
+        raise HTTPException(status_code=404, detail="Target column not found")
+    if target.id == column.id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Target column must differ from source column",
+        )
+
+    board_id = column.board_id
+    try:
+        moved = await move_all_tasks(db, column_id, target.id, move_in.placement)
+    except StaleDataError:
+        raise await order_conflict(db, {column_id, target.id})
+
+    if moved:
+        # 广播事件
+        await broadcast_event(
+            board_id,
+            "column_tasks_moved",
+            ColumnTasksMovedPayload(
+                from_column_id=column_id,
+                to_column_id=move_in.to_column_id,
+                placement=move_in.placement,
+                task_ids=moved,
+            ),
+        )
+
+    tasks = await get_tasks_by_column(db, move_in.to_column_id)
+    return [TaskRead.model_validate(t) for t in tasks]
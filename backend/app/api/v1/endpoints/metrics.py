@@ -0,0 +1,23 @@
+"""
+[INPUT]: 依赖 fastapi 的 APIRouter，依赖 app.core.metrics 的 metrics，依赖 app.services.realtime 的连接管理器，app.services.cache 的看板读缓存
+[OUTPUT]: 对外提供 router (metrics 路由)
+[POS]: endpoints 模块的运行时指标端点，用于观察锁等待、广播等内部状态
+[PROTOCOL]: 变更时更新此头部，然后检查 CLAUDE.md
+"""
+from fastapi import APIRouter
+
+from app.core.metrics import metrics
+from app.services.cache import board_cache
+from app.services.realtime import manager
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics")
+async def get_metrics() -> dict:
+    """当前进程的运行时指标（含 WebSocket 连接注册表与看板读缓存快照）"""
+    return {
+        **metrics.snapshot(),
+        "websockets": manager.snapshot(),
+        "board_cache": board_cache.snapshot(),
+    }
@@ -2,46 +2,142 @@
 #  Tasks API Endpoints
 # ==============================================================================
 """
-[INPUT]: 依赖 app.crud, app.schemas, app.api.deps, app.services
-[OUTPUT]: 对外提供 tasks CRUD + move API 路由
+[INPUT]: 依赖 app.crud, app.schemas, app.api.deps, app.services (含 cache 读缓存)
+[OUTPUT]: 对外提供 tasks CRUD（列表支持按列过滤、游标分页与摘要视图） + move / 批量 move / 批量 delete API 路由
 [POS]: api/v1/endpoints 的任务端点
 [PROTOCOL]: 变更时更新此头部，然后检查 CLAUDE.md
 """
+from typing import Literal, Optional, Union
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
 
-from app.api.deps import get_db
+from app.api.deps import (
+    NEXT_CURSOR_HEADER,
+    etag_json_response,
+    get_db,
+    get_if_match,
+    get_if_none_match,
+    not_modified,
+    order_conflict,
+    parse_cursor,
+    version_conflict,
+)
 from app.crud import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    TaskCursor,
     create_task,
     delete_task,
+    delete_tasks,
+    encode_cursor,
     get_board,
+    get_board_revision,
+    get_columns_by_board,
     get_task,
     get_tasks_by_board,
+    get_tasks_by_ids,
+    get_tasks_page,
     update_task,
 )
-from app.schemas import TaskCreate, TaskMove, TaskRead, TaskUpdate
-from app.services import move_task
+from app.schemas import (
+    TaskBatchDelete,
+    TaskBatchMove,
+    TaskCreate,
+    TaskMove,
+    TaskRead,
+    TaskSummary,
+    TaskUpdate,
+)
+from app.schemas.events import (
+    TaskCreatedPayload,
+    TaskDeletedPayload,
+    TaskMovedPayload,
+    TasksDeletedPayload,
+    TasksMovedPayload,
+    TaskUpdatedPayload,
+)
+from app.services import move_task_with_shifts, move_tasks
+from app.services.cache import board_cache
 from app.services.realtime import broadcast_event
 
 router = APIRouter(tags=["tasks"])
 
+_TASK_LIST = TypeAdapter(list[TaskRead])
+_TASK_SUMMARY_LIST = TypeAdapter(list[TaskSummary])
+
+
+async def _task_conflict(db: AsyncSession, task_id: UUID) -> HTTPException:
+    """回滚并发冲突的事务，返回携带任务最新状态的 409"""
+    await db.rollback()
+    task = await get_task(db, task_id)
+    if not task:
+        return HTTPException(status_code=404, detail="Task not found")
+    return version_conflict(TaskRead.model_validate(task))
+
 
 # -----------------------------------------------------------------------------
 #  Board-scoped Endpoints
 # -----------------------------------------------------------------------------
-@router.get("/boards/{board_id}/tasks", response_model=list[TaskRead])
+@router.get(
+    "/boards/{board_id}/tasks",
+    response_model=Union[list[TaskRead], list[TaskSummary]],
+)
 async def list_tasks(
     board_id: UUID,
+    response: Response,
+    column_id: Optional[UUID] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    view: Literal["full", "summary"] = Query("full"),
     db: AsyncSession = Depends(get_db),
-) -> list[TaskRead]:
-    """获取看板的所有任务"""
-    board = await get_board(db, board_id)
+    if_none_match: Optional[str] = Depends(get_if_none_match),
+) -> Response:
+    """
+    获取看板的任务（带 ETag，If-None-Match 命中时只查询修订号并返回 304）
+
+    column_id: 只返回该列的任务
+    limit / cursor: 传入任一即按 (column_id, 顺序, id) 分页，下一页游标在 X-Next-Cursor 响应头中；
+                    均不传时一次返回全部任务，整看板列表的序列化结果按修订号缓存
+    view: summary 返回 TaskSummary（不含 description，查询也不读取该列），供看板卡片视图使用
+    """
+    board = await get_board_revision(db, board_id)
     if not board:
         raise HTTPException(status_code=404, detail="Board not found")
-    tasks = await get_tasks_by_board(db, board_id)
-    return [TaskRead.model_validate(t) for t in tasks]
+    if cached := not_modified(response, if_none_match, board.revision):
+        return cached
+
+    summary = view == "summary"
+    adapter = _TASK_SUMMARY_LIST if summary else _TASK_LIST
+    paged = limit is not None or cursor is not None
+    if not paged and column_id is None:
+        cache_view = "tasks:summary" if summary else "tasks"
+        body = board_cache.get(board_id, cache_view, board.revision)
+        if body is None:
+            tasks = await get_tasks_by_board(db, board_id, summary=summary)
+            body = adapter.dump_json(adapter.validate_python(tasks, from_attributes=True))
+            board_cache.put(board_id, cache_view, board.revision, body)
+        return etag_json_response(body, board.revision)
+
+    headers: dict[str, str] = {}
+    if paged:
+        tasks, next_cursor = await get_tasks_page(
+            db,
+            board_id,
+            limit or DEFAULT_PAGE_SIZE,
+            after=parse_cursor(TaskCursor, cursor),
+            column_id=column_id,
+            summary=summary,
+        )
+        if next_cursor is not None:
+            headers[NEXT_CURSOR_HEADER] = encode_cursor(next_cursor)
+    else:
+        tasks = await get_tasks_by_board(db, board_id, column_id=column_id, summary=summary)
+    body = adapter.dump_json(adapter.validate_python(tasks, from_attributes=True))
+    return etag_json_response(body, board.revision, headers)
 
 
 @router.post(
@@ -54,23 +150,27 @@ async def create_task_endpoint(
     task_in: TaskCreate,
     db: AsyncSession = Depends(get_db),
 ) -> TaskRead:
-    """创建新任务"""
+    """创建新任务（与并发重排同一列冲突时返回 409）"""
     board = await get_board(db, board_id)
     if not board:
         raise HTTPException(status_code=404, detail="Board not found")
-    task = await create_task(db, task_in, board_id=board_id)
+    try:
+        task = await create_task(db, task_in, board_id=board_id)
+    except StaleDataError:
+        raise await order_conflict(db, {task_in.column_id})
 
     # 广播事件
     await broadcast_event(
         board_id,
         "task_created",
-        {
-            "id": str(task.id),
-            "column_id": str(task.column_id),
-            "title": task.title,
-            "description": task.description,
-            "position": task.position,
-        },
+        TaskCreatedPayload(
+            id=task.id,
+            column_id=task.column_id,
+            title=task.title,
+            description=task.description,
+            position=task.position,
+            version=task.version,
+        ),
     )
 
     return TaskRead.model_validate(task)
@@ -96,22 +196,30 @@ async def update_task_endpoint(
     task_id: UUID,
     task_in: TaskUpdate,
     db: AsyncSession = Depends(get_db),
+    if_match: Optional[int] = Depends(get_if_match),
 ) -> TaskRead:
-    """更新任务"""
+    """更新任务（支持 expected_version / If-Match 乐观并发）"""
     task = await get_task(db, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
-    task = await update_task(db, task, task_in)
+    expected = task_in.expected_version or if_match
+    if expected is not None and task.version != expected:
+        raise version_conflict(TaskRead.model_validate(task))
+    try:
+        task = await update_task(db, task, task_in)
+    except StaleDataError:
+        raise await _task_conflict(db, task_id)
 
     # 广播事件
     await broadcast_event(
         task.board_id,
         "task_updated",
-        {
-            "id": str(task.id),
-            "title": task.title,
-            "description": task.description,
-        },
+        TaskUpdatedPayload(
+            id=task.id,
+            column_id=task.column_id,
+            title=task.title,
+            description=task.description,
+        ),
     )
 
     return TaskRead.model_validate(task)
@@ -128,12 +236,47 @@ async def delete_task_endpoint(
         raise HTTPException(status_code=404, detail="Task not found")
 
     board_id = task.board_id
-    task_id_str = str(task.id)
+    try:
+        deletion = await delete_task(db, task)
+    except StaleDataError:
+        raise await _task_conflict(db, task_id)
 
-    await delete_task(db, task)
+    # 广播事件（携带被平移的位置区间）
+    await broadcast_event(
+        board_id,
+        "task_deleted",
+        TaskDeletedPayload(**deletion),
+    )
 
-    # 广播事件
-    await broadcast_event(board_id, "task_deleted", {"id": task_id_str})
+
+@router.post("/boards/{board_id}/tasks/delete", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_tasks_endpoint(
+    board_id: UUID,
+    batch_in: TaskBatchDelete,
+    db: AsyncSession = Depends(get_db),
+) -> None:
+    """批量删除任务（单事务，每个受影响列只压缩一次）"""
+    board = await get_board(db, board_id)
+    if not board:
+        raise HTTPException(status_code=404, detail="Board not found")
+
+    task_ids = set(batch_in.task_ids)
+    tasks = await get_tasks_by_ids(db, board_id, task_ids)
+    if len(tasks) != len(task_ids):
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    affected = {task.column_id for task in tasks}
+    try:
+        deletions = await delete_tasks(db, tasks)
+    except StaleDataError:
+        raise await order_conflict(db, affected)
+
+    # 广播聚合事件
+    await broadcast_event(
+        board_id,
+        "tasks_deleted",
+        TasksDeletedPayload(deletions=[TaskDeletedPayload(**d) for d in deletions]),
+    )
 
 
 # -----------------------------------------------------------------------------
@@ -144,25 +287,80 @@ async def move_task_endpoint(
     task_id: UUID,
     move_in: TaskMove,
     db: AsyncSession = Depends(get_db),
+    if_match: Optional[int] = Depends(get_if_match),
 ) -> TaskRead:
-    """移动任务到目标列的指定位置"""
+    """移动任务到目标列的指定位置（并发重排同一列时返回 409）"""
     task = await get_task(db, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
+    expected = move_in.expected_version or if_match
+    if expected is not None and task.version != expected:
+        raise version_conflict(TaskRead.model_validate(task))
 
-    from_column_id = task.column_id
-    task = await move_task(db, task, move_in.column_id, move_in.position)
+    try:
+        task, payload = await move_task_with_shifts(
+            db, task, move_in.column_id, move_in.position
+        )
+    except StaleDataError:
+        raise await _task_conflict(db, task_id)
 
-    # 广播事件
+    # 广播事件（附带兄弟任务的区间平移，客户端无需重新拉取列）
+    await broadcast_event(task.board_id, "task_moved", payload)
+
+    return TaskRead.model_validate(task)
+
+
+@router.patch("/boards/{board_id}/tasks/move", response_model=list[TaskRead])
+async def move_tasks_endpoint(
+    board_id: UUID,
+    batch_in: TaskBatchMove,
+    db: AsyncSession = Depends(get_db),
+) -> list[TaskRead]:
+    """批量移动任务（单事务，按顺序应用）"""
+    board = await get_board(db, board_id)
+    if not board:
+        raise HTTPException(status_code=404, detail="Board not found")
+
+    task_ids = {m.task_id for m in batch_in.moves}
+    tasks = {t.id: t for t in await get_tasks_by_ids(db, board_id, task_ids)}
+    if len(tasks) != len(task_ids):
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    column_ids = {c.id for c in await get_columns_by_board(db, board_id)}
+    if any(m.column_id not in column_ids for m in batch_in.moves):
+        raise HTTPException(status_code=404, detail="Column not found")
+
+    for m in batch_in.moves:
+        task = tasks[m.task_id]
+        if m.expected_version is not None and task.version != m.expected_version:
+            raise version_conflict(TaskRead.model_validate(task))
+
+    from_column_ids = {task_id: task.column_id for task_id, task in tasks.items()}
+    try:
+        moved = await move_tasks(
+            db, [(tasks[m.task_id], m.column_id, m.position) for m in batch_in.moves]
+        )
+    except StaleDataError:
+        raise await order_conflict(
+            db, {*from_column_ids.values(), *(m.column_id for m in batch_in.moves)}
+        )
+
+    # 广播聚合事件
     await broadcast_event(
-        task.board_id,
-        "task_moved",
-        {
-            "id": str(task.id),
-            "from_column_id": str(from_column_id),
-            "to_column_id": str(task.column_id),
-            "position": task.position,
-        },
+        board_id,
+        "tasks_moved",
+        TasksMovedPayload(
+            moves=[
+                TaskMovedPayload(
+                    id=task.id,
+                    from_column_id=from_column_ids[task.id],
+                    to_column_id=task.column_id,
+                    position=task.position,
+                    version=task.version,
+                )
+                for task in moved
+            ]
+        ),
     )
 
-    return TaskRead.model_validate(task)
+    return [TaskRead.model_validate(t) for t in moved]
@@ -2,31 +2,115 @@
 #  WebSocket Endpoint
 # ==============================================================================
 """
-[INPUT]: 依赖 fastapi.WebSocket, app.services.realtime
-[OUTPUT]: 对外提供 WebSocket /ws/boards/{board_id} 端点
+[INPUT]: 依赖 fastapi.WebSocket, pydantic TypeAdapter, app.schemas.events, app.services.realtime, app.services.encoding
+[OUTPUT]: 对外提供 WebSocket /ws/boards/{board_id} 单看板端点与 /ws 多路复用端点
 [POS]: api/v1/endpoints 的 WebSocket 端点
 [PROTOCOL]: 变更时更新此头部，然后检查 CLAUDE.md
 """
+from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
+from app.schemas.events import (
+    ClientMessage,
+    JoinBoardMessage,
+    LeaveBoardMessage,
+    SubscribeMessage,
+)
+from app.services.encoding import negotiate_subprotocol
 from app.services.realtime import manager
 
 router = APIRouter()
 
+# 单看板端点只接受订阅消息；多路复用端点另可加入 / 退出看板
+_BOARD_MESSAGES = TypeAdapter(SubscribeMessage)
+_CLIENT_MESSAGES = TypeAdapter(ClientMessage)
 
-@router.websocket("/ws/boards/{board_id}")
-async def websocket_endpoint(websocket: WebSocket, board_id: UUID) -> None:
-    """WebSocket 连接端点"""
-    await manager.connect(websocket, board_id)
 
+async def _receive_loop(websocket: WebSocket, messages: TypeAdapter) -> None:
+    """
+    接收循环：任何客户端消息都刷新心跳（服务端 ping 帧的回复同样走这里），
+    "ping" 回复 pong 控制帧，JSON 消息按 messages 校验后分发；不合法时回复 error 帧。
+    回复一律经连接的发送队列（manager.reply），socket 只有写协程一个发送方
+    """
     try:
         while True:
-            # 保持连接，等待消息（可用于心跳）
             data = await websocket.receive_text()
-            # 目前忽略客户端消息，仅用于保持连接
+            manager.touch(websocket)
             if data == "ping":
-                await websocket.send_text("pong")
+                manager.reply(websocket, "pong")
+            elif data.startswith("{"):
+                try:
+                    message = messages.validate_json(data)
+                except ValidationError as exc:
+                    manager.reply(
+                        websocket,
+                        "error",
+                        detail=exc.errors(include_url=False, include_context=False),
+                    )
+                    continue
+                _dispatch(websocket, message)
     except WebSocketDisconnect:
-        manager.disconnect(websocket, board_id)
+        manager.disconnect(websocket)
+
+
+def _dispatch(websocket: WebSocket, message: BaseModel) -> None:
+    """按消息类型调用连接管理器"""
+    if isinstance(message, SubscribeMessage):
+        manager.subscribe(websocket, columns=message.columns, events=message.events)
+    elif isinstance(message, JoinBoardMessage):
+        if not manager.join(
+            websocket, message.board_id, since=message.since, epoch=message.epoch
+        ):
+            manager.reply(
+                websocket,
+                "error",
+                board_id=message.board_id,
+                detail="Board connection limit reached",
+            )
+    elif isinstance(message, LeaveBoardMessage):
+        manager.leave(websocket, message.board_id)
+        manager.reply(websocket, "left", board_id=message.board_id)
+
+
+@router.websocket("/ws/boards/{board_id}")
+async def websocket_endpoint(
+    websocket: WebSocket,
+    board_id: UUID,
+    since: Optional[int] = Query(None, ge=0),
+    epoch: Optional[str] = Query(None),
+) -> None:
+    """
+    WebSocket 连接端点
+
+    since / epoch: 重连时最后收到的事件序号与 hello 帧中的 epoch
+    子协议: kanban.msgpack 使用二进制帧，kanban.json 或不指定使用 JSON 文本帧
+    心跳: 服务端对静默连接发送 {"type": "ping"} 帧，客户端回复任意文本（如 "pong"）；
+          客户端发送 "ping" 时服务端回复 {"type": "pong"} 帧
+    订阅: 发送 {"type": "subscribe", "columns": [...], "events": [...]} 只接收匹配的事件，
+          服务端以 subscribed 帧确认；消息不合法时回复 error 帧
+    """
+    subprotocol = negotiate_subprotocol(websocket.scope.get("subprotocols", []))
+    if not await manager.connect(
+        websocket, board_id, since=since, epoch=epoch, subprotocol=subprotocol
+    ):
+        return
+    await _receive_loop(websocket, _BOARD_MESSAGES)
+
+
+@router.websocket("/ws")
+async def multiplexed_websocket_endpoint(websocket: WebSocket) -> None:
+    """
+    多路复用 WebSocket 端点：一个连接订阅多个看板，共用一个心跳与接收循环
+
+    加入: {"type": "join", "board_id": ..., "since"?: ..., "epoch"?: ...}，回复该看板的 hello
+          （及补发 / resync），之后该看板的事件帧以 board_id 区分
+    退出: {"type": "leave", "board_id": ...}，回复 left 帧
+    订阅过滤、心跳与子协议同单看板端点；过滤条件作用于已加入的全部看板
+    """
+    subprotocol = negotiate_subprotocol(websocket.scope.get("subprotocols", []))
+    if not await manager.connect(websocket, subprotocol=subprotocol):
+        return
+    await _receive_loop(websocket, _CLIENT_MESSAGES)
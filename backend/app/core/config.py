@@ -5,6 +5,7 @@
 [PROTOCOL]: 变更时更新此头部，然后检查 CLAUDE.md
 """
 from functools import lru_cache
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -30,6 +31,60 @@ class Settings(BaseSettings):
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 60 * 24 * 7  # 7 days
 
+    # -------------------------------------------------------------------------
+    #  排序配置
+    # -------------------------------------------------------------------------
+    # position: 整数下标（移动时改写受影响行）; rank: 字典序 rank 键（移动只改写一行）
+    ordering_mode: Literal["position", "rank"] = "position"
+    # rank 再平衡后台任务: 扫描间隔（秒，0 为关闭）、键长阈值、每轮处理列数、每批写入行数
+    rank_rebalance_interval: float = 30.0
+    rank_max_length: int = 12
+    rank_rebalance_columns: int = 10
+    rank_rebalance_batch_size: int = 500
+    # 列级写锁: 开启后同一列的排序写入串行执行（PostgreSQL 用 advisory lock，SQLite 用进程内锁）
+    column_write_lock: bool = False
+
+    # -------------------------------------------------------------------------
+    #  WebSocket 配置
+    # -------------------------------------------------------------------------
+    # 每个连接的发送队列容量；溢出策略: drop 丢弃新消息 / coalesce 合并同一实体的旧消息 / disconnect 断开
+    ws_send_queue_size: int = 256
+    ws_overflow_policy: Literal["drop", "coalesce", "disconnect"] = "coalesce"
+    # 单条消息发送超时（秒），超时的连接被踢出
+    ws_send_timeout: float = 5.0
+    # 重连补发: 每个看板保留的最近事件数、保留事件日志的看板数
+    ws_replay_buffer_size: int = 1000
+    ws_replay_boards: int = 1000
+    # 合并窗口（毫秒，0 为关闭，建议 25-50）: 窗口内同一实体的同类事件合并，整体以一个 batch 帧发出；
+    # 单批事件数达到上限时提前发出
+    ws_coalesce_window_ms: float = 0
+    ws_batch_max_events: int = 500
+    # 服务端心跳（秒，interval 为 0 关闭）: 连接静默超过 interval 时发送 ping 帧，
+    # 再经过 timeout 仍无任何客户端消息即判定为半开连接并回收
+    ws_ping_interval: float = 25.0
+    ws_ping_timeout: float = 20.0
+    # 连接数上限（0 为不限制）: 单个看板 / 单个进程，超出时拒绝握手
+    ws_max_connections_per_board: int = 1000
+    ws_max_connections: int = 10000
+    # 多路复用端点 /ws 上单个连接可加入的看板数（0 为不限制）
+    ws_max_boards_per_connection: int = 100
+    # 跨进程广播后端: memory 单进程 / postgres LISTEN-NOTIFY / unix 本机 Unix 套接字 hub
+    broadcast_backend: Literal["memory", "postgres", "unix"] = "memory"
+    broadcast_channel: str = "kanban_events"
+    broadcast_socket_path: str = "/tmp/kanban-broadcast.sock"
+
+    # -------------------------------------------------------------------------
+    #  读缓存配置
+    # -------------------------------------------------------------------------
+    # 看板 / 列 / 任务读取结果的进程内 LRU 缓存（按修订号校验）: 开关、条目数上限、总字节数上限
+    board_cache_enabled: bool = True
+    board_cache_max_entries: int = 512
+    board_cache_max_bytes: int = 64 * 1024 * 1024
+    # 修订记录合并后台任务: 间隔（秒，0 为关闭）、看板修订记录超过多少行时合并、每轮处理看板数
+    board_revision_compact_interval: float = 60.0
+    board_revision_compact_rows: int = 100
+    board_revision_compact_boards: int = 100
+
     # -------------------------------------------------------------------------
     #  应用配置
     # -------------------------------------------------------------------------
@@ -0,0 +1,67 @@
+"""
+[INPUT]: 无外部依赖
+[OUTPUT]: 对外提供 MetricsRegistry 进程内指标注册表，metrics 单例
+[POS]: core 模块的运行时指标，被 services 写入、被 /metrics 端点读取
+[PROTOCOL]: 变更时更新此头部，然后检查 CLAUDE.md
+"""
+from __future__ import annotations
+
+
+class _Summary:
+    """数值摘要: 次数 / 总和 / 最大值"""
+
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.total, 3),
+            "avg": round(self.total / self.count, 3) if self.count else 0.0,
+            "max": round(self.max, 3),
+        }
+
+
+class MetricsRegistry:
+    """进程内指标注册表（单 worker 视角，无锁，仅在事件循环内写入）"""
+
+    def __init__(self) -> None:
+        self._counters: dict[str, int] = {}
+        self._summaries: dict[str, _Summary] = {}
+
+    def inc(self, name: str, value: int = 1) -> None:
+        """计数器累加"""
+        self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, value: float) -> None:
+        """记录一次观测值（如耗时毫秒）"""
+        summary = self._summaries.get(name)
+        if summary is None:
+            summary = self._summaries[name] = _Summary()
+        summary.observe(value)
+
+    def snapshot(self) -> dict:
+        """导出当前全部指标"""
+        return {
+            "counters": dict(self._counters),
+            "summaries": {name: s.snapshot() for name, s in self._summaries.items()},
+        }
+
+    def reset(self) -> None:
+        """清空指标（测试用）"""
+        self._counters.clear()
+        self._summaries.clear()
+
+
+# 全局指标实例
+metrics = MetricsRegistry()
@@ -2,8 +2,8 @@
 #  CRUD Module - 数据访问层
 # ==============================================================================
 """
-[INPUT]: 依赖 users, boards, columns, tasks 子模块
-[OUTPUT]: 对外提供所有 CRUD 操作
+[INPUT]: 依赖 users, boards, columns, tasks, pagination 子模块
+[OUTPUT]: 对外提供所有 CRUD 操作与分页游标
 [POS]: crud 模块入口，统一导出所有数据访问函数
 [PROTOCOL]: 变更时更新此头部，然后检查 CLAUDE.md
 """
@@ -11,7 +11,10 @@ from app.crud.boards import (
     create_board,
     delete_board,
     get_board,
+    get_board_revision,
+    get_board_snapshot,
     get_boards_by_owner,
+    get_boards_page,
     update_board,
 )
 from app.crud.columns import (
@@ -19,14 +22,26 @@ from app.crud.columns import (
     delete_column,
     get_column,
     get_columns_by_board,
+    reorder_columns,
     update_column,
 )
+from app.crud.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    BoardCursor,
+    TaskCursor,
+    decode_cursor,
+    encode_cursor,
+)
 from app.crud.tasks import (
     create_task,
     delete_task,
+    delete_tasks,
     get_task,
     get_tasks_by_board,
+    get_tasks_page,
     get_tasks_by_column,
+    get_tasks_by_ids,
     update_task,
 )
 from app.crud.users import create_user, get_user_by_email, get_user_by_id
@@ -39,7 +54,10 @@ __all__ = [
     # Boards
     "create_board",
     "get_boards_by_owner",
+    "get_boards_page",
     "get_board",
+    "get_board_revision",
+    "get_board_snapshot",
     "update_board",
     "delete_board",
     # Columns
@@ -47,12 +65,23 @@ __all__ = [
     "get_columns_by_board",
     "get_column",
     "update_column",
+    "reorder_columns",
     "delete_column",
     # Tasks
     "create_task",
     "get_tasks_by_board",
+    "get_tasks_page",
     "get_tasks_by_column",
+    "get_tasks_by_ids",
     "get_task",
     "update_task",
     "delete_task",
+    "delete_tasks",
+    # Pagination
+    "TaskCursor",
+    "BoardCursor",
+    "encode_cursor",
+    "decode_cursor",
+    "DEFAULT_PAGE_SIZE",
+    "MAX_PAGE_SIZE",
 ]
@@ -2,21 +2,25 @@
 #  Board CRUD Operations
 # ==============================================================================
 """
-[INPUT]: 依赖 SQLAlchemy AsyncSession, app.models.Board
-[OUTPUT]: 对外提供 create_board, get_boards_by_owner, get_board, update_board, delete_board
+[INPUT]: 依赖 SQLAlchemy AsyncSession, app.models.Board / Task, app.services.ordering, app.crud.pagination
+[OUTPUT]: 对外提供 create_board, get_boards_by_owner, get_boards_page, get_board, get_board_revision, get_board_snapshot, update_board, delete_board
 [POS]: crud 模块的看板数据访问
 [PROTOCOL]: 变更时更新此头部，然后检查 CLAUDE.md
 """
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Row, and_, func, literal, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.models import Board
+from app.crud.pagination import BoardCursor
+from app.models import Board, Task
 from app.schemas import BoardCreate, BoardUpdate
+from app.services.ordering import bump_board, dense_positions, task_order
 
 
 async def create_board(db: AsyncSession, board_in: BoardCreate, owner_id: UUID) -> Board:
@@ -36,12 +40,82 @@ async def get_boards_by_owner(db: AsyncSession, owner_id: UUID) -> List[Board]:
     return list(result.scalars().all())
 
 
+async def get_boards_page(
+    db: AsyncSession, owner_id: UUID, limit: int, after: Optional[BoardCursor] = None
+) -> Tuple[List[Board], Optional[BoardCursor]]:
+    """
+    按 (created_at, id) 倒序做 keyset 分页，返回 (本页看板, 下一页游标)；已到末页时游标为 None
+
+    续页以游标行的存储值定位（各方言的时间戳存储精度不同，回传的时间未必与库中逐位相等），
+    该行已删除时回落到游标携带的时间
+    """
+    stmt = (
+        select(Board)
+        .where(Board.owner_id == owner_id)
+        .order_by(Board.created_at.desc(), Board.id.desc())
+        .limit(limit + 1)
+    )
+    if after is not None:
+        anchor = func.coalesce(
+            select(Board.created_at).where(Board.id == after.id).scalar_subquery(),
+            literal(after.created_at, Board.created_at.type),
+        )
+        stmt = stmt.where(
+            or_(
+                Board.created_at < anchor,
+                and_(Board.created_at == anchor, Board.id < after.id),
+            )
+        )
+    result = await db.execute(stmt)
+    boards = list(result.scalars().all())
+    if len(boards) <= limit:
+        return boards, None
+    last = boards[limit - 1]
+    return boards[:limit], BoardCursor(last.created_at, last.id)
+
+
 async def get_board(db: AsyncSession, board_id: UUID) -> Optional[Board]:
     """通过 ID 获取看板"""
     result = await db.execute(select(Board).where(Board.id == board_id))
     return result.scalar_one_or_none()
 
 
+async def get_board_revision(db: AsyncSession, board_id: UUID) -> Optional[Row]:
+    """只读取看板修订号与所有者（条件请求的廉价检查），看板不存在时返回 None"""
+    result = await db.execute(
+        select(Board.revision, Board.owner_id).where(Board.id == board_id)
+    )
+    return result.one_or_none()
+
+
+async def get_board_snapshot(db: AsyncSession, board_id: UUID) -> Optional[Board]:
+    """
+    一次读取看板、有序的列及各列有序的任务（共两条查询）
+
+    看板与列 JOIN 一次读出；任务按当前排序模式单独查询后挂到各列的 tasks 关系上
+    （set_committed_value，不触发懒加载也不产生写入）
+    """
+    result = await db.execute(
+        select(Board).where(Board.id == board_id).options(joinedload(Board.columns))
+    )
+    board = result.unique().scalar_one_or_none()
+    if board is None:
+        return None
+
+    result = await db.execute(
+        select(Task).where(Task.board_id == board_id).order_by(*task_order())
+    )
+    by_column: dict[UUID, list[Task]] = {}
+    for task in dense_positions(result.scalars().all()):
+        by_column.setdefault(task.column_id, []).append(task)
+
+    columns = sorted(board.columns, key=lambda c: c.order_index)
+    set_committed_value(board, "columns", columns)
+    for column in columns:
+        set_committed_value(column, "tasks", by_column.get(column.id, []))
+    return board
+
+
 async def update_board(
     db: AsyncSession, board: Board, board_in: BoardUpdate
 ) -> Board:
@@ -49,6 +123,7 @@ async def update_board(
     update_data = board_in.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(board, field, value)
+    await bump_board(db, board.id)
     await db.commit()
     await db.refresh(board)
     return board
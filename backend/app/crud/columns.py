@@ -2,21 +2,22 @@
 #  Column CRUD Operations
 # ==============================================================================
 """
-[INPUT]: 依赖 SQLAlchemy AsyncSession, app.models.Column
-[OUTPUT]: 对外提供 create_column, get_columns_by_board, get_column, update_column, delete_column
+[INPUT]: 依赖 SQLAlchemy AsyncSession, app.models.Column, app.services.ordering 的 bump_board
+[OUTPUT]: 对外提供 create_column, get_columns_by_board, get_column, update_column, reorder_columns, delete_column
 [POS]: crud 模块的列数据访问
 [PROTOCOL]: 变更时更新此头部，然后检查 CLAUDE.md
 """
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import case, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import Column
 from app.schemas import ColumnCreate, ColumnUpdate
+from app.services.ordering import bump_board
 
 
 async def create_column(
@@ -29,6 +30,7 @@ async def create_column(
         order_index=column_in.order_index,
     )
     db.add(column)
+    await bump_board(db, board_id)
     await db.commit()
     await db.refresh(column)
     return column
@@ -52,15 +54,48 @@ async def update_column(
     db: AsyncSession, column: Column, column_in: ColumnUpdate
 ) -> Column:
     """更新列"""
-    update_data = column_in.model_dump(exclude_unset=True)
+    update_data = column_in.model_dump(exclude_unset=True, exclude={"expected_version"})
     for field, value in update_data.items():
         setattr(column, field, value)
+    await bump_board(db, column.board_id)
     await db.commit()
     await db.refresh(column)
     return column
 
 
+async def reorder_columns(
+    db: AsyncSession, board_id: UUID, column_ids: Sequence[UUID]
+) -> List[Column]:
+    """
+    按 column_ids 顺序重写看板列的 order_index
+
+    只改写 order_index 实际变化的列，单条 UPDATE ... CASE 完成
+    """
+    columns = await get_columns_by_board(db, board_id)
+    current = {c.id: c.order_index for c in columns}
+    changed = {
+        column_id: idx
+        for idx, column_id in enumerate(column_ids)
+        if current.get(column_id) != idx
+    }
+    if changed:
+        await db.execute(
+            update(Column)
+            .where(Column.board_id == board_id, Column.id.in_(changed))
+            .values(
+                order_index=case(changed, value=Column.id),
+                version=Column.version + 1,
+            )
+            .execution_options(synchronize_session="fetch")
+        )
+        await bump_board(db, board_id)
+        await db.commit()
+        columns = await get_columns_by_board(db, board_id)
+    return columns
+
+
 async def delete_column(db: AsyncSession, column: Column) -> None:
     """删除列"""
     await db.delete(column)
+    await bump_board(db, column.board_id)
     await db.commit()
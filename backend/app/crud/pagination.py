@@ -0,0 +1,61 @@
+# ==============================================================================
+#  Keyset Pagination - 游标分页
+# ==============================================================================
+"""
+[INPUT]: 依赖 pydantic TypeAdapter
+[OUTPUT]: 对外提供 TaskCursor, BoardCursor 游标, encode_cursor / decode_cursor, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+[POS]: crud 模块的分页工具，被 tasks / boards 的分页查询与对应端点使用
+[PROTOCOL]: 变更时更新此头部，然后检查 CLAUDE.md
+"""
+from __future__ import annotations
+
+import base64
+from datetime import datetime
+from typing import NamedTuple, TypeVar
+from uuid import UUID
+
+from pydantic import TypeAdapter
+
+# 只传 cursor 未传 limit 时的页大小；limit 上限
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+class TaskCursor(NamedTuple):
+    """
+    任务页游标：上一页最后一行的排序键 (column_id, rank, position, id)
+
+    index 为该行在列内的序号 + 1，rank 模式下续页据此连续编号 position
+    """
+
+    column_id: UUID
+    rank: str
+    position: int
+    id: UUID
+    index: int
+
+
+class BoardCursor(NamedTuple):
+    """看板页游标：上一页最后一行的 (created_at, id)"""
+
+    created_at: datetime
+    id: UUID
+
+
+Cursor = TypeVar("Cursor", TaskCursor, BoardCursor)
+
+
+def encode_cursor(cursor: NamedTuple) -> str:
+    """游标编码为不透明字符串（JSON 数组的 base64url，去掉填充）"""
+    raw = TypeAdapter(type(cursor)).dump_json(cursor)
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(kind: type[Cursor], token: str) -> Cursor:
+    """解析游标字符串，格式或字段类型不合法时抛出 ValueError"""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    except ValueError as exc:
+        raise ValueError("Invalid cursor") from exc
+    # pydantic ValidationError 即 ValueError 子类
+    return TypeAdapter(kind).validate_json(raw)
@@ -2,25 +2,45 @@
 #  Task CRUD Operations
 # ==============================================================================
 """
-[INPUT]: 依赖 SQLAlchemy AsyncSession, app.models.Task
-[OUTPUT]: 对外提供 create_task, get_tasks_by_board, get_tasks_by_column, get_task, update_task, delete_task
+[INPUT]: 依赖 SQLAlchemy AsyncSession, app.models.Task, app.services.ordering, app.crud.pagination
+[OUTPUT]: 对外提供 create_task, get_tasks_by_board, get_tasks_page, get_tasks_by_column, get_tasks_by_ids, get_task, update_task, delete_task, delete_tasks
 [POS]: crud 模块的任务数据访问
 [PROTOCOL]: 变更时更新此头部，然后检查 CLAUDE.md
 """
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Select, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
+from sqlalchemy.orm.attributes import set_committed_value
 
+from app.core.config import settings
+from app.crud.pagination import TaskCursor
 from app.models import Task
 from app.schemas import TaskCreate, TaskUpdate
+from app.services.ordering import (
+    bump_board,
+    bump_columns,
+    column_lock,
+    dense_positions,
+    open_slot,
+    rank_for_index,
+    remove_tasks,
+    snapshot_columns,
+    task_order,
+)
 
 
 async def create_task(db: AsyncSession, task_in: TaskCreate, board_id: UUID) -> Task:
-    """创建任务"""
+    """
+    创建任务
+
+    与移动路径同样持有列级写锁；position 模式下腾位置平移兄弟任务，
+    以列版本为乐观锁基线，与并发重排冲突时抛出 StaleDataError
+    """
     task = Task(
         title=task_in.title,
         description=task_in.description,
@@ -28,24 +48,109 @@ async def create_task(db: AsyncSession, task_in: TaskCreate, board_id: UUID) ->
         column_id=task_in.column_id,
         position=task_in.position,
     )
-    db.add(task)
-    await db.commit()
+    async with column_lock(db, (task_in.column_id,)):
+        if settings.ordering_mode == "rank":
+            task.rank, task.position = await rank_for_index(
+                db, task_in.column_id, task_in.position
+            )
+        else:
+            snapshot = await snapshot_columns(db, {task_in.column_id})
+            task.position = await open_slot(db, task_in.column_id, task_in.position)
+            await bump_columns(db, snapshot)
+        db.add(task)
+        await bump_board(db, board_id)
+        await db.commit()
     await db.refresh(task)
     return task
 
 
-async def get_tasks_by_board(db: AsyncSession, board_id: UUID) -> List[Task]:
-    """获取看板的所有任务"""
-    result = await db.execute(
-        select(Task).where(Task.board_id == board_id).order_by(Task.position)
+def _select_tasks(summary: bool = False) -> Select:
+    """
+    任务查询；summary 时不读取 description（摘要视图）
+
+    延迟列设为 raiseload：误访问时立即报错，而不是在异步会话中隐式补查
+    """
+    stmt = select(Task)
+    if summary:
+        stmt = stmt.options(defer(Task.description, raiseload=True))
+    return stmt
+
+
+async def get_tasks_by_board(
+    db: AsyncSession,
+    board_id: UUID,
+    column_id: Optional[UUID] = None,
+    summary: bool = False,
+) -> List[Task]:
+    """获取看板的所有任务（可只取一列；summary 时不加载 description）"""
+    stmt = _select_tasks(summary).where(Task.board_id == board_id).order_by(*task_order())
+    if column_id is not None:
+        stmt = stmt.where(Task.column_id == column_id)
+    result = await db.execute(stmt)
+    return dense_positions(result.scalars().all())
+
+
+async def get_tasks_page(
+    db: AsyncSession,
+    board_id: UUID,
+    limit: int,
+    after: Optional[TaskCursor] = None,
+    column_id: Optional[UUID] = None,
+    summary: bool = False,
+) -> Tuple[List[Task], Optional[TaskCursor]]:
+    """
+    按 (column_id, 排序键, id) 做 keyset 分页，返回 (本页任务, 下一页游标)；已到末页时游标为 None
+
+    排序键同 task_order()，走 (column_id, position) / (column_id, rank) 索引；
+    rank 模式下按列连续编号 position，续页从游标记录的列内序号接着编号
+    """
+    keys = (Task.column_id, *task_order(), Task.id)
+    stmt = (
+        _select_tasks(summary)
+        .where(Task.board_id == board_id)
+        .order_by(*keys)
+        .limit(limit + 1)
     )
-    return list(result.scalars().all())
+    if column_id is not None:
+        stmt = stmt.where(Task.column_id == column_id)
+    if after is not None:
+        stmt = stmt.where(tuple_(*keys) > tuple(getattr(after, key.key) for key in keys))
+    result = await db.execute(stmt)
+    tasks = list(result.scalars().all())
+
+    has_more = len(tasks) > limit
+    tasks = tasks[:limit]
+    last = tasks[-1] if has_more else None
+    raw = (last.rank, last.position) if last is not None else None
+
+    if settings.ordering_mode == "rank":
+        index = after.index if after is not None else 0
+        current = after.column_id if after is not None else None
+        for task in tasks:
+            if task.column_id != current:
+                current, index = task.column_id, 0
+            set_committed_value(task, "position", index)
+            index += 1
+
+    if last is None:
+        return tasks, None
+    return tasks, TaskCursor(last.column_id, raw[0], raw[1], last.id, last.position + 1)
 
 
 async def get_tasks_by_column(db: AsyncSession, column_id: UUID) -> List[Task]:
     """获取列的所有任务"""
     result = await db.execute(
-        select(Task).where(Task.column_id == column_id).order_by(Task.position)
+        select(Task).where(Task.column_id == column_id).order_by(*task_order())
+    )
+    return dense_positions(result.scalars().all())
+
+
+async def get_tasks_by_ids(
+    db: AsyncSession, board_id: UUID, task_ids: Sequence[UUID]
+) -> List[Task]:
+    """获取看板中指定 ID 的任务"""
+    result = await db.execute(
+        select(Task).where(Task.board_id == board_id, Task.id.in_(task_ids))
     )
     return list(result.scalars().all())
 
@@ -58,15 +163,21 @@ async def get_task(db: AsyncSession, task_id: UUID) -> Optional[Task]:
 
 async def update_task(db: AsyncSession, task: Task, task_in: TaskUpdate) -> Task:
     """更新任务"""
-    update_data = task_in.model_dump(exclude_unset=True)
+    update_data = task_in.model_dump(exclude_unset=True, exclude={"expected_version"})
     for field, value in update_data.items():
         setattr(task, field, value)
+    await bump_board(db, task.board_id)
     await db.commit()
     await db.refresh(task)
     return task
 
 
-async def delete_task(db: AsyncSession, task: Task) -> None:
-    """删除任务"""
-    await db.delete(task)
-    await db.commit()
+async def delete_task(db: AsyncSession, task: Task) -> dict:
+    """删除任务并压缩所在列，返回删除描述（含被平移的位置区间）"""
+    (deletion,) = await remove_tasks(db, [task])
+    return deletion
+
+
+async def delete_tasks(db: AsyncSession, tasks: Sequence[Task]) -> list[dict]:
+    """批量删除任务，每个受影响列只压缩一次，返回按顺序应用的删除描述"""
+    return await remove_tasks(db, tasks)
@@ -1,24 +1,44 @@
 """
-[INPUT]: 依赖 fastapi 的 FastAPI，依赖 app.api.v1.api 的 api_router
+[INPUT]: 依赖 fastapi 的 FastAPI，依赖 app.api.v1.api 的 api_router，依赖 app.services.ordering 的再平衡与修订记录合并任务，依赖 app.services.realtime 的连接管理器与心跳巡检
 [OUTPUT]: 对外提供 app (FastAPI 应用实例)
 [POS]: 应用入口，被 uvicorn 直接加载
 [PROTOCOL]: 变更时更新此头部，然后检查 CLAUDE.md
 """
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1.api import api_router
 from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.services.ordering import run_rank_rebalancer, run_revision_compactor
+from app.services.realtime import manager, run_reaper, start_broadcast, stop_broadcast
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """应用生命周期管理"""
-    # 启动时
+    # 启动时: 启动广播后端、WebSocket 心跳巡检与修订记录合并；rank 模式下启动再平衡后台任务
+    await start_broadcast()
+    background = []
+    if settings.ws_ping_interval > 0:
+        background.append(asyncio.create_task(run_reaper()))
+    if settings.board_revision_compact_interval > 0:
+        background.append(asyncio.create_task(run_revision_compactor(AsyncSessionLocal)))
+    if settings.ordering_mode == "rank" and settings.rank_rebalance_interval > 0:
+        background.append(asyncio.create_task(run_rank_rebalancer(AsyncSessionLocal)))
+
     yield
+
     # 关闭时
+    for task in background:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    await stop_broadcast()
+    await manager.close()
 
 
 app = FastAPI(
@@ -44,6 +64,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # 条件请求与分页所需的响应头对浏览器脚本可见
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
 # -------------------------------------------------------------------------
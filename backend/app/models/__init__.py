@@ -3,13 +3,13 @@
 # ==============================================================================
 """
 [INPUT]: 依赖 user, board, column, task 子模块
-[OUTPUT]: 对外提供 User, Board, Column, Task 模型
+[OUTPUT]: 对外提供 User, Board, BoardRevision, Column, Task 模型
 [POS]: models 模块入口，统一导出所有 ORM 实体
 [PROTOCOL]: 变更时更新此头部，然后检查 CLAUDE.md
 """
-from app.models.board import Board
+from app.models.board import Board, BoardRevision
 from app.models.column import Column
 from app.models.task import Task
 from app.models.user import User
 
-__all__ = ["User", "Board", "Column", "Task"]
+__all__ = ["User", "Board", "BoardRevision", "Column", "Task"]
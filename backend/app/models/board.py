@@ -3,18 +3,35 @@
 # ==============================================================================
 """
 [INPUT]: 依赖 app.db.base 的 Base, TimestampMixin, UUIDMixin
-[OUTPUT]: 对外提供 Board ORM 模型
+[OUTPUT]: 对外提供 Board, BoardRevision ORM 模型
 [POS]: models 模块的看板实体，拥有 Column 和 Task
 [PROTOCOL]: 变更时更新此头部，然后检查 CLAUDE.md
 """
 from uuid import UUID
 
-from sqlalchemy import ForeignKey, String
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import ForeignKey, Integer, String, func, select
+from sqlalchemy.orm import Mapped, column_property, mapped_column, relationship
 
 from app.db.base import Base, TimestampMixin, UUIDMixin
 
 
+class BoardRevision(Base):
+    """
+    看板修订记录（只追加）：每个写事务插入一行，看板修订号为 1 + 全部行的 weight 之和
+
+    插入互不加锁，同一看板的并发写入不会在计数行上串行；和只随提交增长，与提交顺序无关。
+    后台任务定期把一个看板的多行合并为一行（weight 为被合并行之和），修订号不变
+    """
+
+    __tablename__ = "board_revisions"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    board_id: Mapped[UUID] = mapped_column(
+        ForeignKey("boards.id", ondelete="CASCADE"), index=True
+    )
+    weight: Mapped[int] = mapped_column(Integer, default=1, server_default="1")
+
+
 class Board(Base, UUIDMixin, TimestampMixin):
     """看板模型"""
 
@@ -36,3 +53,12 @@ class Board(Base, UUIDMixin, TimestampMixin):
 
     def __repr__(self) -> str:
         return f"<Board {self.title}>"
+
+
+# 看板修订号：看板、列或任务的任何写入都在同一事务内追加修订记录，读取端点据此生成 ETag
+Board.revision = column_property(
+    select(1 + func.coalesce(func.sum(BoardRevision.weight), 0))
+    .where(BoardRevision.board_id == Board.id)
+    .correlate_except(BoardRevision)
+    .scalar_subquery()
+)
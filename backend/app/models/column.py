@@ -23,6 +23,13 @@ class Column(Base, UUIDMixin, TimestampMixin):
     board_id: Mapped[UUID] = mapped_column(ForeignKey("boards.id", ondelete="CASCADE"))
     title: Mapped[str] = mapped_column(String(100))
     order_index: Mapped[int] = mapped_column(Integer, default=0)
+    # 乐观并发版本号，列属性（标题、order_index）变化时递增
+    version: Mapped[int] = mapped_column(Integer, default=1, server_default="1")
+    # 列内任务顺序版本号，只由任务创建 / 移动 / 删除等改变列内顺序的写入递增；
+    # 与 version 分开，列的重命名与重排不会让并发的任务移动误判冲突
+    ordering_version: Mapped[int] = mapped_column(Integer, default=1, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
 
     # -------------------------------------------------------------------------
     #  关系
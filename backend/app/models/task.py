@@ -12,7 +12,7 @@ from __future__ import annotations
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import ForeignKey, Integer, String, Text
+from sqlalchemy import ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base, TimestampMixin, UUIDMixin
@@ -22,12 +22,22 @@ class Task(Base, UUIDMixin, TimestampMixin):
     """任务模型"""
 
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_column_id_position", "column_id", "position"),
+        Index("ix_tasks_column_id_rank", "column_id", "rank"),
+    )
 
     board_id: Mapped[UUID] = mapped_column(ForeignKey("boards.id", ondelete="CASCADE"))
     column_id: Mapped[UUID] = mapped_column(ForeignKey("columns.id", ondelete="CASCADE"))
     title: Mapped[str] = mapped_column(String(200))
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     position: Mapped[int] = mapped_column(Integer, default=0)
+    # rank 模式下的字典序排序键，空串表示尚未分配
+    rank: Mapped[str] = mapped_column(String(255), default="", server_default="")
+    # 乐观并发版本号，每次写入该行时递增
+    version: Mapped[int] = mapped_column(Integer, default=1, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
 
     # -------------------------------------------------------------------------
     #  关系
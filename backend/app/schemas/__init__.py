@@ -7,9 +7,30 @@
 [POS]: schemas 模块入口，统一导出所有 API 数据模式
 [PROTOCOL]: 变更时更新此头部，然后检查 CLAUDE.md
 """
-from app.schemas.board import BoardCreate, BoardRead, BoardUpdate
-from app.schemas.column import ColumnCreate, ColumnRead, ColumnUpdate
-from app.schemas.task import TaskCreate, TaskMove, TaskRead, TaskUpdate
+from app.schemas.board import (
+    BoardCreate,
+    BoardRead,
+    BoardSnapshot,
+    BoardUpdate,
+    ColumnWithTasks,
+)
+from app.schemas.column import (
+    ColumnCreate,
+    ColumnMoveAll,
+    ColumnOrder,
+    ColumnRead,
+    ColumnUpdate,
+)
+from app.schemas.task import (
+    TaskBatchDelete,
+    TaskBatchMove,
+    TaskBatchMoveItem,
+    TaskCreate,
+    TaskMove,
+    TaskRead,
+    TaskSummary,
+    TaskUpdate,
+)
 from app.schemas.user import UserCreate, UserRead, UserUpdate
 
 __all__ = [
@@ -21,13 +42,21 @@ __all__ = [
     "BoardCreate",
     "BoardRead",
     "BoardUpdate",
+    "BoardSnapshot",
+    "ColumnWithTasks",
     # Column
     "ColumnCreate",
     "ColumnRead",
     "ColumnUpdate",
+    "ColumnOrder",
+    "ColumnMoveAll",
     # Task
     "TaskCreate",
     "TaskRead",
+    "TaskSummary",
     "TaskUpdate",
     "TaskMove",
+    "TaskBatchMoveItem",
+    "TaskBatchMove",
+    "TaskBatchDelete",
 ]
@@ -2,8 +2,8 @@
 #  Board Pydantic Schemas
 # ==============================================================================
 """
-[INPUT]: 依赖 pydantic
-[OUTPUT]: 对外提供 BoardCreate, BoardRead, BoardUpdate schemas
+[INPUT]: 依赖 pydantic, app.schemas.column 的 ColumnRead, app.schemas.task 的 TaskRead
+[OUTPUT]: 对外提供 BoardCreate, BoardRead, BoardUpdate, ColumnWithTasks, BoardSnapshot schemas
 [POS]: schemas 模块的看板模式定义
 [PROTOCOL]: 变更时更新此头部，然后检查 CLAUDE.md
 """
@@ -15,6 +15,9 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field
 
+from app.schemas.column import ColumnRead
+from app.schemas.task import TaskRead
+
 
 # -----------------------------------------------------------------------------
 #  Base
@@ -45,7 +48,24 @@ class BoardRead(BoardBase):
 
     id: UUID
     owner_id: UUID
+    # 看板修订号，任何写入后递增（读取端点的 ETag 即该值）
+    revision: int
     created_at: datetime
     updated_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+# -----------------------------------------------------------------------------
+#  Snapshot（打开看板时一次取全）
+# -----------------------------------------------------------------------------
+class ColumnWithTasks(ColumnRead):
+    """快照中的列，tasks 按列内顺序排列"""
+
+    tasks: list[TaskRead]
+
+
+class BoardSnapshot(BoardRead):
+    """看板快照：看板、按 order_index 排列的列及各列任务"""
+
+    columns: list[ColumnWithTasks]
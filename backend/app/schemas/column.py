@@ -3,14 +3,14 @@
 # ==============================================================================
 """
 [INPUT]: 依赖 pydantic
-[OUTPUT]: 对外提供 ColumnCreate, ColumnRead, ColumnUpdate schemas
+[OUTPUT]: 对外提供 ColumnCreate, ColumnRead, ColumnUpdate, ColumnOrder, ColumnMoveAll schemas
 [POS]: schemas 模块的列模式定义
 [PROTOCOL]: 变更时更新此头部，然后检查 CLAUDE.md
 """
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field
@@ -39,6 +39,21 @@ class ColumnUpdate(BaseModel):
 
     title: Optional[str] = Field(None, min_length=1, max_length=100)
     order_index: Optional[int] = Field(None, ge=0)
+    # 乐观并发: 与当前版本不符时返回 409（也可通过 If-Match 头传入）
+    expected_version: Optional[int] = Field(None, ge=1)
+
+
+class ColumnOrder(BaseModel):
+    """列整体排序请求（看板全部列 ID，按目标顺序）"""
+
+    column_ids: list[UUID] = Field(..., min_length=1)
+
+
+class ColumnMoveAll(BaseModel):
+    """整列迁移请求：源列全部任务移到目标列首 / 列尾"""
+
+    to_column_id: UUID
+    placement: Literal["top", "bottom"] = "bottom"
 
 
 class ColumnRead(ColumnBase):
@@ -47,6 +62,8 @@ class ColumnRead(ColumnBase):
     id: UUID
     board_id: UUID
     order_index: int
+    version: int
+    ordering_version: int
     created_at: datetime
     updated_at: datetime
 
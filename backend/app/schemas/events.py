@@ -3,17 +3,17 @@
 # ==============================================================================
 """
 [INPUT]: 依赖 pydantic
-[OUTPUT]: 对外提供 WebSocket 事件类型
+[OUTPUT]: 对外提供 WebSocket 事件类型与载荷，客户端消息 SubscribeMessage / JoinBoardMessage / LeaveBoardMessage / ClientMessage
 [POS]: schemas 模块的事件模式定义
 [PROTOCOL]: 变更时更新此头部，然后检查 CLAUDE.md
 """
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Literal, Optional
+from typing import Annotated, Literal, Optional, Union
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 
 
 class WebSocketEvent(BaseModel):
@@ -33,30 +33,166 @@ class TaskCreatedPayload(BaseModel):
     title: str
     description: Optional[str]
     position: int
+    version: Optional[int] = None
 
 
 class TaskUpdatedPayload(BaseModel):
-    """任务更新事件载荷"""
+    """任务更新事件载荷（column_id 供按列订阅的连接过滤）"""
 
     id: UUID
+    column_id: Optional[UUID] = None
     title: Optional[str] = None
     description: Optional[str] = None
 
 
+class PositionShift(BaseModel):
+    """
+    区间平移：移动前 position 位于 [start, end] 的任务平移 delta（end 为 None 表示直到列尾）
+
+    version_delta: 这些任务版本号的增量（position 模式实际改写为 1，rank 模式不写入为 0）
+    """
+
+    column_id: UUID
+    start: int = Field(ge=0)
+    end: Optional[int] = None
+    delta: Literal[-1, 1]
+    version_delta: Literal[0, 1] = 0
+
+    @model_validator(mode="after")
+    def _check_range(self) -> PositionShift:
+        if self.end is not None and self.end < self.start:
+            raise ValueError("end must not be less than start")
+        return self
+
+
 class TaskMovedPayload(BaseModel):
-    """任务移动事件载荷"""
+    """
+    任务移动事件载荷
+
+    单个移动时附带 from_position 与 shifts：先按 shifts 平移两列中的其他任务，
+    再把该任务放到 position，即得到与服务端一致的顺序；
+    shifts 为 None 时（批量移动）客户端需自行重新拉取
+
+    version 为该任务移动后的版本号；column_versions 为被递增顺序版本的列的新 ordering_version
+    （position 模式；rank 模式不改写列顺序版本时为 None）
+    """
 
     id: UUID
     from_column_id: UUID
     to_column_id: UUID
     position: int
+    version: Optional[int] = None
+    from_position: Optional[int] = None
+    shifts: Optional[list[PositionShift]] = None
+    column_versions: Optional[dict[UUID, int]] = None
+
+
+class TasksMovedPayload(BaseModel):
+    """批量移动事件载荷（每个任务只出现一次，position 为最终位置）"""
+
+    moves: list[TaskMovedPayload]
 
 
 class TaskDeletedPayload(BaseModel):
-    """任务删除事件载荷"""
+    """
+    任务删除事件载荷
+
+    position 为删除前的位置；[shifted_from, shifted_to] 内的任务随之前移一位
+    （无后续任务时为 None）
+    """
 
     id: UUID
+    column_id: Optional[UUID] = None
+    position: Optional[int] = None
+    shifted_from: Optional[int] = None
+    shifted_to: Optional[int] = None
+
+
+class TasksDeletedPayload(BaseModel):
+    """批量删除事件载荷（deletions 按顺序依次应用）"""
+
+    deletions: list[TaskDeletedPayload]
+
+
+class ColumnRebalancedPayload(BaseModel):
+    """列 rank 再平衡事件载荷（顺序不变，task_ids 为列内当前顺序）"""
+
+    column_id: UUID
+    task_ids: list[UUID]
+
+
+class ColumnSortedPayload(BaseModel):
+    """列服务端排序事件载荷（task_ids 为列内新顺序，position 即下标）"""
+
+    column_id: UUID
+    task_ids: list[UUID]
+
+
+class ColumnTasksMovedPayload(BaseModel):
+    """
+    整列迁移事件载荷
+
+    task_ids 为被迁移任务（源列顺序）；top 时它们占据目标列 0..n-1，原有任务整体后移，
+    bottom 时追加到目标列尾
+    """
+
+    from_column_id: UUID
+    to_column_id: UUID
+    placement: Literal["top", "bottom"]
+    task_ids: list[UUID]
+
+
+class ColumnsReorderedPayload(BaseModel):
+    """列整体排序事件载荷（column_ids 为新的列顺序）"""
+
+    column_ids: list[UUID]
 
 
 # 事件类型联合
-EventType = Literal["task_created", "task_updated", "task_moved", "task_deleted"]
+EventType = Literal[
+    "task_created",
+    "task_updated",
+    "task_moved",
+    "tasks_moved",
+    "task_deleted",
+    "tasks_deleted",
+    "column_rebalanced",
+    "columns_reordered",
+    "column_sorted",
+    "column_tasks_moved",
+]
+
+
+class SubscribeMessage(BaseModel):
+    """
+    客户端订阅消息（经同一 WebSocket 发送的 JSON 文本）
+
+    columns / events 为 None 表示不按该维度过滤；再次发送即整体替换当前订阅
+    """
+
+    type: Literal["subscribe"]
+    columns: Optional[list[UUID]] = None
+    events: Optional[list[EventType]] = None
+
+
+class JoinBoardMessage(BaseModel):
+    """多路复用连接加入看板；since / epoch 语义同单看板端点的查询参数"""
+
+    type: Literal["join"]
+    board_id: UUID
+    since: Optional[int] = Field(None, ge=0)
+    epoch: Optional[str] = None
+
+
+class LeaveBoardMessage(BaseModel):
+    """多路复用连接退出看板"""
+
+    type: Literal["leave"]
+    board_id: UUID
+
+
+# 多路复用端点接受的客户端消息（按 type 区分）
+ClientMessage = Annotated[
+    Union[SubscribeMessage, JoinBoardMessage, LeaveBoardMessage],
+    Field(discriminator="type"),
+]
@@ -3,7 +3,7 @@
 # ==============================================================================
 """
 [INPUT]: 依赖 pydantic
-[OUTPUT]: 对外提供 TaskCreate, TaskRead, TaskUpdate, TaskMove schemas
+[OUTPUT]: 对外提供 TaskCreate, TaskRead, TaskSummary, TaskUpdate, TaskMove, TaskBatchMoveItem, TaskBatchMove, TaskBatchDelete schemas
 [POS]: schemas 模块的任务模式定义
 [PROTOCOL]: 变更时更新此头部，然后检查 CLAUDE.md
 """
@@ -41,6 +41,8 @@ class TaskUpdate(BaseModel):
 
     title: Optional[str] = Field(None, min_length=1, max_length=200)
     description: Optional[str] = Field(None, max_length=2000)
+    # 乐观并发: 与当前版本不符时返回 409（也可通过 If-Match 头传入）
+    expected_version: Optional[int] = Field(None, ge=1)
 
 
 class TaskMove(BaseModel):
@@ -48,6 +50,40 @@ class TaskMove(BaseModel):
 
     column_id: UUID
     position: int = Field(..., ge=0)
+    expected_version: Optional[int] = Field(None, ge=1)
+
+
+class TaskBatchMoveItem(TaskMove):
+    """批量移动中的单个操作"""
+
+    task_id: UUID
+
+
+class TaskBatchMove(BaseModel):
+    """批量移动请求（按顺序依次应用）"""
+
+    moves: list[TaskBatchMoveItem] = Field(..., min_length=1, max_length=500)
+
+
+class TaskBatchDelete(BaseModel):
+    """批量删除请求"""
+
+    task_ids: list[UUID] = Field(..., min_length=1, max_length=500)
+
+
+class TaskSummary(BaseModel):
+    """任务摘要响应（看板卡片视图）：不含 description，列表查询也不读取该列"""
+
+    id: UUID
+    board_id: UUID
+    column_id: UUID
+    title: str
+    position: int
+    version: int
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = {"from_attributes": True}
 
 
 class TaskRead(TaskBase):
@@ -57,6 +93,7 @@ class TaskRead(TaskBase):
     board_id: UUID
     column_id: UUID
     position: int
+    version: int
     created_at: datetime
     updated_at: datetime
 
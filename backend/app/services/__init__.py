@@ -3,10 +3,26 @@
 # ==============================================================================
 """
 [INPUT]: 依赖 ordering 子模块
-[OUTPUT]: 对外提供 move_task, reorder_column 业务操作
+[OUTPUT]: 对外提供 move_task, move_task_with_shifts, move_tasks, move_all_tasks, reorder_column, sort_column, rank_between 业务操作
 [POS]: services 模块入口，统一导出业务逻辑
 [PROTOCOL]: 变更时更新此头部，然后检查 CLAUDE.md
 """
-from app.services.ordering import move_task, reorder_column
+from app.services.ordering import (
+    move_all_tasks,
+    move_task,
+    move_task_with_shifts,
+    move_tasks,
+    rank_between,
+    reorder_column,
+    sort_column,
+)
 
-__all__ = ["move_task", "reorder_column"]
+__all__ = [
+    "move_task",
+    "move_task_with_shifts",
+    "move_tasks",
+    "move_all_tasks",
+    "reorder_column",
+    "sort_column",
+    "rank_between",
+]
@@ -0,0 +1,407 @@
+# ==============================================================================
+#  Broadcast Backends - 跨进程事件分发
+# ==============================================================================
+"""
+[INPUT]: 依赖 asyncio, orjson, core.metrics, SQLAlchemy AsyncEngine (asyncpg LISTEN/NOTIFY), fcntl (Unix 套接字 hub 选主)
+[OUTPUT]: 对外提供 BroadcastBackend, MemoryBackend, PostgresBackend, UnixSocketBackend
+[POS]: services 模块的广播后端，被 realtime.broadcast_event 使用；各进程收到事件后交给本地 ConnectionManager 扇出
+[PROTOCOL]: 变更时更新此头部，然后检查 CLAUDE.md
+"""
+from __future__ import annotations
+
+import abc
+import asyncio
+import contextlib
+import fcntl
+import logging
+import os
+import uuid
+from typing import Any, Awaitable, Callable, Optional, Union
+from uuid import UUID
+
+import orjson
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# 本地投递回调: (board_id, event_type, payload) -> 本进程扇出
+Deliver = Callable[[UUID, str, dict[str, Any]], Awaitable[None]]
+# 可能漏收远端事件（连接中断后恢复）时的回调：本进程所有看板需要客户端重新同步
+Resync = Callable[[], None]
+
+
+def _encode(board_id: UUID, event_type: str, payload: dict[str, Any]) -> bytes:
+    """序列化为跨进程信封（orjson UTF-8 字节，与 WebSocket 帧使用同一编码器）"""
+    return orjson.dumps(
+        {"board_id": board_id, "type": event_type, "payload": payload},
+        option=orjson.OPT_NON_STR_KEYS,
+    )
+
+
+def _split_utf8(data: bytes, size: int) -> list[str]:
+    """按字节上限切分 UTF-8 数据，切点不落在多字节字符中间"""
+    parts = []
+    start = 0
+    while start < len(data):
+        end = min(start + size, len(data))
+        # 0b10xxxxxx 为续字节：回退到字符起始处
+        while end < len(data) and data[end] & 0xC0 == 0x80:
+            end -= 1
+        parts.append(data[start:end].decode())
+        start = end
+    return parts
+
+
+# -----------------------------------------------------------------------------
+#  基类
+# -----------------------------------------------------------------------------
+class BroadcastBackend(abc.ABC):
+    """
+    广播后端抽象基类
+
+    子类必须实现 publish：把事件发往所有进程（包括自身），各进程收到后调用 deliver
+    做本地扇出；远端事件经 _receive 入队，由单个分发协程按到达顺序投递。
+    start / stop 默认启停分发协程，子类覆盖时须调用 super()。
+    与其他进程的连接中断又恢复后，子类调用 _gap 让本地在已收事件之后执行 resync
+    """
+
+    def __init__(self, deliver: Deliver, resync: Optional[Resync] = None) -> None:
+        self._deliver = deliver
+        self._resync = resync
+        # None 为漏收标记，与事件同序处理
+        self._inbox: asyncio.Queue[Union[str, bytes, None]] = asyncio.Queue()
+        self._pump: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self._pump = asyncio.create_task(self._run_pump())
+
+    async def stop(self) -> None:
+        if self._pump is not None:
+            self._pump.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._pump
+            self._pump = None
+
+    @abc.abstractmethod
+    async def publish(
+        self, board_id: UUID, event_type: str, payload: dict[str, Any]
+    ) -> None:
+        """发布事件到所有进程（包括本进程）"""
+
+    def _receive(self, raw: Union[str, bytes]) -> None:
+        """收到远端信封（可在回调中调用，不阻塞）"""
+        self._inbox.put_nowait(raw)
+
+    def _gap(self) -> None:
+        """连接恢复：中断期间的远端事件已丢失，排在已收事件之后通知本地重新同步"""
+        metrics.inc("broadcast.reconnects")
+        self._inbox.put_nowait(None)
+
+    async def _run_pump(self) -> None:
+        while True:
+            raw = await self._inbox.get()
+            try:
+                if raw is None:
+                    if self._resync is not None:
+                        self._resync()
+                    continue
+                data = orjson.loads(raw)
+                await self._deliver(UUID(data["board_id"]), data["type"], data["payload"])
+            except Exception:
+                logger.exception("broadcast delivery failed")
+
+
+class MemoryBackend(BroadcastBackend):
+    """进程内后端（单 worker），直接本地扇出"""
+
+    async def start(self) -> None:
+        return None
+
+    async def publish(
+        self, board_id: UUID, event_type: str, payload: dict[str, Any]
+    ) -> None:
+        await self._deliver(board_id, event_type, payload)
+
+
+# -----------------------------------------------------------------------------
+#  PostgreSQL LISTEN / NOTIFY
+# -----------------------------------------------------------------------------
+class PostgresBackend(BroadcastBackend):
+    """
+    基于 PostgreSQL LISTEN/NOTIFY 的多进程 / 多副本广播
+
+    监听占用一条专用 asyncpg 连接；发布走连接池。NOTIFY 载荷上限 8000 字节，
+    超长信封按字节拆成分片在同一事务内发送（同事务的通知按序连续送达），接收端重组
+
+    监听连接由守护协程看护：asyncpg 终止回调或周期性 SELECT 1 失败即视为断开，
+    按指数退避重连，恢复后触发 resync（断开期间的 NOTIFY 不会补发）
+    """
+
+    _CHUNK = 7000
+    _RECONNECT_DELAY = 0.5
+    _RECONNECT_MAX_DELAY = 30.0
+    _HEALTH_INTERVAL = 15.0
+    _HEALTH_TIMEOUT = 5.0
+
+    def __init__(
+        self,
+        deliver: Deliver,
+        engine: AsyncEngine,
+        channel: str,
+        resync: Optional[Resync] = None,
+    ) -> None:
+        super().__init__(deliver, resync)
+        self._engine = engine
+        self._channel = channel
+        self._listen_conn: Optional[AsyncConnection] = None
+        self._driver: Any = None
+        self._partial: dict[str, list[str]] = {}
+        self._lost = asyncio.Event()
+        self._watchdog: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        await super().start()
+        await self._listen()
+        self._watchdog = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        if self._watchdog is not None:
+            self._watchdog.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._watchdog
+            self._watchdog = None
+        await self._unlisten()
+        await super().stop()
+
+    async def _listen(self) -> None:
+        """建立监听连接并注册 NOTIFY 与连接终止回调"""
+        self._lost.clear()
+        self._listen_conn = await self._engine.connect()
+        raw = await self._listen_conn.get_raw_connection()
+        self._driver = raw.driver_connection
+        self._driver.add_termination_listener(self._on_terminate)
+        await self._driver.add_listener(self._channel, self._on_notify)
+
+    async def _unlisten(self) -> None:
+        """释放监听连接（连接已断开时忽略错误）"""
+        if self._driver is not None:
+            with contextlib.suppress(Exception):
+                self._driver.remove_termination_listener(self._on_terminate)
+                await self._driver.remove_listener(self._channel, self._on_notify)
+            self._driver = None
+        if self._listen_conn is not None:
+            with contextlib.suppress(Exception):
+                await self._listen_conn.close()
+            self._listen_conn = None
+        self._partial.clear()
+
+    def _on_terminate(self, connection: Any) -> None:
+        self._lost.set()
+
+    async def _healthy(self) -> bool:
+        try:
+            await asyncio.wait_for(self._driver.execute("SELECT 1"), self._HEALTH_TIMEOUT)
+        except Exception:
+            return False
+        return True
+
+    async def _watch(self) -> None:
+        """等待断开信号或周期性探活；断开后退避重连并触发 resync"""
+        while True:
+            try:
+                await asyncio.wait_for(self._lost.wait(), self._HEALTH_INTERVAL)
+            except asyncio.TimeoutError:
+                if await self._healthy():
+                    continue
+            logger.warning("broadcast listener connection lost, reconnecting")
+            await self._unlisten()
+            delay = self._RECONNECT_DELAY
+            while True:
+                try:
+                    await self._listen()
+                    break
+                except Exception as exc:
+                    logger.warning("broadcast listener reconnect failed: %s", exc)
+                    await self._unlisten()
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, self._RECONNECT_MAX_DELAY)
+            self._gap()
+
+    async def publish(
+        self, board_id: UUID, event_type: str, payload: dict[str, Any]
+    ) -> None:
+        message = _encode(board_id, event_type, payload)
+        if len(message) <= self._CHUNK:
+            notifications = [message.decode()]
+        else:
+            # 分片格式: #<消息 ID>:<序号>:<总数>:<内容>
+            msg_id = uuid.uuid4().hex
+            parts = _split_utf8(message, self._CHUNK)
+            notifications = [
+                f"#{msg_id}:{idx}:{len(parts)}:{part}" for idx, part in enumerate(parts)
+            ]
+
+        async with self._engine.connect() as conn:
+            for notification in notifications:
+                await conn.execute(
+                    text("SELECT pg_notify(:channel, :payload)"),
+                    {"channel": self._channel, "payload": notification},
+                )
+            await conn.commit()
+
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        if not payload.startswith("#"):
+            self._receive(payload)
+            return
+        msg_id, idx, total, part = payload[1:].split(":", 3)
+        parts = self._partial.setdefault(msg_id, [])
+        parts.append(part)
+        if len(parts) == int(total):
+            del self._partial[msg_id]
+            self._receive("".join(parts))
+
+
+# -----------------------------------------------------------------------------
+#  本机 Unix 套接字 hub
+# -----------------------------------------------------------------------------
+class UnixSocketBackend(BroadcastBackend):
+    """
+    同机多 worker 广播：持有 <path>.lock 文件锁的进程充当 hub，转发任一客户端的消息给全部客户端
+
+    每个进程（包括 hub 自身）都以客户端身份连接 hub；hub 进程退出后文件锁释放，
+    其余进程在重连循环中竞争成为新 hub。消息以换行分隔；
+    接收积压超过 _CLIENT_BUFFER_LIMIT 的客户端被 hub 断开，重连后 resync
+    """
+
+    _LINE_LIMIT = 2**24
+    # hub 对单个客户端的未发送字节上限
+    _CLIENT_BUFFER_LIMIT = 2**25
+    _RECONNECT_DELAY = 0.5
+    _PUBLISH_TIMEOUT = 2.0
+
+    def __init__(
+        self, deliver: Deliver, path: str, resync: Optional[Resync] = None
+    ) -> None:
+        super().__init__(deliver, resync)
+        self._path = path
+        self._lock_fd: Optional[int] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._hub_clients: set[asyncio.StreamWriter] = set()
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._connected = asyncio.Event()
+        self._runner: Optional[asyncio.Task] = None
+
+    @property
+    def is_hub(self) -> bool:
+        return self._server is not None
+
+    async def start(self) -> None:
+        await super().start()
+        self._runner = asyncio.create_task(self._run())
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self._connected.wait(), self._PUBLISH_TIMEOUT)
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            self._runner.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._runner
+            self._runner = None
+        if self._server is not None:
+            self._server.close()
+            for client in list(self._hub_clients):
+                client.close()
+            await self._server.wait_closed()
+            self._server = None
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(self._path)
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+        await super().stop()
+
+    async def publish(
+        self, board_id: UUID, event_type: str, payload: dict[str, Any]
+    ) -> None:
+        message = _encode(board_id, event_type, payload)
+        try:
+            await asyncio.wait_for(self._connected.wait(), self._PUBLISH_TIMEOUT)
+            self._writer.write(message + b"\n")
+            await self._writer.drain()
+        except (asyncio.TimeoutError, AttributeError, ConnectionError):
+            # hub 不可用：至少投递给本进程的连接
+            logger.warning("broadcast hub unavailable, delivering locally only")
+            await self._deliver(board_id, event_type, payload)
+
+    # -------------------------------------------------------------------------
+    #  客户端
+    # -------------------------------------------------------------------------
+    async def _run(self) -> None:
+        connected_before = False
+        while True:
+            try:
+                await self._try_become_hub()
+                reader, writer = await asyncio.open_unix_connection(
+                    self._path, limit=self._LINE_LIMIT
+                )
+                if connected_before:
+                    # 断开期间 hub 转发的消息已丢失
+                    self._gap()
+                connected_before = True
+                self._writer = writer
+                self._connected.set()
+                try:
+                    while line := await reader.readline():
+                        self._receive(line)
+                finally:
+                    self._connected.clear()
+                    self._writer = None
+                    writer.close()
+            except (ConnectionError, OSError) as exc:
+                logger.debug("broadcast hub connection failed: %s", exc)
+            await asyncio.sleep(self._RECONNECT_DELAY)
+
+    # -------------------------------------------------------------------------
+    #  Hub
+    # -------------------------------------------------------------------------
+    async def _try_become_hub(self) -> None:
+        """抢占文件锁成功则启动 hub（已是 hub 时不做任何事）"""
+        if self._server is not None:
+            return
+        fd = os.open(f"{self._path}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return
+        self._lock_fd = fd
+        # 持锁后残留的套接字文件必属于已退出的 hub
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self._path)
+        self._server = await asyncio.start_unix_server(
+            self._serve_client, path=self._path, limit=self._LINE_LIMIT
+        )
+
+    async def _serve_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self._hub_clients.add(writer)
+        try:
+            while line := await reader.readline():
+                for client in list(self._hub_clients):
+                    client.write(line)
+                    # 不等待慢客户端（会阻塞对其他客户端的转发）：积压超限即断开，
+                    # 该进程重连后触发 resync
+                    if client.transport.get_write_buffer_size() > self._CLIENT_BUFFER_LIMIT:
+                        logger.warning("broadcast hub client too slow, disconnecting")
+                        metrics.inc("broadcast.slow_clients")
+                        self._hub_clients.discard(client)
+                        client.close()
+        except ConnectionError:
+            pass
+        finally:
+            self._hub_clients.discard(writer)
+            writer.close()
@@ -0,0 +1,107 @@
+# ==============================================================================
+#  Board Cache - 看板读缓存
+# ==============================================================================
+"""
+[INPUT]: 依赖 app.core.config 的 settings，app.core.metrics 的 metrics
+[OUTPUT]: 对外提供 BoardCache 进程内 LRU 读缓存，board_cache 单例
+[POS]: services 模块的读缓存，被看板 / 列 / 任务读取端点使用，由 realtime 在事件投递时失效
+[PROTOCOL]: 变更时更新此头部，然后检查 CLAUDE.md
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Optional
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+
+class BoardCache:
+    """
+    看板读缓存：(看板 ID, 视图) -> (修订号, 序列化后的 JSON 响应体)
+
+    条目以 Board.revision 校验：读取方先查询当前修订号，不一致即视为未命中，
+    因此正确性不依赖事件送达；事件投递时的失效只负责及早释放内存。
+    按条目数与总字节数双重上限做 LRU 淘汰（单 worker 视角，仅在事件循环内访问）
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple[UUID, str], tuple[int, bytes]] = OrderedDict()
+        # 看板 -> 已缓存的视图，失效时无需扫描全部条目
+        self._views: dict[UUID, set[str]] = {}
+        self._bytes = 0
+
+    def get(self, board_id: UUID, view: str, revision: int) -> Optional[bytes]:
+        """命中且修订号一致时返回响应体并标记为最近使用"""
+        if not self.enabled:
+            return None
+        key = (board_id, view)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != revision:
+            metrics.inc("board_cache.miss")
+            return None
+        self._entries.move_to_end(key)
+        metrics.inc("board_cache.hit")
+        return entry[1]
+
+    def put(self, board_id: UUID, view: str, revision: int, body: bytes) -> None:
+        """写入条目（覆盖同键旧条目），超出上限时淘汰最久未使用的条目"""
+        if not self.enabled or len(body) > self.max_bytes:
+            return
+        key = (board_id, view)
+        self._discard(key)
+        self._entries[key] = (revision, body)
+        self._views.setdefault(board_id, set()).add(view)
+        self._bytes += len(body)
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._discard(oldest)
+            metrics.inc("board_cache.evicted")
+
+    def invalidate(self, board_id: UUID) -> None:
+        """丢弃看板的全部视图（写入事件投递时调用）"""
+        views = self._views.get(board_id)
+        if not views:
+            return
+        for view in tuple(views):
+            self._discard((board_id, view))
+        metrics.inc("board_cache.invalidated")
+
+    def clear(self) -> None:
+        """清空缓存（测试用）"""
+        self._entries.clear()
+        self._views.clear()
+        self._bytes = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        """当前占用，供 /metrics 展示（命中 / 未命中 / 淘汰计数在 metrics 计数器中）"""
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+        }
+
+    def _discard(self, key: tuple[UUID, str]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= len(entry[1])
+        board_id, view = key
+        views = self._views[board_id]
+        views.discard(view)
+        if not views:
+            del self._views[board_id]
+
+
+# 全局缓存实例
+board_cache = BoardCache(
+    max_entries=settings.board_cache_max_entries,
+    max_bytes=settings.board_cache_max_bytes,
+    enabled=settings.board_cache_enabled,
+)
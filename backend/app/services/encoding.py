@@ -0,0 +1,85 @@
+# ==============================================================================
+#  Event Encoding - WebSocket 帧编码
+# ==============================================================================
+"""
+[INPUT]: 依赖 orjson，可选依赖 msgpack，依赖 pydantic BaseModel (schemas.events 载荷模型)
+[OUTPUT]: 对外提供 Frame, payload_dict, negotiate_subprotocol, JSON_SUBPROTOCOL, MSGPACK_SUBPROTOCOL
+[POS]: services 模块的事件编码层，被 realtime 使用；每个事件每种格式只编码一次，所有订阅者共享
+[PROTOCOL]: 变更时更新此头部，然后检查 CLAUDE.md
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Optional, Sequence, Union
+from uuid import UUID
+
+import orjson
+from pydantic import BaseModel
+
+try:
+    import msgpack
+except ImportError:  # 可选依赖：未安装时不提供二进制子协议
+    msgpack = None
+
+# WebSocket 子协议（Sec-WebSocket-Protocol）
+JSON_SUBPROTOCOL = "kanban.json"
+MSGPACK_SUBPROTOCOL = "kanban.msgpack"
+
+
+def payload_dict(payload: Union[BaseModel, dict[str, Any]]) -> dict[str, Any]:
+    """载荷模型转为 dict（UUID / datetime 保持原类型，由编码器直接处理）"""
+    if isinstance(payload, BaseModel):
+        return payload.model_dump()
+    return payload
+
+
+def negotiate_subprotocol(requested: Sequence[str]) -> Optional[str]:
+    """按客户端请求的子协议选择帧格式；msgpack 未安装时不接受二进制格式"""
+    if MSGPACK_SUBPROTOCOL in requested and msgpack is not None:
+        return MSGPACK_SUBPROTOCOL
+    if JSON_SUBPROTOCOL in requested:
+        return JSON_SUBPROTOCOL
+    return None
+
+
+def _msgpack_default(value: Any) -> Any:
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"cannot encode {type(value).__name__}")
+
+
+class Frame:
+    """一条待发送的事件帧：惰性编码，每种格式最多编码一次"""
+
+    __slots__ = ("seq", "envelope", "_text", "_text_size", "_binary")
+
+    def __init__(self, envelope: dict[str, Any], seq: Optional[int] = None) -> None:
+        self.seq = seq
+        self.envelope = envelope
+        self._text: Optional[str] = None
+        self._text_size = 0
+        self._binary: Optional[bytes] = None
+
+    def text(self) -> str:
+        """JSON 文本帧"""
+        if self._text is None:
+            # 载荷中的 dict 可能以 UUID 为键（如 column_versions）
+            raw = orjson.dumps(self.envelope, option=orjson.OPT_NON_STR_KEYS)
+            self._text = raw.decode()
+            self._text_size = len(raw)
+        return self._text
+
+    def size(self, binary: bool = False) -> int:
+        """已编码帧的 UTF-8 / msgpack 字节数"""
+        if binary:
+            return len(self.binary())
+        self.text()
+        return self._text_size
+
+    def binary(self) -> bytes:
+        """msgpack 二进制帧"""
+        if self._binary is None:
+            self._binary = msgpack.packb(self.envelope, default=_msgpack_default)
+        return self._binary
@@ -2,37 +2,703 @@
 #  Task Ordering Service - 任务排序业务逻辑
 # ==============================================================================
 """
-[INPUT]: 依赖 SQLAlchemy AsyncSession, app.models.Task
-[OUTPUT]: 对外提供 move_task, reorder_column
-[POS]: services 模块的核心排序逻辑，处理跨列/同列移动
+[INPUT]: 依赖 SQLAlchemy AsyncSession, app.models.Task / Column / BoardRevision, app.core.config, app.core.metrics, app.schemas.events, app.services.realtime
+[OUTPUT]: 对外提供 move_task, move_task_with_shifts, position_shifts, move_tasks, reorder_column, sort_column, SORT_FIELDS, open_slot,
+          rank_between, spread_ranks, rank_for_index, task_order, dense_positions, remove_tasks, move_all_tasks,
+          find_columns_to_rebalance, rebalance_column, rebalance_once, run_rank_rebalancer, column_lock, snapshot_columns, bump_columns, bump_board, board_of_column,
+          compact_board_revisions, run_revision_compactor
+[POS]: services 模块的核心排序逻辑，处理跨列/同列移动，支持 position / rank 两种排序模式
 [PROTOCOL]: 变更时更新此头部，然后检查 CLAUDE.md
 """
 from __future__ import annotations
 
+import asyncio
+import logging
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import AsyncIterator, Iterable, Optional, Sequence, Union
 from uuid import UUID
 
-from sqlalchemy import select, update
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import (
+    and_,
+    case,
+    delete,
+    distinct,
+    exists,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.sql.selectable import ScalarSelect
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.exc import StaleDataError
 
-from app.models import Task
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models import BoardRevision, Column, Task
+from app.schemas.events import ColumnRebalancedPayload, TaskMovedPayload
+from app.services.realtime import broadcast_event
 
+logger = logging.getLogger(__name__)
 
-async def reorder_column(db: AsyncSession, column_id: UUID) -> None:
+# -----------------------------------------------------------------------------
+#  Rank 键
+#  仅使用数字 + 小写字母，保证在 SQLite 与 PostgreSQL 常见排序规则下字典序一致
+# -----------------------------------------------------------------------------
+RANK_ALPHABET = "0123456789abcdefghijklmnopqrstuvwxyz"
+RANK_BASE = len(RANK_ALPHABET)
+_RANK_DIGITS = {ch: i for i, ch in enumerate(RANK_ALPHABET)}
+
+
+def rank_between(lo: Optional[str], hi: Optional[str]) -> str:
     """
-    整列重排 position (0, 1, 2, ...)
+    生成严格位于 lo 与 hi 之间的 rank 键
+
+    None 表示无边界；生成的键永不以最小字符结尾，保证其前方总有空间
+    """
+    lo = lo or ""
+    if hi is not None and lo >= hi:
+        raise ValueError(f"rank 区间为空: {lo!r} >= {hi!r}")
+
+    prefix = []
+    i = 0
+    while True:
+        if hi is not None and i >= len(hi):
+            raise ValueError(f"rank 键不合法: {hi!r}")
+        lo_digit = _RANK_DIGITS[lo[i]] if i < len(lo) else 0
+        hi_digit = _RANK_DIGITS[hi[i]] if hi is not None else RANK_BASE
+        if lo_digit == hi_digit:
+            prefix.append(RANK_ALPHABET[lo_digit])
+            i += 1
+            continue
+
+        mid = (lo_digit + hi_digit) // 2
+        if mid > lo_digit:
+            return "".join(prefix) + RANK_ALPHABET[mid]
+
+        # 相邻字符: 取 lo 的字符后，后续位只需大于 lo 的剩余部分
+        prefix.append(RANK_ALPHABET[lo_digit])
+        hi = None
+        i += 1
+
+
+def spread_ranks(count: int) -> list[str]:
+    """生成 count 个均匀分布的 rank 键（等宽编码后去除末尾最小字符）"""
+    width = 1
+    while RANK_BASE**width < (count + 1) * RANK_BASE:
+        width += 1
+    step = RANK_BASE**width // (count + 1)
+
+    ranks = []
+    for idx in range(1, count + 1):
+        value = step * idx
+        digits = []
+        for _ in range(width):
+            value, digit = divmod(value, RANK_BASE)
+            digits.append(RANK_ALPHABET[digit])
+        ranks.append("".join(reversed(digits)).rstrip(RANK_ALPHABET[0]))
+    return ranks
+
+
+# -----------------------------------------------------------------------------
+#  读取顺序
+# -----------------------------------------------------------------------------
+def task_order() -> tuple:
+    """当前排序模式下的 ORDER BY 子句（rank 为空的存量行按 position 排）"""
+    if settings.ordering_mode == "rank":
+        return (Task.rank, Task.position)
+    return (Task.position,)
+
+
+def dense_positions(tasks: Sequence[Task]) -> list[Task]:
+    """
+    rank 模式下按列重新编号 position (0, 1, 2, ...)
 
-    采用整列重排策略：简单可靠，避免 position 冲突
+    tasks 须已按 task_order() 排序；仅修改内存中的值，不会产生写入
     """
+    if settings.ordering_mode != "rank":
+        return list(tasks)
+
+    counters: dict[UUID, int] = {}
+    for task in tasks:
+        idx = counters.get(task.column_id, 0)
+        set_committed_value(task, "position", idx)
+        counters[task.column_id] = idx + 1
+    return sorted(tasks, key=lambda t: t.position)
+
+
+# -----------------------------------------------------------------------------
+#  Rank 模式
+# -----------------------------------------------------------------------------
+async def _respread_column(db: AsyncSession, column_id: UUID) -> None:
+    """按当前顺序为整列重新分配均匀 rank 键"""
     result = await db.execute(
-        select(Task)
-        .where(Task.column_id == column_id)
-        .order_by(Task.position)
+        select(Task).where(Task.column_id == column_id).order_by(*task_order())
     )
     tasks = list(result.scalars().all())
+    for task, rank in zip(tasks, spread_ranks(len(tasks))):
+        task.rank = rank
+    await db.flush()
+
+
+async def _ensure_ranks(db: AsyncSession, column_id: UUID) -> None:
+    """存量列首次以 rank 模式写入时，按 position 补齐 rank 键"""
+    missing = await db.scalar(
+        select(exists().where(Task.column_id == column_id, Task.rank == ""))
+    )
+    if missing:
+        await _respread_column(db, column_id)
+
+
+async def rank_for_index(
+    db: AsyncSession,
+    column_id: UUID,
+    index: int,
+    exclude_id: Optional[UUID] = None,
+) -> tuple[str, int]:
+    """
+    计算插入到列中第 index 位所需的 rank 键
+
+    返回 (rank, 修正后的 index)；只读取相邻行，不改写其他任务
+    """
+    await _ensure_ranks(db, column_id)
+
+    conditions = [Task.column_id == column_id]
+    if exclude_id is not None:
+        conditions.append(Task.id != exclude_id)
+    ranks = select(Task.rank).where(*conditions)
+
+    index = max(index, 0)
+    result = await db.execute(
+        ranks.order_by(*task_order()).offset(max(index - 1, 0)).limit(2 if index else 1)
+    )
+    neighbours = list(result.scalars().all())
+    if index == 0:
+        lo, hi = None, (neighbours[0] if neighbours else None)
+    elif neighbours:
+        lo, hi = neighbours[0], (neighbours[1] if len(neighbours) > 1 else None)
+    else:
+        # 超出列尾：追加到最后
+        index = await db.scalar(select(func.count()).select_from(Task).where(*conditions))
+        lo, hi = await db.scalar(ranks.order_by(*(c.desc() for c in task_order()))), None
+
+    _dirty_columns.add(column_id)
+    try:
+        return rank_between(lo, hi), index
+    except ValueError:
+        # 并发写入导致相邻键重复：整列重新分配后重试一次
+        await _respread_column(db, column_id)
+        return await rank_for_index(db, column_id, index, exclude_id)
+
+
+async def _move_by_rank(
+    db: AsyncSession,
+    task: Task,
+    to_column_id: UUID,
+    to_position: int,
+    with_shifts: bool = False,
+) -> tuple[Task, Optional[int], Optional[list[dict]], None]:
+    """
+    rank 模式移动：计算相邻键之间的新键，仅更新被移动的一行
+
+    with_shifts 时额外计数一次原列中排在前面的任务，得到移动前的稠密下标，
+    返回 (task, 原下标, 区间平移, None)；否则中间两项为 None。
+    兄弟任务与列均不写入，版本号不变
+    """
+    from_column_id = task.column_id
+    from_position = None
+    if with_shifts:
+        from_position = await db.scalar(
+            select(func.count())
+            .select_from(Task)
+            .where(
+                Task.column_id == from_column_id,
+                or_(
+                    Task.rank < task.rank,
+                    and_(Task.rank == task.rank, Task.position < task.position),
+                ),
+            )
+        )
+
+    rank, to_position = await rank_for_index(
+        db, to_column_id, to_position, exclude_id=task.id
+    )
+    task.column_id = to_column_id
+    task.rank = rank
+    task.position = to_position
+
+    await bump_board(db, task.board_id)
+    await db.commit()
+    await db.refresh(task)
+
+    if from_position is None:
+        return task, None, None, None
+    shifts = position_shifts(from_column_id, from_position, to_column_id, to_position)
+    return task, from_position, shifts, None
+
+
+# -----------------------------------------------------------------------------
+#  Rank 再平衡（后台任务，不在请求路径上）
+# -----------------------------------------------------------------------------
+# 自上一轮再平衡以来写入过新 rank 键的列（进程内，每个 worker 的再平衡任务只检查本进程写过的列）
+_dirty_columns: set[UUID] = set()
+
+
+async def find_columns_to_rebalance(
+    db: AsyncSession, limit: int, column_ids: Optional[Iterable[UUID]] = None
+) -> list[tuple[UUID, UUID]]:
+    """
+    查找需要再平衡的列，返回 (board_id, column_id)
+
+    判定条件：最长 rank 键超过 rank_max_length，或存在重复键（反复插入同一位置导致精度耗尽）
+    column_ids: 只检查这些列；None 时扫描全表
+    """
+    conditions = [Task.rank != ""]
+    if column_ids is not None:
+        conditions.append(Task.column_id.in_(column_ids))
+    result = await db.execute(
+        select(Task.board_id, Task.column_id)
+        .where(*conditions)
+        .group_by(Task.board_id, Task.column_id)
+        .having(
+            or_(
+                func.max(func.length(Task.rank)) > settings.rank_max_length,
+                func.count(Task.rank) > func.count(distinct(Task.rank)),
+            )
+        )
+        .limit(limit)
+    )
+    return [(row.board_id, row.column_id) for row in result.all()]
+
+
+async def rebalance_column(db: AsyncSession, column_id: UUID) -> list[UUID]:
+    """
+    按当前顺序为整列重新分配均匀 rank 键，返回列内任务 ID 顺序
+
+    锁定列内行（SQLite 忽略 FOR UPDATE）后分批写入，整列在同一事务内提交
+    """
+    async with column_lock(db, (column_id,)):
+        return await _rebalance_column(db, column_id)
+
 
-    for idx, task in enumerate(tasks):
-        if task.position != idx:
-            task.position = idx
+async def _rebalance_column(db: AsyncSession, column_id: UUID) -> list[UUID]:
+    result = await db.execute(
+        select(Task.id, Task.version)
+        .where(Task.column_id == column_id)
+        .order_by(Task.rank, Task.position)
+        .with_for_update()
+    )
+    locked = result.all()
+    task_ids = [row.id for row in locked]
+
+    rows = [
+        {"id": row.id, "version": row.version, "rank": rank}
+        for row, rank in zip(locked, spread_ranks(len(locked)))
+    ]
+    batch_size = settings.rank_rebalance_batch_size
+    for start in range(0, len(rows), batch_size):
+        await db.execute(update(Task), rows[start : start + batch_size])
+    await bump_board(db, board_of_column(column_id))
+
+    await db.commit()
+    return task_ids
+
+
+async def rebalance_once(db: AsyncSession, full_scan: bool = False) -> int:
+    """
+    执行一轮再平衡并广播 column_rebalanced，返回处理的列数
+
+    默认只检查上一轮以来写入过 rank 键的列；full_scan 时扫描全表（进程启动后的首轮，
+    覆盖重启前的写入）。本轮期间的新写入重新标记，留待下一轮
+    """
+    limit = settings.rank_rebalance_columns
+    if full_scan:
+        candidates = None
+    elif not _dirty_columns:
+        return 0
+    else:
+        candidates = set(_dirty_columns)
+        _dirty_columns.clear()
+
+    try:
+        columns = await find_columns_to_rebalance(db, limit, candidates)
+    except Exception:
+        if candidates:
+            _dirty_columns.update(candidates)
+        raise
+    if candidates and len(columns) == limit:
+        # 达到每轮上限：其余候选列可能同样需要处理
+        _dirty_columns.update(candidates.difference(c for _, c in columns))
+
+    for board_id, column_id in columns:
+        task_ids = await rebalance_column(db, column_id)
+        await broadcast_event(
+            board_id,
+            "column_rebalanced",
+            ColumnRebalancedPayload(column_id=column_id, task_ids=task_ids),
+        )
+        # 列之间让出事件循环，避免长时间占用
+        await asyncio.sleep(0)
+    return len(columns)
+
+
+async def run_rank_rebalancer(session_factory: async_sessionmaker) -> None:
+    """
+    后台循环：按 rank_rebalance_interval 周期执行再平衡，由 lifespan 启动和取消
+
+    首轮扫描全表，之后只检查写入过的列
+    """
+    full_scan = True
+    while True:
+        await asyncio.sleep(settings.rank_rebalance_interval)
+        try:
+            async with session_factory() as db:
+                await rebalance_once(db, full_scan=full_scan)
+            full_scan = False
+        except Exception:
+            logger.exception("rank rebalance failed")
+
+
+# -----------------------------------------------------------------------------
+#  列级写锁（可选，settings.column_write_lock）
+#  同一列的写入者串行执行，其他列不受影响；按列 ID 排序加锁避免死锁
+# -----------------------------------------------------------------------------
+class _KeyedLocks:
+    """进程内按 key 分配的 asyncio.Lock 表，无持有者/等待者时回收"""
+
+    def __init__(self) -> None:
+        self._locks: dict[UUID, asyncio.Lock] = {}
+        self._users: dict[UUID, int] = {}
+
+    def locked(self, key: UUID) -> bool:
+        lock = self._locks.get(key)
+        return lock is not None and lock.locked()
+
+    @asynccontextmanager
+    async def hold(self, key: UUID) -> AsyncIterator[None]:
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        self._users[key] = self._users.get(key, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._users[key] -= 1
+            if not self._users[key]:
+                del self._users[key]
+                del self._locks[key]
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+
+_column_locks = _KeyedLocks()
+
+
+def _advisory_key(column_id: UUID) -> int:
+    """列 ID 映射为 pg_advisory_xact_lock 的 bigint 键"""
+    return int.from_bytes(column_id.bytes[:8], "big", signed=True)
+
+
+@asynccontextmanager
+async def column_lock(db: AsyncSession, column_ids: Iterable[UUID]) -> AsyncIterator[None]:
+    """
+    串行化同一列的排序写入，需包住整个事务（含 commit）
+
+    PostgreSQL: pg_advisory_xact_lock，事务结束自动释放
+    SQLite: 进程内 asyncio.Lock，退出上下文时释放
+    未开启 column_write_lock 时不做任何事
+    """
+    if not settings.column_write_lock:
+        yield
+        return
+
+    is_postgres = db.get_bind().dialect.name == "postgresql"
+    async with AsyncExitStack() as stack:
+        for column_id in sorted(set(column_ids), key=str):
+            start = time.perf_counter()
+            if is_postgres:
+                key = _advisory_key(column_id)
+                if not await db.scalar(select(func.pg_try_advisory_xact_lock(key))):
+                    metrics.inc("ordering.lock_contended")
+                    await db.execute(select(func.pg_advisory_xact_lock(key)))
+            else:
+                if _column_locks.locked(column_id):
+                    metrics.inc("ordering.lock_contended")
+                await stack.enter_async_context(_column_locks.hold(column_id))
+            metrics.observe("ordering.lock_wait_ms", (time.perf_counter() - start) * 1000)
+            metrics.inc("ordering.lock_acquired")
+        yield
+
+
+# -----------------------------------------------------------------------------
+#  列顺序版本（乐观并发）
+#  position 模式下任何改变列内顺序的写入都以“读取时的版本”为条件递增 Column.ordering_version，
+#  并发重排同一列的事务中后提交者匹配不到行，抛出 StaleDataError
+# -----------------------------------------------------------------------------
+async def snapshot_columns(db: AsyncSession, column_ids: set) -> dict[UUID, int]:
+    """读取列当前顺序版本，作为本次重排的乐观锁基线"""
+    result = await db.execute(
+        select(Column.id, Column.ordering_version).where(Column.id.in_(column_ids))
+    )
+    return {row.id: row.ordering_version for row in result.all()}
+
+
+async def bump_columns(db: AsyncSession, snapshot: dict[UUID, int]) -> None:
+    """以基线版本为条件递增列顺序版本，任一列已被并发修改则抛出 StaleDataError"""
+    for column_id, version in snapshot.items():
+        result = await db.execute(
+            update(Column)
+            .where(Column.id == column_id, Column.ordering_version == version)
+            .values(ordering_version=version + 1)
+        )
+        if result.rowcount != 1:
+            raise StaleDataError(f"column {column_id} was reordered concurrently")
+
+
+# -----------------------------------------------------------------------------
+#  看板修订号
+#  任何改变看板可见内容的写入都在提交前追加一条修订记录，读取端点据此生成 ETag、
+#  校验读缓存；rank 再平衡虽不改变顺序，但会递增任务版本号，同样追加。
+#  只插入不更新：同一看板的并发写入不争用看板行锁
+# -----------------------------------------------------------------------------
+def board_of_column(column_id: UUID) -> ScalarSelect:
+    """列所属看板 ID 的标量子查询（调用方只有列 ID 时使用）"""
+    return select(Column.board_id).where(Column.id == column_id).scalar_subquery()
+
+
+async def bump_board(db: AsyncSession, board_id: Union[UUID, ScalarSelect]) -> None:
+    """递增看板修订号（单条 INSERT，随调用方事务提交）"""
+    await db.execute(insert(BoardRevision).values(board_id=board_id))
+
+
+async def compact_board_revisions(db: AsyncSession) -> int:
+    """
+    把修订记录超过 board_revision_compact_rows 行的看板合并为一行，返回处理的看板数
+
+    DELETE ... RETURNING 只汇总本事务实际删除的行：并发写入新插入的行不可见、不受影响，
+    并发的合并者不会重复计数，修订号在合并前后保持不变
+    """
+    result = await db.execute(
+        select(BoardRevision.board_id)
+        .group_by(BoardRevision.board_id)
+        .having(func.count() > settings.board_revision_compact_rows)
+        .limit(settings.board_revision_compact_boards)
+    )
+    board_ids = result.scalars().all()
+    for board_id in board_ids:
+        result = await db.execute(
+            delete(BoardRevision)
+            .where(BoardRevision.board_id == board_id)
+            .returning(BoardRevision.weight)
+        )
+        weight = sum(result.scalars().all())
+        if weight:
+            await db.execute(
+                insert(BoardRevision).values(board_id=board_id, weight=weight)
+            )
+        await db.commit()
+    return len(board_ids)
+
+
+async def run_revision_compactor(session_factory: async_sessionmaker) -> None:
+    """后台循环：按 board_revision_compact_interval 周期合并修订记录，由 lifespan 启动和取消"""
+    while True:
+        await asyncio.sleep(settings.board_revision_compact_interval)
+        try:
+            async with session_factory() as db:
+                await compact_board_revisions(db)
+        except Exception:
+            logger.exception("board revision compaction failed")
+
+
+# -----------------------------------------------------------------------------
+#  Position 模式
+#  集合式 SQL：只平移新旧下标之间的行，不加载 ORM 对象（SQLite / PostgreSQL 通用）
+# -----------------------------------------------------------------------------
+async def _column_end(db: AsyncSession, column_id: UUID) -> int:
+    """列尾的下一个空闲 position（走 (column_id, position) 索引，不扫描整列）"""
+    end = await db.scalar(
+        select(func.max(Task.position)).where(Task.column_id == column_id)
+    )
+    return 0 if end is None else end + 1
+
+
+async def _shift(
+    db: AsyncSession,
+    column_id: UUID,
+    delta: int,
+    lo: Optional[int] = None,
+    hi: Optional[int] = None,
+) -> None:
+    """将列中 position 位于 [lo, hi] 的任务整体平移 delta 并递增版本（单条 UPDATE）"""
+    conditions = [Task.column_id == column_id]
+    if lo is not None:
+        conditions.append(Task.position >= lo)
+    if hi is not None:
+        conditions.append(Task.position <= hi)
+    await db.execute(
+        update(Task)
+        .where(*conditions)
+        .values(position=Task.position + delta, version=Task.version + 1)
+    )
+
+
+async def _renumber_column(
+    db: AsyncSession, column_id: UUID, *order_by, spread_rank: bool = False
+) -> None:
+    """
+    按 order_by 用 row_number() 窗口函数整列重新编号（单条 UPDATE ... FROM）
+
+    spread_rank: 同一条 UPDATE 内按新序号写入 spread_ranks 均匀键，
+    rank 模式下的读取顺序与新的 position 一致，无需再补齐或再平衡
+    """
+    ranked = (
+        select(
+            Task.id,
+            (func.row_number().over(order_by=order_by) - 1).label("idx"),
+        )
+        .where(Task.column_id == column_id)
+        .subquery()
+    )
+    changed = Task.position != ranked.c.idx
+    values = {"position": ranked.c.idx, "version": Task.version + 1}
+    if spread_rank:
+        count = await db.scalar(
+            select(func.count()).select_from(Task).where(Task.column_id == column_id)
+        )
+        if not count:
+            return
+        rank = case(dict(enumerate(spread_ranks(count))), value=ranked.c.idx)
+        changed = or_(changed, Task.rank != rank)
+        values["rank"] = rank
+    await db.execute(
+        update(Task)
+        .where(Task.id == ranked.c.id, changed)
+        .values(**values)
+        .execution_options(synchronize_session="fetch")
+    )
+
+
+async def open_slot(db: AsyncSession, column_id: UUID, position: int) -> int:
+    """在列中腾出 position 位置（其后任务 +1），返回修正后的 position"""
+    position = max(0, min(position, await _column_end(db, column_id)))
+    await _shift(db, column_id, 1, lo=position)
+    return position
+
+
+async def reorder_column(db: AsyncSession, column_id: UUID) -> None:
+    """
+    整列重排 position (0, 1, 2, ...)
+
+    单条窗口函数 UPDATE，只改写 position 实际变化的行
+    """
+    await _renumber_column(db, column_id, Task.position, Task.id)
+    await bump_board(db, board_of_column(column_id))
+
+
+# 服务端排序可用字段
+SORT_FIELDS = {
+    "title": Task.title,
+    "created_at": Task.created_at,
+    "updated_at": Task.updated_at,
+}
+
+
+async def sort_column(
+    db: AsyncSession, column_id: UUID, by: str, descending: bool = False
+) -> None:
+    """
+    按字段整列排序（单条窗口函数 UPDATE，id 作为并列时的稳定次序）
+
+    两种排序模式通用：rank 模式下同时按新顺序重新分配均匀 rank 键
+    """
+    key = SORT_FIELDS[by]
+    async with column_lock(db, (column_id,)):
+        snapshot = await snapshot_columns(db, {column_id})
+        await _renumber_column(
+            db,
+            column_id,
+            key.desc() if descending else key,
+            Task.id,
+            spread_rank=settings.ordering_mode == "rank",
+        )
+        await bump_columns(db, snapshot)
+        await bump_board(db, board_of_column(column_id))
+        await db.commit()
+
+
+async def _move_by_position(
+    db: AsyncSession,
+    task: Task,
+    to_column_id: UUID,
+    to_position: int,
+) -> tuple[Task, int, list[dict], dict[UUID, int]]:
+    """
+    position 模式移动，返回 (task, 原 position, 区间平移, 受影响列的新版本)
+
+    同列: 只平移新旧下标之间的行 (±1)
+    跨列: 原列其后的行 -1，目标列插入点之后的行 +1
+
+    被移动行按其版本号条件更新；受影响列按基线版本递增，冲突时抛出 StaleDataError。
+    被平移的兄弟任务版本号 +1，区间平移中以 version_delta 标明
+    """
+    from_column_id = task.column_id
+    from_position = task.position
+    snapshot = await snapshot_columns(db, {from_column_id, to_column_id})
+
+    # 同列移动时列尾即任务自身可占据的最后位置
+    max_position = await _column_end(db, to_column_id)
+    if from_column_id == to_column_id:
+        max_position -= 1
+    to_position = max(0, min(to_position, max_position))
+
+    shifts = position_shifts(from_column_id, from_position, to_column_id, to_position)
+    for shift in shifts:
+        await _shift(db, shift["column_id"], shift["delta"], lo=shift["start"], hi=shift["end"])
+        shift["version_delta"] = 1
+
+    task.column_id = to_column_id
+    task.position = to_position
+
+    await bump_columns(db, snapshot)
+    await bump_board(db, task.board_id)
+    await db.commit()
+    await db.refresh(task)
+
+    column_versions = {column_id: version + 1 for column_id, version in snapshot.items()}
+    return task, from_position, shifts, column_versions
+
+
+def position_shifts(
+    from_column_id: UUID,
+    from_position: int,
+    to_column_id: UUID,
+    to_position: int,
+) -> list[dict]:
+    """
+    单个任务移动对同列其他任务的影响，以区间平移描述
+
+    每项 {column_id, start, end, delta}：移动前 position 位于 [start, end] 的任务平移 delta
+    （end 为 None 表示直到列尾）。两种排序模式通用，rank 模式下 position 即对外的稠密下标
+    """
+    if from_column_id == to_column_id:
+        if to_position < from_position:
+            return [_range(to_column_id, to_position, from_position - 1, 1)]
+        if to_position > from_position:
+            return [_range(to_column_id, from_position + 1, to_position, -1)]
+        return []
+    return [
+        _range(from_column_id, from_position + 1, None, -1),
+        _range(to_column_id, to_position, None, 1),
+    ]
+
+
+def _range(column_id: UUID, start: int, end: Optional[int], delta: int) -> dict:
+    return {"column_id": column_id, "start": start, "end": end, "delta": delta}
 
 
 async def move_task(
@@ -44,53 +710,410 @@ async def move_task(
     """
     移动任务到目标列的指定位置
 
-    事务逻辑：
-    1. 从原列移除（若同列移动则跳过）
-    2. 在目标列插入到 to_position
-    3. 整列重排受影响的列
+    position 模式: 集合式平移受影响区间，行数与移动距离成正比
+    rank 模式: 计算相邻 rank 键，只更新被移动的任务
+
+    开启 column_write_lock 时先串行化源列与目标列，拿到锁后重新读取任务，
+    排队的写入者基于最新状态执行而不是因版本冲突失败
+    """
+    task, _, _, _ = await _move_task(db, task, to_column_id, to_position)
+    return task
+
+
+async def move_task_with_shifts(
+    db: AsyncSession,
+    task: Task,
+    to_column_id: UUID,
+    to_position: int,
+) -> tuple[Task, TaskMovedPayload]:
+    """
+    移动任务并返回 task_moved 事件载荷
+
+    载荷附带移动前位置与兄弟任务的区间平移（见 position_shifts），
+    客户端据此就地更新两列顺序，无需重新拉取；rank 模式多一次计数查询。
+    同时附带被移动任务与受影响列的新版本号，客户端持有的 If-Match 版本随之更新
     """
     from_column_id = task.column_id
-    is_same_column = from_column_id == to_column_id
+    task, from_position, shifts, column_versions = await _move_task(
+        db, task, to_column_id, to_position, with_shifts=True
+    )
+    payload = TaskMovedPayload(
+        id=task.id,
+        from_column_id=from_column_id,
+        to_column_id=task.column_id,
+        position=task.position,
+        version=task.version,
+        from_position=from_position,
+        shifts=shifts,
+        column_versions=column_versions,
+    )
+    return task, payload
+
+
+async def _move_task(
+    db: AsyncSession,
+    task: Task,
+    to_column_id: UUID,
+    to_position: int,
+    with_shifts: bool = False,
+) -> tuple[Task, Optional[int], Optional[list[dict]], Optional[dict[UUID, int]]]:
+    async with column_lock(db, (task.column_id, to_column_id)):
+        if settings.column_write_lock:
+            await db.refresh(task)
+        if settings.ordering_mode == "rank":
+            return await _move_by_rank(db, task, to_column_id, to_position, with_shifts)
+        return await _move_by_position(db, task, to_column_id, to_position)
 
-    # -------------------------------------------------------------------------
-    #  Step 1: 从原列移除（仅跨列时需要重排原列）
-    # -------------------------------------------------------------------------
-    if not is_same_column:
-        task.column_id = to_column_id
+
+# -----------------------------------------------------------------------------
+#  批量移动
+# -----------------------------------------------------------------------------
+def _assign_ranks(ids: list[UUID], ranks: dict[UUID, str], moved: set) -> list[UUID]:
+    """
+    为列中被移动的任务生成 rank 键（位于最终相邻任务之间），返回需写入的任务 ID
+
+    相邻未移动任务的键冲突时退化为整列重新分配
+    """
+    # 逆序预计算每个位置之后第一个未移动任务的键
+    next_anchor: list[Optional[str]] = [None] * len(ids)
+    anchor = None
+    for idx in range(len(ids) - 1, -1, -1):
+        next_anchor[idx] = anchor
+        if ids[idx] not in moved:
+            anchor = ranks[ids[idx]]
+
+    try:
+        assigned = {}
+        prev = None
+        for idx, task_id in enumerate(ids):
+            if task_id in moved:
+                assigned[task_id] = rank_between(prev, next_anchor[idx])
+            prev = assigned.get(task_id, ranks[task_id])
+    except ValueError:
+        assigned = dict(zip(ids, spread_ranks(len(ids))))
+
+    ranks.update(assigned)
+    return list(assigned)
+
+
+async def move_tasks(
+    db: AsyncSession,
+    moves: Sequence[tuple[Task, UUID, int]],
+) -> list[Task]:
+    """
+    批量移动任务，moves 为按顺序应用的 (task, to_column_id, to_position)
+
+    事务逻辑：
+    1. 一次查询读取所有受影响列的当前顺序
+    2. 在内存中依次模拟每个移动
+    3. 每个受影响列只计算一次最终顺序，仅写入实际变化的行（单条 executemany）
+
+    被移动任务的版本以调用方已加载的对象为准，读取后被并发修改同样抛出 StaleDataError
+    （开启 column_write_lock 时拿到锁后重新读取，改为排队而不是冲突）
+    """
+    column_ids = {task.column_id for task, _, _ in moves}
+    column_ids.update(to_column_id for _, to_column_id, _ in moves)
+
+    async with column_lock(db, column_ids):
+        if settings.column_write_lock:
+            await db.execute(
+                select(Task)
+                .where(Task.id.in_({task.id for task, _, _ in moves}))
+                .execution_options(populate_existing=True)
+            )
+        return await _move_tasks(db, moves)
+
+
+async def _move_tasks(
+    db: AsyncSession,
+    moves: Sequence[tuple[Task, UUID, int]],
+) -> list[Task]:
+    tasks = {task.id: task for task, _, _ in moves}
+    column_ids = {task.column_id for task in tasks.values()}
+    column_ids.update(to_column_id for _, to_column_id, _ in moves)
+
+    rank_mode = settings.ordering_mode == "rank"
+    if rank_mode:
+        for column_id in column_ids:
+            await _ensure_ranks(db, column_id)
+    else:
+        snapshot = await snapshot_columns(db, column_ids)
 
     # -------------------------------------------------------------------------
-    #  Step 2: 获取目标列任务列表（排除当前任务）
+    #  Step 1: 读取受影响列的当前顺序
     # -------------------------------------------------------------------------
     result = await db.execute(
-        select(Task)
-        .where(Task.column_id == to_column_id, Task.id != task.id)
-        .order_by(Task.position)
+        select(Task.id, Task.column_id, Task.position, Task.rank, Task.version)
+        .where(Task.column_id.in_(column_ids))
+        .order_by(*task_order())
     )
-    target_tasks = list(result.scalars().all())
-
-    # -------------------------------------------------------------------------
-    #  Step 3: 插入到目标位置
-    # -------------------------------------------------------------------------
-    # 确保 position 在有效范围内
-    max_position = len(target_tasks)
-    to_position = max(0, min(to_position, max_position))
-
-    # 将任务插入到列表中
-    target_tasks.insert(to_position, task)
+    columns: dict[UUID, list[UUID]] = {column_id: [] for column_id in column_ids}
+    original: dict[UUID, tuple[UUID, int]] = {}
+    ranks: dict[UUID, str] = {}
+    versions: dict[UUID, int] = {}
+    for row in result.all():
+        columns[row.column_id].append(row.id)
+        original[row.id] = (row.column_id, row.position)
+        ranks[row.id] = row.rank
+        versions[row.id] = row.version
+    versions.update((task_id, task.version) for task_id, task in tasks.items())
 
     # -------------------------------------------------------------------------
-    #  Step 4: 整列重排
+    #  Step 2: 内存中依次模拟移动
     # -------------------------------------------------------------------------
-    for idx, t in enumerate(target_tasks):
-        t.position = idx
+    location = {task_id: original[task_id][0] for task_id in tasks}
+    for task, to_column_id, to_position in moves:
+        columns[location[task.id]].remove(task.id)
+        target = columns[to_column_id]
+        target.insert(max(0, min(to_position, len(target))), task.id)
+        location[task.id] = to_column_id
 
     # -------------------------------------------------------------------------
-    #  Step 5: 若跨列，重排原列
+    #  Step 3: 每列计算一次最终位置，只写入变化的行
     # -------------------------------------------------------------------------
-    if not is_same_column:
-        await reorder_column(db, from_column_id)
+    rows = []
+    for column_id, ids in columns.items():
+        if rank_mode:
+            changed = set(_assign_ranks(ids, ranks, set(tasks)))
+            if changed:
+                _dirty_columns.add(column_id)
+        else:
+            changed = {
+                task_id
+                for idx, task_id in enumerate(ids)
+                if original[task_id] != (column_id, idx)
+            }
+        for idx, task_id in enumerate(ids):
+            if task_id in changed:
+                row = {
+                    "id": task_id,
+                    "version": versions[task_id],
+                    "column_id": column_id,
+                    "position": idx,
+                }
+                if rank_mode:
+                    row["rank"] = ranks[task_id]
+                rows.append(row)
 
+    # 按主键 + 版本号逐行条件更新，任一行被并发修改则抛出 StaleDataError
+    if rows:
+        await db.execute(update(Task), rows)
+    if not rank_mode:
+        await bump_columns(db, snapshot)
+    for board_id in {task.board_id for task in tasks.values()}:
+        await bump_board(db, board_id)
     await db.commit()
-    await db.refresh(task)
 
-    return task
+    result = await db.execute(
+        select(Task)
+        .where(Task.id.in_(tasks))
+        .execution_options(populate_existing=True)
+    )
+    refreshed = {task.id: task for task in result.scalars().all()}
+    return [refreshed[task_id] for task_id in tasks]
+
+
+# -----------------------------------------------------------------------------
+#  删除
+# -----------------------------------------------------------------------------
+async def _close_gaps(db: AsyncSession, column_id: UUID, removed: list[int]) -> None:
+    """
+    删除 removed（升序的原 position）后压缩列（单条 UPDATE）
+
+    每个任务前移的距离等于其前面被删除的任务数，用 CASE 按区间计算
+    """
+    steps = [(Task.position < removed[i], Task.position - i) for i in range(1, len(removed))]
+    new_position = (
+        case(*steps, else_=Task.position - len(removed)) if steps else Task.position - 1
+    )
+    await db.execute(
+        update(Task)
+        .where(Task.column_id == column_id, Task.position > removed[0])
+        .values(position=new_position, version=Task.version + 1)
+    )
+
+
+async def remove_tasks(db: AsyncSession, tasks: Sequence[Task]) -> list[dict]:
+    """
+    删除任务并压缩所在列，同一事务提交
+
+    position 模式: 每个受影响列一条 UPDATE 平移其后的任务
+    rank 模式: 读取顺序由 rank 决定，无需写入其他行
+
+    返回按顺序应用的删除描述 {id, column_id, position, shifted_from, shifted_to}：
+    同列按 position 降序排列，依次应用时 [shifted_from, shifted_to] 内的任务前移一位
+    （无后续任务时为 None）
+    """
+    column_ids = {task.column_id for task in tasks}
+    rank_mode = settings.ordering_mode == "rank"
+
+    async with column_lock(db, column_ids):
+        if settings.column_write_lock:
+            await db.execute(
+                select(Task)
+                .where(Task.id.in_({task.id for task in tasks}))
+                .execution_options(populate_existing=True)
+            )
+
+        # 删除前各任务的对外位置与列尾
+        if rank_mode:
+            result = await db.execute(
+                select(Task.id, Task.column_id)
+                .where(Task.column_id.in_(column_ids))
+                .order_by(*task_order())
+            )
+            index: dict[UUID, int] = {}
+            ends: dict[UUID, int] = {}
+            for row in result.all():
+                index[row.id] = ends.get(row.column_id, 0)
+                ends[row.column_id] = index[row.id] + 1
+        else:
+            snapshot = await snapshot_columns(db, column_ids)
+            index = {task.id: task.position for task in tasks}
+            result = await db.execute(
+                select(Task.column_id, func.max(Task.position))
+                .where(Task.column_id.in_(column_ids))
+                .group_by(Task.column_id)
+            )
+            ends = {column_id: end + 1 for column_id, end in result.all()}
+
+        ordered = sorted(tasks, key=lambda t: (str(t.column_id), -index[t.id]))
+        deletions = []
+        for task in ordered:
+            position = index[task.id]
+            ends[task.column_id] -= 1
+            shifted = position + 1 <= ends[task.column_id]
+            deletions.append(
+                {
+                    "id": task.id,
+                    "column_id": task.column_id,
+                    "position": position,
+                    "shifted_from": position + 1 if shifted else None,
+                    "shifted_to": ends[task.column_id] if shifted else None,
+                }
+            )
+            await db.delete(task)
+        await db.flush()
+
+        if not rank_mode:
+            removed: dict[UUID, list[int]] = {}
+            for deletion in deletions:
+                removed.setdefault(deletion["column_id"], []).append(deletion["position"])
+            for column_id, positions in removed.items():
+                await _close_gaps(db, column_id, sorted(positions))
+            await bump_columns(db, snapshot)
+        for board_id in {task.board_id for task in tasks}:
+            await bump_board(db, board_id)
+        await db.commit()
+
+    return deletions
+
+
+# -----------------------------------------------------------------------------
+#  整列迁移
+# -----------------------------------------------------------------------------
+async def move_all_tasks(
+    db: AsyncSession,
+    from_column_id: UUID,
+    to_column_id: UUID,
+    placement: str = "bottom",
+) -> list[UUID]:
+    """
+    将源列全部任务迁移到目标列首 (top) 或列尾 (bottom)，保持源列内相对顺序
+
+    position 模式: 源列整体 UPDATE column_id / position + offset；
+                   放到列首时先把目标列整体后移源列长度
+    rank 模式: 以目标列首/尾键构造前缀拼接到源 rank 上，单条 UPDATE；
+               拼接后会超过 rank_max_length 时改为按合并后的顺序为两列任务
+               重新分配均匀键（同样单条 UPDATE）
+
+    返回被迁移任务 ID（按源列顺序）
+    """
+    rank_mode = settings.ordering_mode == "rank"
+    async with column_lock(db, (from_column_id, to_column_id)):
+        if rank_mode:
+            await _ensure_ranks(db, from_column_id)
+            await _ensure_ranks(db, to_column_id)
+        else:
+            snapshot = await snapshot_columns(db, {from_column_id, to_column_id})
+
+        moved = list(
+            (
+                await db.execute(
+                    select(Task.id)
+                    .where(Task.column_id == from_column_id)
+                    .order_by(*task_order())
+                )
+            ).scalars()
+        )
+        if not moved:
+            return moved
+
+        values = {"column_id": to_column_id, "version": Task.version + 1}
+        if rank_mode:
+            if placement == "top":
+                first = await db.scalar(
+                    select(func.min(Task.rank)).where(Task.column_id == to_column_id)
+                )
+                # rank_between 生成的键在某一位上严格小于 first，拼接任意后缀仍小于 first
+                prefix = rank_between(None, first) if first else ""
+            else:
+                # 以列尾键为前缀的键都大于列尾键
+                prefix = await db.scalar(
+                    select(func.max(Task.rank)).where(Task.column_id == to_column_id)
+                ) or ""
+            longest = await db.scalar(
+                select(func.max(func.length(Task.rank))).where(
+                    Task.column_id == from_column_id
+                )
+            )
+            if len(prefix) + (longest or 0) > settings.rank_max_length:
+                await _respread_merged(db, from_column_id, to_column_id, moved, placement)
+                await bump_board(db, board_of_column(to_column_id))
+                await db.commit()
+                return moved
+            values["rank"] = literal(prefix) + Task.rank
+            _dirty_columns.add(to_column_id)
+        else:
+            if placement == "top":
+                await _shift(db, to_column_id, await _column_end(db, from_column_id))
+            else:
+                values["position"] = Task.position + await _column_end(db, to_column_id)
+
+        await db.execute(
+            update(Task)
+            .where(Task.column_id == from_column_id)
+            .values(**values)
+            .execution_options(synchronize_session="fetch")
+        )
+        if not rank_mode:
+            await bump_columns(db, snapshot)
+        await bump_board(db, board_of_column(to_column_id))
+        await db.commit()
+
+    return moved
+
+
+async def _respread_merged(
+    db: AsyncSession,
+    from_column_id: UUID,
+    to_column_id: UUID,
+    moved: list[UUID],
+    placement: str,
+) -> None:
+    """整列迁移的 rank 回退路径：按合并后的目标列顺序一次性写入 spread_ranks 键"""
+    existing = list(
+        (
+            await db.execute(
+                select(Task.id).where(Task.column_id == to_column_id).order_by(*task_order())
+            )
+        ).scalars()
+    )
+    merged = moved + existing if placement == "top" else existing + moved
+    rank = case(dict(zip(merged, spread_ranks(len(merged)))), value=Task.id)
+    await db.execute(
+        update(Task)
+        .where(Task.column_id.in_((from_column_id, to_column_id)))
+        .values(column_id=to_column_id, rank=rank, version=Task.version + 1)
+        .execution_options(synchronize_session="fetch")
+    )
@@ -2,84 +2,816 @@
 #  Realtime Service - WebSocket 连接管理与广播
 # ==============================================================================
 """
-[INPUT]: 依赖 fastapi.WebSocket, app.schemas.events
-[OUTPUT]: 对外提供 ConnectionManager, broadcast_event
+[INPUT]: 依赖 fastapi.WebSocket, app.schemas.events, app.core.config, app.core.metrics, app.services.broadcast, app.services.cache, app.services.encoding
+[OUTPUT]: 对外提供 ConnectionManager, broadcast_event, start_broadcast, stop_broadcast, run_reaper
 [POS]: services 模块的实时通信逻辑
 [PROTOCOL]: 变更时更新此头部，然后检查 CLAUDE.md
 """
 from __future__ import annotations
 
-import json
+import asyncio
+import contextlib
+import heapq
+import itertools
+import logging
+import time
+import uuid
+from collections import OrderedDict, deque
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Iterable, Iterator, Optional, Union
 from uuid import UUID
 
 from fastapi import WebSocket
+from pydantic import BaseModel
 
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.broadcast import (
+    BroadcastBackend,
+    MemoryBackend,
+    PostgresBackend,
+    UnixSocketBackend,
+)
+from app.services.cache import board_cache
+from app.services.encoding import MSGPACK_SUBPROTOCOL, Frame, payload_dict
 
+logger = logging.getLogger(__name__)
+
+# 慢消费者被踢出、连接数超限时的关闭码（1013: Try Again Later）
+_SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+# 携带相对前一状态的差量（来源列、区间平移）的事件：只保留最后一条会丢失前面的差量
+_DIFF_EVENTS = frozenset({"task_moved"})
+
+
+def _coalesce_key(event_type: str, payload: dict[str, Any]) -> Optional[str]:
+    """
+    同一实体的同类事件可合并（只保留最新一条）；无 id 的聚合事件与差量事件不可合并
+    """
+    entity_id = payload.get("id")
+    if entity_id is None or event_type in _DIFF_EVENTS:
+        return None
+    return f"{event_type}:{entity_id}"
+
+
+# -----------------------------------------------------------------------------
+#  订阅过滤
+# -----------------------------------------------------------------------------
+# 载荷中标识所涉列的字段
+_COLUMN_FIELDS = ("column_id", "from_column_id", "to_column_id")
+# 载荷中嵌套子事件的列表字段（批量移动 / 批量删除）
+_NESTED_FIELDS = ("moves", "deletions")
+
+
+def _event_scope(
+    event_type: str, payload: dict[str, Any]
+) -> tuple[frozenset[str], Optional[frozenset[str]]]:
+    """
+    事件涉及的 (事件类型集合, 列 ID 集合)；列集合为 None 表示看板级事件（如列排序）
+
+    batch 帧取其中全部子事件的并集；列 ID 统一为字符串（远端后端送达的载荷已是 JSON）
+    """
+    if event_type == "batch":
+        types: set[str] = set()
+        columns: Optional[set[str]] = set()
+        for event in payload["events"]:
+            sub_types, sub_columns = _event_scope(event["type"], event["payload"])
+            types |= sub_types
+            columns = None if columns is None or sub_columns is None else columns | sub_columns
+        return frozenset(types), None if columns is None else frozenset(columns)
+
+    found = {str(payload[f]) for f in _COLUMN_FIELDS if payload.get(f) is not None}
+    for field in _NESTED_FIELDS:
+        for item in payload.get(field) or ():
+            found.update(str(item[f]) for f in _COLUMN_FIELDS if item.get(f) is not None)
+    return frozenset((event_type,)), frozenset(found) if found else None
+
+
+class _Subscription:
+    """连接的订阅过滤条件：None 表示该维度不过滤"""
+
+    __slots__ = ("columns", "events")
+
+    def __init__(
+        self,
+        columns: Optional[Iterable[Any]] = None,
+        events: Optional[Iterable[str]] = None,
+    ) -> None:
+        self.columns = None if columns is None else frozenset(str(c) for c in columns)
+        self.events = None if events is None else frozenset(events)
+
+    def matches(
+        self, types: frozenset[str], columns: Optional[frozenset[str]]
+    ) -> bool:
+        """batch 帧只要有一个子事件的类型、列与订阅有交集即整体投递"""
+        if self.events is not None and self.events.isdisjoint(types):
+            return False
+        if self.columns is None or columns is None:
+            return True
+        return not self.columns.isdisjoint(columns)
+
+
+# -----------------------------------------------------------------------------
+#  单连接发送队列
+# -----------------------------------------------------------------------------
+class _Connection:
+    """
+    连接记录：单个 WebSocket 的有界发送队列（由独立写协程消费）与连接元数据
+
+    大看板上同时存在成千上万条记录，使用 __slots__ 保持紧凑
+    """
+
+    __slots__ = (
+        "websocket",
+        "boards",
+        "user_id",
+        "connected_at",
+        "filters",
+        "maxsize",
+        "binary",
+        "queue",
+        "ready",
+        "idle",
+        "writer",
+        "last_seen",
+        "pinged",
+        "sent",
+        "sent_bytes",
+        "dropped",
+        "stale",
+    )
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        maxsize: int,
+        binary: bool = False,
+        user_id: Optional[UUID] = None,
+    ) -> None:
+        self.websocket = websocket
+        # 已加入的看板（单看板端点只有一个）
+        self.boards: set[UUID] = set()
+        # 鉴权落地前为 None
+        self.user_id = user_id
+        self.connected_at = time.time()
+        # 订阅过滤条件（None 表示接收所加入看板的全部事件）
+        self.filters: Optional[_Subscription] = None
+        self.maxsize = maxsize
+        # 协商了 msgpack 子协议的连接发送二进制帧
+        self.binary = binary
+        self.queue: deque[tuple[Optional[str], Frame]] = deque()
+        # 队列非空时唤醒写协程
+        self.ready = asyncio.Event()
+        # 队列已清空且无在途发送
+        self.idle = asyncio.Event()
+        self.idle.set()
+        self.writer: Optional[asyncio.Task] = None
+        # 最后一次收到客户端消息的时间（单调时钟）；此后是否已发送 ping
+        self.last_seen = time.monotonic()
+        self.pinged = False
+        # 发送统计：已发送帧数 / 字节数，溢出丢弃或被合并的帧数
+        self.sent = 0
+        self.sent_bytes = 0
+        self.dropped = 0
+        # 因 drop 策略丢弃过事件、待发送 resync 的看板
+        self.stale: set[UUID] = set()
+
+    def offer(self, key: Optional[str], frame: Frame, policy: str) -> bool:
+        """
+        非阻塞入队，返回 False 表示该连接应被断开
+
+        队列满时按 policy 处理:
+        drop: 丢弃新消息，并标记所属看板待 resync（写协程腾出槽位后发送）
+        coalesce: 移除队列中同 key 的旧消息后入队；无可合并消息时断开
+        disconnect: 断开连接（客户端重连后重新拉取状态）
+        """
+        if len(self.queue) >= self.maxsize:
+            if policy == "drop":
+                metrics.inc("ws.dropped")
+                self.dropped += 1
+                board_id = frame.envelope.get("board_id")
+                if board_id is not None:
+                    self.stale.add(board_id)
+                return True
+            if policy != "coalesce" or not self._remove(key):
+                return False
+            metrics.inc("ws.coalesced")
+            self.dropped += 1
+
+        self.queue.append((key, frame))
+        self.idle.clear()
+        self.ready.set()
+        return True
+
+    def _remove(self, key: Optional[str]) -> bool:
+        """移除队列中最早一条同 key 消息"""
+        if key is None:
+            return False
+        for idx, (queued_key, _) in enumerate(self.queue):
+            if queued_key == key:
+                del self.queue[idx]
+                return True
+        return False
+
+    def info(self) -> dict[str, Any]:
+        """连接元数据与发送统计（供指标快照使用）"""
+        return {
+            "boards": sorted(str(board_id) for board_id in self.boards),
+            "user_id": self.user_id,
+            "connected_at": self.connected_at,
+            "binary": self.binary,
+            "queued": len(self.queue),
+            "sent": self.sent,
+            "sent_bytes": self.sent_bytes,
+            "dropped": self.dropped,
+        }
+
+
+# -----------------------------------------------------------------------------
+#  看板事件日志（序号 + 重放环形缓冲）
+# -----------------------------------------------------------------------------
+class _BoardLog:
+    """
+    看板的当前事件序号与最近事件帧（已编码的格式随帧缓存）
+
+    epoch 标识该日志的序号空间：日志被淘汰后重建时从 0 重新编号，epoch 随之变化，
+    持有旧 epoch 的客户端重连时收到 resync 而不是错位的补发
+    """
+
+    __slots__ = ("epoch", "seq", "events")
+
+    def __init__(self, maxlen: int, epoch: str) -> None:
+        self.epoch = epoch
+        self.seq = 0
+        self.events: deque[Frame] = deque(maxlen=maxlen)
+
+    def since(self, seq: int) -> Optional[list[Frame]]:
+        """seq 之后的事件；缓冲区已不包含缺口或 seq 超前于当前序号时返回 None"""
+        if seq > self.seq:
+            return None
+        if seq == self.seq:
+            return []
+        if not self.events or self.events[0].seq > seq + 1:
+            return None
+        return [frame for frame in self.events if frame.seq > seq]
+
+
+# -----------------------------------------------------------------------------
+#  合并窗口（可选，settings.ws_coalesce_window_ms）
+# -----------------------------------------------------------------------------
+class _Batch:
+    """看板在合并窗口内的待发事件：同一实体的同类事件只保留最新一条"""
+
+    __slots__ = ("events", "started", "timer")
+
+    def __init__(self) -> None:
+        # 合并 key -> (event_type, payload)，按最后一次出现的顺序排列
+        self.events: dict[Any, tuple[str, dict[str, Any]]] = {}
+        self.started = time.perf_counter()
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+# -----------------------------------------------------------------------------
+#  连接管理器
+# -----------------------------------------------------------------------------
 class ConnectionManager:
-    """WebSocket 连接管理器（单实例内存广播）"""
+    """
+    WebSocket 连接管理器（单实例内存广播）
+
+    broadcast 只负责编码与入队，不等待任何 socket；每个连接由自己的写协程发送，
+    发送超时或失败的连接被踢出，慢客户端不会拖慢其他订阅者和触发广播的请求
+
+    一个连接可加入多个看板（多路复用端点），连接记录同时按 socket 与看板索引：
+    看板扇出只遍历该看板的房间，断开时按记录中的看板集合逐个移出
+
+    每个看板的事件带单调递增序号 seq，最近事件保存在环形缓冲中，
+    重连时携带 since=<seq> 即可补发缺口；epoch 标识看板日志的序号空间
+    （进程标识 + 日志代数，进程重启或日志被淘汰重建后变化）
+    """
 
     def __init__(self) -> None:
-        # board_id -> list of WebSocket connections
-        self._connections: dict[UUID, list[WebSocket]] = {}
-
-    async def connect(self, websocket: WebSocket, board_id: UUID) -> None:
-        """接受连接并加入看板房间"""
-        await websocket.accept()
-        if board_id not in self._connections:
-            self._connections[board_id] = []
-        self._connections[board_id].append(websocket)
-
-    def disconnect(self, websocket: WebSocket, board_id: UUID) -> None:
-        """断开连接"""
-        if board_id in self._connections:
-            if websocket in self._connections[board_id]:
-                self._connections[board_id].remove(websocket)
-            if not self._connections[board_id]:
+        # WebSocket -> 连接记录
+        self._sockets: dict[WebSocket, _Connection] = {}
+        # board_id -> {WebSocket: 连接记录}
+        self._connections: dict[UUID, dict[WebSocket, _Connection]] = {}
+        # 后台关闭任务（持有引用防止被回收）
+        self._closing: set[asyncio.Task] = set()
+        # board_id -> 事件日志（按最近使用淘汰）
+        self._logs: OrderedDict[UUID, _BoardLog] = OrderedDict()
+        self.epoch = uuid.uuid4().hex[:12]
+        # 看板日志代数，与进程 epoch 组成各日志的 epoch
+        self._generations = itertools.count()
+        # board_id -> 合并窗口内的待发事件
+        self._batches: dict[UUID, _Batch] = {}
+        # 不可合并事件的唯一 key
+        self._unique = itertools.count()
+
+    @property
+    def connection_count(self) -> int:
+        """本进程当前连接数"""
+        return len(self._sockets)
+
+    def connections(self, board_id: Optional[UUID] = None) -> Iterator[_Connection]:
+        """遍历（指定看板或全部）连接记录；迭代期间不可 await"""
+        if board_id is None:
+            return iter(self._sockets.values())
+        return iter(self._connections.get(board_id, {}).values())
+
+    def snapshot(self, top: int = 10) -> dict[str, Any]:
+        """
+        连接注册表快照：总数、看板数、队列积压与发送统计汇总，
+        以及连接数最多的 top 个看板
+        """
+        queued = sent = sent_bytes = dropped = 0
+        for conn in self.connections():
+            queued += len(conn.queue)
+            sent += conn.sent
+            sent_bytes += conn.sent_bytes
+            dropped += conn.dropped
+        largest = heapq.nlargest(
+            top, self._connections.items(), key=lambda item: len(item[1])
+        )
+        return {
+            "connections": len(self._sockets),
+            "boards": len(self._connections),
+            "queued": queued,
+            "sent": sent,
+            "sent_bytes": sent_bytes,
+            "dropped": dropped,
+            "largest_boards": [
+                {"board_id": str(bid), "connections": len(room)} for bid, room in largest
+            ],
+        }
+
+    def _board_full(self, board_id: UUID) -> bool:
+        """看板连接数是否已达上限（上限为 0 表示不限制）"""
+        limit = settings.ws_max_connections_per_board
+        return bool(limit) and len(self._connections.get(board_id, ())) >= limit
+
+    async def connect(
+        self,
+        websocket: WebSocket,
+        board_id: Optional[UUID] = None,
+        since: Optional[int] = None,
+        epoch: Optional[str] = None,
+        subprotocol: Optional[str] = None,
+        user_id: Optional[UUID] = None,
+    ) -> bool:
+        """
+        接受连接并启动写协程；指定 board_id 时随即加入该看板（见 join）
+
+        subprotocol 为已协商的子协议，kanban.msgpack 时发送二进制帧；user_id 记入连接记录
+        看板或进程连接数已达上限时拒绝握手并返回 False
+        """
+        limit = settings.ws_max_connections
+        if (limit and len(self._sockets) >= limit) or (
+            board_id is not None and self._board_full(board_id)
+        ):
+            metrics.inc("ws.rejected")
+            await websocket.close(code=_SLOW_CONSUMER_CLOSE_CODE)
+            return False
+
+        await websocket.accept(subprotocol=subprotocol)
+        conn = _Connection(
+            websocket,
+            settings.ws_send_queue_size,
+            binary=subprotocol == MSGPACK_SUBPROTOCOL,
+            user_id=user_id,
+        )
+        conn.writer = asyncio.create_task(self._write(conn))
+        self._sockets[websocket] = conn
+        if board_id is not None:
+            self.join(websocket, board_id, since=since, epoch=epoch)
+        return True
+
+    def join(
+        self,
+        websocket: WebSocket,
+        board_id: UUID,
+        since: Optional[int] = None,
+        epoch: Optional[str] = None,
+    ) -> bool:
+        """
+        连接加入看板房间；已加入时视为重新同步
+
+        先入队 hello（该看板当前 seq 与 epoch）；携带 since 时随后补发缺口事件，
+        缺口已超出缓冲区或 epoch 不符时发送 resync，客户端应整体重新拉取该看板
+        看板连接数已达上限或连接加入的看板数已达上限时返回 False
+        """
+        conn = self._sockets.get(websocket)
+        if conn is None:
+            return False
+        if board_id not in conn.boards:
+            per_connection = settings.ws_max_boards_per_connection
+            if self._board_full(board_id) or (
+                per_connection and len(conn.boards) >= per_connection
+            ):
+                metrics.inc("ws.rejected")
+                return False
+
+        log = self._log(board_id)
+        frames = [self._control("hello", board_id, log)]
+        if since is not None:
+            missed = log.since(since) if epoch in (None, log.epoch) else None
+            if missed is None:
+                metrics.inc("ws.resyncs")
+                frames.append(self._control("resync", board_id, log))
+            else:
+                metrics.inc("ws.replayed", len(missed))
+                frames.extend(missed)
+        # 补发帧直接入队（不受溢出策略影响）；与注册之间没有 await，后续广播必然排在补发之后
+        conn.queue.extend((None, frame) for frame in frames)
+        conn.idle.clear()
+        conn.ready.set()
+        conn.boards.add(board_id)
+        self._connections.setdefault(board_id, {})[websocket] = conn
+        return True
+
+    def leave(self, websocket: WebSocket, board_id: UUID) -> None:
+        """连接退出看板房间（幂等），连接本身保持"""
+        conn = self._sockets.get(websocket)
+        if conn is not None:
+            conn.boards.discard(board_id)
+        room = self._connections.get(board_id)
+        if room is not None:
+            room.pop(websocket, None)
+            if not room:
                 del self._connections[board_id]
 
+    def subscribe(
+        self,
+        websocket: WebSocket,
+        columns: Optional[Iterable[Any]] = None,
+        events: Optional[Iterable[str]] = None,
+    ) -> None:
+        """
+        替换连接的订阅过滤条件（作用于连接加入的全部看板；两者均为 None 时恢复接收全部事件），
+        并回复 subscribed 控制帧确认生效的条件
+        """
+        conn = self._sockets.get(websocket)
+        if conn is None:
+            return
+        sub = _Subscription(columns, events)
+        conn.filters = None if sub.columns is None and sub.events is None else sub
+        self.reply(
+            websocket,
+            "subscribed",
+            columns=None if sub.columns is None else sorted(sub.columns),
+            events=None if sub.events is None else sorted(sub.events),
+        )
+
+    def reply(self, websocket: WebSocket, event_type: str, **fields: Any) -> None:
+        """经发送队列向单个连接回复控制帧（如 subscribed / error），与事件帧保持顺序"""
+        conn = self._sockets.get(websocket)
+        if conn is None:
+            return
+        frame = Frame({"type": event_type, "epoch": self.epoch, **fields})
+        if not conn.offer(None, frame, settings.ws_overflow_policy):
+            metrics.inc("ws.overflow_disconnects")
+            self._evict(conn)
+
+    def touch(self, websocket: WebSocket) -> None:
+        """记录收到客户端消息（任何消息都视为心跳响应）"""
+        conn = self._sockets.get(websocket)
+        if conn is not None:
+            conn.last_seen = time.monotonic()
+            conn.pinged = False
+
+    def disconnect(self, websocket: WebSocket) -> None:
+        """断开连接（幂等）：退出全部看板房间并停止写协程"""
+        conn = self._sockets.pop(websocket, None)
+        if conn is None:
+            return
+        for board_id in conn.boards:
+            room = self._connections.get(board_id)
+            if room is not None:
+                room.pop(websocket, None)
+                if not room:
+                    del self._connections[board_id]
+        conn.boards.clear()
+
+        conn.idle.set()
+        if conn.writer is not None and conn.writer is not asyncio.current_task():
+            conn.writer.cancel()
+
     async def broadcast(
         self,
         board_id: UUID,
         event_type: str,
-        payload: dict[str, Any],
+        payload: Union[BaseModel, dict[str, Any]],
     ) -> None:
-        """向看板所有连接广播事件"""
-        if board_id not in self._connections:
+        """
+        向看板所有连接广播事件（编号并记入重放缓冲，入队即返回）
+
+        帧在首次发送时按连接格式惰性编码，同一格式所有订阅者共享同一份编码结果；
+        开启合并窗口时事件先进入看板批次，窗口结束后以一个 batch 帧发出
+        """
+        payload = payload_dict(payload)
+        key = _coalesce_key(event_type, payload)
+        window = settings.ws_coalesce_window_ms
+        if window <= 0:
+            self._emit(board_id, event_type, payload, key)
             return
 
-        message = json.dumps(
+        batch = self._batches.get(board_id)
+        if batch is None:
+            batch = self._batches[board_id] = _Batch()
+            batch.timer = asyncio.get_running_loop().call_later(
+                window / 1000, self.flush, board_id
+            )
+        if key is None:
+            key = next(self._unique)
+        elif batch.events.pop(key, None) is not None:
+            metrics.inc("ws.coalesced_events")
+        batch.events[key] = (event_type, payload)
+        if len(batch.events) >= settings.ws_batch_max_events:
+            self.flush(board_id)
+
+    def flush(self, board_id: Optional[UUID] = None) -> None:
+        """
+        立即发出（指定看板或全部）合并窗口内的待发事件
+
+        单个事件按原类型发送；多个事件合并为一个 batch 帧，payload.events 为按序应用的
+        {type, payload} 列表，整个批次占用一个序号
+        """
+        board_ids = list(self._batches) if board_id is None else [board_id]
+        for bid in board_ids:
+            batch = self._batches.pop(bid, None)
+            if batch is None:
+                continue
+            if batch.timer is not None:
+                batch.timer.cancel()
+            metrics.observe("ws.batch_size", len(batch.events))
+            metrics.observe("ws.flush_latency_ms", (time.perf_counter() - batch.started) * 1000)
+
+            events = list(batch.events.items())
+            if len(events) == 1:
+                key, (event_type, payload) = events[0]
+                self._emit(bid, event_type, payload, key if isinstance(key, str) else None)
+            else:
+                self._emit(
+                    bid,
+                    "batch",
+                    {
+                        "events": [
+                            {"type": event_type, "payload": payload}
+                            for event_type, payload in batch.events.values()
+                        ]
+                    },
+                    None,
+                )
+
+    def _emit(
+        self,
+        board_id: UUID,
+        event_type: str,
+        payload: dict[str, Any],
+        key: Optional[str],
+    ) -> None:
+        """编号、记入重放缓冲并入队到看板所有连接"""
+        log = self._log(board_id)
+        log.seq += 1
+        frame = Frame(
             {
                 "type": event_type,
-                "board_id": str(board_id),
-                "ts": datetime.now(timezone.utc).isoformat(),
+                "board_id": board_id,
+                "seq": log.seq,
+                "ts": datetime.now(timezone.utc),
                 "payload": payload,
             },
-            default=str,
+            seq=log.seq,
         )
+        log.events.append(frame)
+
+        room = self._connections.get(board_id)
+        if not room:
+            return
+        policy = settings.ws_overflow_policy
 
-        # 广播给所有连接（失败的连接会被跳过）
-        dead_connections = []
-        for connection in self._connections[board_id]:
-            try:
-                await connection.send_text(message)
-            except Exception:
-                dead_connections.append(connection)
+        # 不匹配订阅的连接在入队前跳过：帧惰性编码，无人接收时不产生编码开销
+        scope = None
+        filtered = 0
+        overflowed = []
+        for conn in room.values():
+            if conn.filters is not None:
+                if scope is None:
+                    scope = _event_scope(event_type, payload)
+                if not conn.filters.matches(*scope):
+                    filtered += 1
+                    continue
+            if not conn.offer(key, frame, policy):
+                overflowed.append(conn)
+        if filtered:
+            metrics.inc("ws.filtered", filtered)
+        for conn in overflowed:
+            metrics.inc("ws.overflow_disconnects")
+            self._evict(conn)
 
-        # 清理死连接
-        for conn in dead_connections:
-            self.disconnect(conn, board_id)
+    def reap(self) -> None:
+        """
+        心跳巡检（由 run_reaper 周期调用）
+
+        静默超过 ws_ping_interval 的连接入队一个 ping 帧（客户端回复任意消息即可）；
+        再超过 ws_ping_timeout 仍无响应的视为半开连接，移出全部房间并关闭
+        """
+        now = time.monotonic()
+        interval = settings.ws_ping_interval
+        deadline = interval + settings.ws_ping_timeout
+        policy = settings.ws_overflow_policy
+        ping = Frame({"type": "ping", "epoch": self.epoch})
+        for conn in list(self._sockets.values()):
+            silent = now - conn.last_seen
+            if silent > deadline:
+                metrics.inc("ws.reaped")
+                self._evict(conn)
+            elif silent >= interval and not conn.pinged:
+                conn.pinged = True
+                if not conn.offer("ping", ping, policy):
+                    metrics.inc("ws.overflow_disconnects")
+                    self._evict(conn)
+
+    def _log(self, board_id: UUID) -> _BoardLog:
+        """取看板事件日志，超过 ws_replay_boards 时淘汰最久未用的看板"""
+        log = self._logs.get(board_id)
+        if log is None:
+            log = self._logs[board_id] = _BoardLog(
+                settings.ws_replay_buffer_size, f"{self.epoch}-{next(self._generations)}"
+            )
+            while len(self._logs) > settings.ws_replay_boards:
+                self._logs.popitem(last=False)
+        else:
+            self._logs.move_to_end(board_id)
+        return log
+
+    def _control(self, event_type: str, board_id: UUID, log: _BoardLog) -> Frame:
+        """看板级控制帧（不占用序号），携带该看板日志的当前序号与 epoch"""
+        return Frame(
+            {"type": event_type, "board_id": board_id, "seq": log.seq, "epoch": log.epoch}
+        )
+
+    def resync(self) -> None:
+        """
+        通知全部看板的连接重新拉取状态（跨进程广播中断恢复后由广播后端调用）
+
+        中断期间其他进程的事件已丢失，序号空间不再可信：重建各看板日志（epoch 随之变化），
+        携带旧 epoch 的重连请求也会收到 resync
+        """
+        self.flush()
+        self._logs.clear()
+        policy = settings.ws_overflow_policy
+        overflowed: dict[WebSocket, _Connection] = {}
+        for board_id, room in self._connections.items():
+            frame = self._control("resync", board_id, self._log(board_id))
+            metrics.inc("ws.resyncs", len(room))
+            for websocket, conn in room.items():
+                if not conn.offer(None, frame, policy):
+                    overflowed[websocket] = conn
+        for conn in overflowed.values():
+            metrics.inc("ws.overflow_disconnects")
+            self._evict(conn)
+
+    async def drain(self, board_id: Optional[UUID] = None) -> None:
+        """发出待合并事件并等待（指定看板或全部）连接的发送队列清空"""
+        self.flush(board_id)
+        await asyncio.gather(*(conn.idle.wait() for conn in list(self.connections(board_id))))
+
+    async def close(self) -> None:
+        """
+        断开全部连接并等待写协程退出（应用关闭时调用）
+
+        先发出合并窗口内的待发事件，并在 ws_send_timeout 内等待各连接的发送队列清空
+        """
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self.drain(), settings.ws_send_timeout)
+        writers = []
+        for websocket, conn in list(self._sockets.items()):
+            self.disconnect(websocket)
+            if conn.writer is not None:
+                writers.append(conn.writer)
+        await asyncio.gather(*writers, *self._closing, return_exceptions=True)
+
+    # -------------------------------------------------------------------------
+    #  写协程与踢出
+    # -------------------------------------------------------------------------
+    async def _write(self, conn: _Connection) -> None:
+        """按序发送队列中的消息；超时或发送失败即踢出连接"""
+        try:
+            while True:
+                if not conn.queue:
+                    conn.idle.set()
+                    conn.ready.clear()
+                    await conn.ready.wait()
+                    continue
+                _, frame = conn.queue.popleft()
+                if conn.stale:
+                    self._resync_stale(conn)
+                if conn.binary:
+                    send = conn.websocket.send_bytes(frame.binary())
+                else:
+                    send = conn.websocket.send_text(frame.text())
+                await asyncio.wait_for(send, settings.ws_send_timeout)
+                conn.sent += 1
+                conn.sent_bytes += frame.size(conn.binary)
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            metrics.inc("ws.send_timeouts")
+            self._evict(conn)
+        except Exception:
+            # 连接已断开
+            self._evict(conn)
+
+    def _resync_stale(self, conn: _Connection) -> None:
+        """
+        为丢弃过事件的看板入队 resync（队列刚腾出槽位，直接追加不受溢出策略影响）
+
+        resync 携带入队时的最新序号：此前排队的旧事件照常送达，客户端随后整体重新拉取
+        """
+        for board_id in conn.stale & conn.boards:
+            metrics.inc("ws.resyncs")
+            conn.queue.append((None, self._control("resync", board_id, self._log(board_id))))
+        conn.stale.clear()
+
+    def _evict(self, conn: _Connection) -> None:
+        """移出全部房间并在后台关闭 socket，使端点的接收循环退出"""
+        self.disconnect(conn.websocket)
+        task = asyncio.create_task(self._close(conn.websocket))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _close(self, websocket: WebSocket) -> None:
+        try:
+            await asyncio.wait_for(
+                websocket.close(code=_SLOW_CONSUMER_CLOSE_CODE), settings.ws_send_timeout
+            )
+        except Exception:
+            pass
 
 
 # 全局连接管理器实例
 manager = ConnectionManager()
 
 
+async def run_reaper() -> None:
+    """心跳巡检后台任务（应用启动时创建，ws_ping_interval 为 0 时不启动）"""
+    period = min(settings.ws_ping_interval, settings.ws_ping_timeout) / 2
+    while True:
+        await asyncio.sleep(period)
+        try:
+            manager.reap()
+        except Exception:
+            logger.exception("websocket reaper failed")
+
+
+# -----------------------------------------------------------------------------
+#  广播后端（跨进程）
+# -----------------------------------------------------------------------------
+async def _deliver_local(
+    board_id: UUID, event_type: str, payload: dict[str, Any]
+) -> None:
+    """后端收到事件后失效本进程的看板读缓存，再交给连接管理器扇出"""
+    board_cache.invalidate(board_id)
+    await manager.broadcast(board_id, event_type, payload)
+
+
+def _create_backend() -> BroadcastBackend:
+    """按 settings.broadcast_backend 创建后端"""
+    if settings.broadcast_backend == "postgres":
+        from app.db.session import async_engine
+
+        return PostgresBackend(
+            _deliver_local, async_engine, settings.broadcast_channel, manager.resync
+        )
+    if settings.broadcast_backend == "unix":
+        return UnixSocketBackend(
+            _deliver_local, settings.broadcast_socket_path, manager.resync
+        )
+    return MemoryBackend(_deliver_local)
+
+
+# 未启动时（如测试）使用进程内后端
+backend: BroadcastBackend = MemoryBackend(_deliver_local)
+
+
+async def start_broadcast() -> None:
+    """启动配置的广播后端（应用启动时调用）"""
+    global backend
+    backend = _create_backend()
+    await backend.start()
+
+
+async def stop_broadcast() -> None:
+    """停止广播后端并回落到进程内后端（应用关闭时调用）"""
+    global backend
+    await backend.stop()
+    backend = MemoryBackend(_deliver_local)
+
+
 async def broadcast_event(
     board_id: UUID,
     event_type: str,
-    payload: dict[str, Any],
+    payload: Union[BaseModel, dict[str, Any]],
 ) -> None:
-    """广播事件的便捷函数"""
-    await manager.broadcast(board_id, event_type, payload)
+    """广播事件的便捷函数（经广播后端送达所有进程），payload 可直接传 schemas.events 载荷模型"""
+    await backend.publish(board_id, event_type, payload_dict(payload))
@@ -9,6 +9,12 @@
 """
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models import BoardRevision
+from app.services.ordering import compact_board_revisions
 
 
 @pytest.mark.asyncio
@@ -95,3 +101,134 @@ async def test_delete_board(client: AsyncClient, demo_user) -> None:
     # 确认删除
     get_response = await client.get(f"/api/v1/boards/{board_id}")
     assert get_response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_board_snapshot(client: AsyncClient, demo_user, db_session) -> None:
+    """测试看板快照一次返回有序的列与各列任务，且只发出两条查询"""
+    from uuid import UUID
+
+    from sqlalchemy import event
+
+    from app.crud import get_board_snapshot
+    from tests.conftest import test_engine
+
+    board_id = (await client.post("/api/v1/boards", json={"title": "快照"})).json()["id"]
+    column_ids = []
+    for idx, title in ((1, "进行中"), (0, "待办")):
+        response = await client.post(
+            f"/api/v1/boards/{board_id}/columns", json={"title": title, "order_index": idx}
+        )
+        column_ids.append(response.json()["id"])
+    for title in ("b", "a"):
+        await client.post(
+            f"/api/v1/boards/{board_id}/tasks",
+            json={"title": title, "column_id": column_ids[1], "position": 0},
+        )
+
+    response = await client.get(f"/api/v1/boards/{board_id}/snapshot")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["id"] == board_id
+    assert [c["title"] for c in data["columns"]] == ["待办", "进行中"]
+    assert [(t["title"], t["position"]) for t in data["columns"][0]["tasks"]] == [
+        ("a", 0),
+        ("b", 1),
+    ]
+    assert data["columns"][1]["tasks"] == []
+
+    statements = []
+
+    def listener(conn, cursor, statement, *args) -> None:
+        statements.append(statement)
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        await get_board_snapshot(db_session, UUID(board_id))
+    finally:
+        event.remove(test_engine.sync_engine, "before_cursor_execute", listener)
+    assert len(statements) == 2
+
+    missing = await client.get(f"/api/v1/boards/{column_ids[0]}/snapshot")
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_board_etag_not_modified(client: AsyncClient, demo_user) -> None:
+    """测试读取端点的 ETag：未变化时 304，任何写入后修订号递增返回新内容"""
+    board_id = (await client.post("/api/v1/boards", json={"title": "ETag"})).json()["id"]
+    column_id = (
+        await client.post(f"/api/v1/boards/{board_id}/columns", json={"title": "待办"})
+    ).json()["id"]
+    urls = [
+        f"/api/v1/boards/{board_id}",
+        f"/api/v1/boards/{board_id}/columns",
+        f"/api/v1/boards/{board_id}/tasks",
+        f"/api/v1/boards/{board_id}/snapshot",
+    ]
+
+    etags = []
+    for url in urls:
+        response = await client.get(url)
+        assert response.status_code == 200
+        etags.append(response.headers["etag"])
+        cached = await client.get(url, headers={"If-None-Match": f"W/{etags[-1]}"})
+        assert cached.status_code == 304 and cached.content == b""
+    assert len(set(etags)) == 1
+
+    task = (
+        await client.post(
+            f"/api/v1/boards/{board_id}/tasks",
+            json={"title": "t", "column_id": column_id, "position": 0},
+        )
+    ).json()
+    await client.patch(f"/api/v1/tasks/{task['id']}/move", json={"column_id": column_id, "position": 0})
+    for url in urls:
+        response = await client.get(url, headers={"If-None-Match": etags[0]})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etags[0]
+    board = (await client.get(urls[0])).json()
+    assert board["revision"] == int(response.headers["etag"].strip('"'))
+
+
+@pytest.mark.asyncio
+async def test_revision_compaction_keeps_etag(
+    client: AsyncClient, db_session: AsyncSession, demo_user, monkeypatch
+) -> None:
+    """测试修订记录合并为一行后修订号与 ETag 不变，之后的写入继续递增"""
+    board_id = (await client.post("/api/v1/boards", json={"title": "看板"})).json()["id"]
+    for i in range(3):
+        await client.patch(f"/api/v1/boards/{board_id}", json={"title": f"看板{i}"})
+    before = await client.get(f"/api/v1/boards/{board_id}")
+    assert before.json()["revision"] == 4
+
+    monkeypatch.setattr(settings, "board_revision_compact_rows", 1)
+    assert await compact_board_revisions(db_session) == 1
+    rows = await db_session.scalar(select(func.count()).select_from(BoardRevision))
+    assert rows == 1
+    cached = await client.get(
+        f"/api/v1/boards/{board_id}", headers={"If-None-Match": before.headers["etag"]}
+    )
+    assert cached.status_code == 304
+
+    await client.patch(f"/api/v1/boards/{board_id}", json={"title": "看板"})
+    assert (await client.get(f"/api/v1/boards/{board_id}")).json()["revision"] == 5
+
+
+@pytest.mark.asyncio
+async def test_list_boards_keyset_pagination(client: AsyncClient, demo_user) -> None:
+    """测试看板游标分页：按创建时间倒序逐页取完，与不分页结果一致"""
+    for i in range(5):
+        await client.post("/api/v1/boards", json={"title": f"看板{i}"})
+    full = [b["id"] for b in (await client.get("/api/v1/boards")).json()]
+
+    paged, params = [], {"limit": 2}
+    while True:
+        response = await client.get("/api/v1/boards", params=params)
+        paged.extend(b["id"] for b in response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+        params = {"limit": 2, "cursor": cursor}
+    assert len(full) == 5
+    assert sorted(paged) == sorted(full) and len(set(paged)) == 5
@@ -0,0 +1,201 @@
+# ==============================================================================
+#  广播后端测试
+# ==============================================================================
+"""
+[INPUT]: 依赖 pytest, app.services.broadcast
+[OUTPUT]: 对外提供广播后端测试用例
+[POS]: tests 模块的跨进程广播测试（Unix 套接字 hub 在单进程内模拟多 worker）
+[PROTOCOL]: 变更时更新此头部，然后检查 CLAUDE.md
+"""
+import asyncio
+from types import SimpleNamespace
+from typing import Callable
+from uuid import uuid4
+
+import pytest
+
+from app.services.broadcast import BroadcastBackend, PostgresBackend, UnixSocketBackend
+
+
+def _collector() -> tuple[list, Callable]:
+    received: list = []
+
+    async def deliver(board_id, event_type, payload) -> None:
+        received.append((board_id, event_type, payload))
+
+    return received, deliver
+
+
+async def _wait_for(condition, timeout: float = 2.0) -> None:
+    async def poll() -> None:
+        while not condition():
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(poll(), timeout)
+
+
+@pytest.mark.asyncio
+async def test_unix_hub_fans_out_to_all_workers(tmp_path):
+    """测试 Unix 套接字 hub 把任一 worker 发布的事件送达所有 worker，hub 退出后自动接管"""
+    path = str(tmp_path / "broadcast.sock")
+    received_a, deliver_a = _collector()
+    received_b, deliver_b = _collector()
+    worker_a = UnixSocketBackend(deliver_a, path)
+    worker_b = UnixSocketBackend(deliver_b, path)
+    await worker_a.start()
+    await worker_b.start()
+    assert worker_a.is_hub and not worker_b.is_hub
+
+    board_id = uuid4()
+    await worker_b.publish(board_id, "task_created", {"id": "1"})
+    await _wait_for(lambda: received_a and received_b)
+    assert received_a == received_b == [(board_id, "task_created", {"id": "1"})]
+
+    # hub 进程退出后，剩余 worker 成为新 hub 并继续收发
+    await worker_a.stop()
+    await _wait_for(lambda: worker_b.is_hub)
+    await worker_b.publish(board_id, "task_deleted", {"id": "1"})
+    await _wait_for(lambda: len(received_b) == 2)
+    assert received_b[1][1] == "task_deleted"
+    await worker_b.stop()
+
+
+@pytest.mark.asyncio
+async def test_unix_hub_disconnects_slow_client(tmp_path, monkeypatch):
+    """测试 hub 不等待不读取的客户端：积压超限即断开，其余 worker 照常收发"""
+    monkeypatch.setattr(UnixSocketBackend, "_CLIENT_BUFFER_LIMIT", 2**22)
+    path = str(tmp_path / "broadcast.sock")
+    received, deliver = _collector()
+    worker = UnixSocketBackend(deliver, path)
+    await worker.start()
+    # 连接后从不读取的客户端
+    _, stalled = await asyncio.open_unix_connection(path)
+    await _wait_for(lambda: len(worker._hub_clients) == 2)
+
+    board_id = uuid4()
+    for i in range(8):
+        await worker.publish(board_id, "task_updated", {"blob": "x" * 2**20})
+        await _wait_for(lambda: len(received) == i + 1)
+    assert len(worker._hub_clients) == 1
+    stalled.close()
+    await worker.stop()
+
+
+@pytest.mark.asyncio
+async def test_postgres_notify_reassembles_chunks():
+    """测试超过 NOTIFY 字节上限的信封被分片后在接收端按序重组"""
+    sent: list[str] = []
+
+    class _Conn:
+        async def execute(self, _statement, params) -> None:
+            sent.append(params["payload"])
+
+        async def commit(self) -> None:
+            pass
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc) -> None:
+            pass
+
+    class _Engine:
+        def connect(self):
+            return _Conn()
+
+    received, deliver = _collector()
+    backend = PostgresBackend(deliver, _Engine(), "kanban_events")
+    board_id = uuid4()
+    # 多字节字符按字节计量，切点不得拆开字符
+    payload = {
+        "moves": [{"id": str(uuid4()), "title": "任务标题", "position": i} for i in range(300)]
+    }
+    await backend.publish(board_id, "tasks_moved", payload)
+    assert len(sent) > 1 and all(len(n.encode()) < 8000 for n in sent)
+
+    pump = asyncio.create_task(backend._run_pump())
+    for notification in sent:
+        backend._on_notify(None, 0, "kanban_events", notification)
+    await _wait_for(lambda: received)
+    pump.cancel()
+    assert received == [(board_id, "tasks_moved", payload)]
+
+
+@pytest.mark.asyncio
+async def test_postgres_listener_reconnects_and_resyncs(monkeypatch):
+    """测试监听连接终止或探活失败后按退避重连，恢复后触发 resync"""
+    monkeypatch.setattr(PostgresBackend, "_RECONNECT_DELAY", 0.01)
+    monkeypatch.setattr(PostgresBackend, "_HEALTH_INTERVAL", 0.05)
+
+    class _Driver:
+        def __init__(self) -> None:
+            self.on_terminate = None
+            self.healthy = True
+
+        def add_termination_listener(self, callback) -> None:
+            self.on_terminate = callback
+
+        def remove_termination_listener(self, callback) -> None:
+            self.on_terminate = None
+
+        async def add_listener(self, channel, callback) -> None:
+            pass
+
+        async def remove_listener(self, channel, callback) -> None:
+            pass
+
+        async def execute(self, _statement) -> None:
+            if not self.healthy:
+                raise ConnectionError
+
+    class _ListenConn:
+        def __init__(self, driver: _Driver) -> None:
+            self.driver = driver
+
+        async def get_raw_connection(self):
+            return SimpleNamespace(driver_connection=self.driver)
+
+        async def close(self) -> None:
+            pass
+
+    drivers: list[_Driver] = []
+    failures = [OSError("connection refused")]
+
+    class _Engine:
+        async def connect(self):
+            # 首次连接之后的第一次重连失败，验证退避重试
+            if len(drivers) == 1 and failures:
+                raise failures.pop()
+            drivers.append(_Driver())
+            return _ListenConn(drivers[-1])
+
+    resyncs: list[None] = []
+    _, deliver = _collector()
+    backend = PostgresBackend(
+        deliver, _Engine(), "kanban_events", resync=lambda: resyncs.append(None)
+    )
+    await backend.start()
+    assert len(drivers) == 1
+
+    # asyncpg 报告连接终止
+    drivers[0].on_terminate(None)
+    await _wait_for(lambda: len(drivers) == 2 and resyncs)
+    assert not failures and len(resyncs) == 1
+
+    # 连接静默失效：探活失败同样触发重连
+    drivers[1].healthy = False
+    await _wait_for(lambda: len(drivers) == 3 and len(resyncs) == 2)
+    await backend.stop()
+
+
+def test_backend_requires_publish():
+    """测试未实现 publish 的后端无法实例化"""
+    _, deliver = _collector()
+
+    class _Incomplete(BroadcastBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        BroadcastBackend(deliver)
+    with pytest.raises(TypeError):
+        _Incomplete(deliver)
@@ -0,0 +1,90 @@
+# ==============================================================================
+#  看板读缓存测试
+# ==============================================================================
+"""
+[INPUT]: 依赖 pytest, httpx AsyncClient, app.services.cache, app.core.metrics
+[OUTPUT]: 对外提供看板读缓存测试用例
+[POS]: tests 模块的读缓存测试（LRU 淘汰、修订号校验、事件失效）
+[PROTOCOL]: 变更时更新此头部，然后检查 CLAUDE.md
+"""
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.metrics import metrics
+from app.services.cache import BoardCache, board_cache
+
+
+def test_lru_eviction_by_entries_and_bytes() -> None:
+    """测试条目数与字节数上限均触发淘汰，最近读取的条目保留"""
+    metrics.reset()
+    cache = BoardCache(max_entries=2, max_bytes=10)
+    a, b, c = uuid4(), uuid4(), uuid4()
+
+    cache.put(a, "tasks", 1, b"aaa")
+    cache.put(b, "tasks", 1, b"bbb")
+    assert cache.get(a, "tasks", 1) == b"aaa"
+    cache.put(c, "tasks", 1, b"ccc")  # 超出条目数，淘汰最久未读的 b
+    assert cache.get(b, "tasks", 1) is None
+    assert cache.get(a, "tasks", 1) == b"aaa"
+
+    cache.put(b, "columns", 1, b"b" * 8)  # 3 + 3 + 8 > 10 字节，依次淘汰 c、a
+    assert cache.snapshot()["entries"] == 1
+    assert cache.snapshot()["bytes"] == 8
+    cache.put(a, "tasks", 1, b"x" * 11)  # 单条超过总上限，不缓存
+    assert cache.get(a, "tasks", 1) is None
+
+    # 修订号不一致视为未命中；失效丢弃看板的全部视图
+    assert cache.get(b, "columns", 2) is None
+    cache.invalidate(b)
+    assert cache.snapshot()["entries"] == 0
+
+    counters = metrics.snapshot()["counters"]
+    assert counters["board_cache.hit"] == 2
+    assert counters["board_cache.evicted"] == 3
+    assert counters["board_cache.invalidated"] == 1
+
+
+@pytest.mark.asyncio
+async def test_board_reads_served_from_cache(
+    client: AsyncClient, demo_user, monkeypatch
+) -> None:
+    """测试重复读取命中缓存，写入后修订号变化返回新数据，关闭后不再缓存"""
+    board_cache.clear()
+    board_id = (await client.post("/api/v1/boards", json={"title": "缓存"})).json()["id"]
+    column_id = (
+        await client.post(f"/api/v1/boards/{board_id}/columns", json={"title": "待办"})
+    ).json()["id"]
+    tasks_url = f"/api/v1/boards/{board_id}/tasks"
+    snapshot_url = f"/api/v1/boards/{board_id}/snapshot"
+
+    metrics.reset()
+    first = await client.get(tasks_url)
+    second = await client.get(tasks_url)
+    assert first.json() == second.json() == []
+    assert second.headers["etag"] == first.headers["etag"]
+    assert (await client.get(snapshot_url)).json() == (await client.get(snapshot_url)).json()
+    counters = metrics.snapshot()["counters"]
+    assert counters["board_cache.miss"] == 2 and counters["board_cache.hit"] == 2
+
+    task = (
+        await client.post(tasks_url, json={"title": "t", "column_id": column_id, "position": 0})
+    ).json()
+    tasks = (await client.get(tasks_url)).json()
+    assert [t["id"] for t in tasks] == [task["id"]]
+    snapshot = (await client.get(snapshot_url)).json()
+    assert [t["id"] for t in snapshot["columns"][0]["tasks"]] == [task["id"]]
+    # 列创建不广播事件，仍由修订号校验保证不返回旧数据
+    await client.post(f"/api/v1/boards/{board_id}/columns", json={"title": "完成"})
+    assert len((await client.get(f"/api/v1/boards/{board_id}/columns")).json()) == 2
+
+    body = (await client.get("/api/v1/metrics")).json()["board_cache"]
+    assert body["enabled"] and body["entries"] == 3
+
+    monkeypatch.setattr(board_cache, "enabled", False)
+    board_cache.clear()
+    metrics.reset()
+    assert (await client.get(tasks_url)).json() == tasks
+    assert board_cache.snapshot()["entries"] == 0
+    assert "board_cache.miss" not in metrics.snapshot()["counters"]
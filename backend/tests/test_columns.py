@@ -84,3 +84,68 @@ async def test_delete_column(client: AsyncClient, board_id: str) -> None:
     # 再删除
     response = await client.delete(f"/api/v1/columns/{column_id}")
     assert response.status_code == 204
+
+
+@pytest.mark.asyncio
+async def test_update_column_version_conflict(client: AsyncClient, board_id: str) -> None:
+    """测试携带过期 If-Match 更新列返回 409"""
+    create_response = await client.post(
+        f"/api/v1/boards/{board_id}/columns",
+        json={"title": "原标题", "order_index": 0},
+    )
+    column = create_response.json()
+    assert column["version"] == 1
+
+    response = await client.patch(
+        f"/api/v1/columns/{column['id']}",
+        json={"title": "新标题"},
+        headers={"If-Match": '"1"'},
+    )
+    assert response.status_code == 200
+
+    response = await client.patch(
+        f"/api/v1/columns/{column['id']}",
+        json={"title": "冲突", "expected_version": 1},
+    )
+    assert response.status_code == 409
+    assert response.json()["detail"]["current"]["title"] == "新标题"
+
+
+@pytest.mark.asyncio
+async def test_reorder_columns(client: AsyncClient, board_id: str) -> None:
+    """测试整体重排列顺序并广播 columns_reordered"""
+    from unittest.mock import AsyncMock, patch
+
+    ids = []
+    for i, title in enumerate(["待办", "进行中", "已完成"]):
+        response = await client.post(
+            f"/api/v1/boards/{board_id}/columns",
+            json={"title": title, "order_index": i},
+        )
+        ids.append(response.json()["id"])
+
+    new_order = [ids[2], ids[0], ids[1]]
+    with patch(
+        "app.api.v1.endpoints.columns.broadcast_event", new_callable=AsyncMock
+    ) as mock_broadcast:
+        response = await client.put(
+            f"/api/v1/boards/{board_id}/columns/order", json={"column_ids": new_order}
+        )
+    assert response.status_code == 200
+    assert [c["id"] for c in response.json()] == new_order
+    assert [c["order_index"] for c in response.json()] == [0, 1, 2]
+
+    mock_broadcast.assert_called_once()
+    args = mock_broadcast.call_args[0]
+    payload = args[2].model_dump(mode="json")
+    assert args[1] == "columns_reordered"
+    assert payload["column_ids"] == new_order
+
+    columns = (await client.get(f"/api/v1/boards/{board_id}/columns")).json()
+    assert [c["title"] for c in columns] == ["已完成", "待办", "进行中"]
+
+    # 必须列出全部列且不重复
+    response = await client.put(
+        f"/api/v1/boards/{board_id}/columns/order", json={"column_ids": [ids[0], ids[0], ids[1]]}
+    )
+    assert response.status_code == 400
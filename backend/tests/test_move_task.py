@@ -2,13 +2,27 @@
 #  Task Move API Tests
 # ==============================================================================
 """
-[INPUT]: 依赖 pytest, httpx.AsyncClient
+[INPUT]: 依赖 pytest, httpx.AsyncClient, sqlalchemy, app.services 排序逻辑
 [OUTPUT]: 测试 move_task API 端点
 [POS]: tests 模块的任务移动测试
 [PROTOCOL]: 变更时更新此头部，然后检查 CLAUDE.md
 """
+import asyncio
+from unittest.mock import AsyncMock, patch
+from uuid import UUID, uuid4
+
 import pytest
-from httpx import AsyncClient
+from httpx import AsyncClient, Response
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models import Task
+from app.schemas.events import PositionShift
+from app.services import move_task, rank_between, reorder_column
+from app.services.ordering import _KeyedLocks, rebalance_once, spread_ranks
 
 
 @pytest.fixture
@@ -161,6 +175,35 @@ async def test_move_task_to_last_position(
     assert response.json()["position"] == 2  # 0, 1, 2
 
 
+@pytest.mark.asyncio
+async def test_move_task_same_column_to_end(
+    client: AsyncClient, board_with_columns: tuple[str, str, str]
+) -> None:
+    """测试同列移动到超出列尾的位置会被修正为最后一位"""
+    board_id, col1_id, _ = board_with_columns
+
+    ids = []
+    for i in range(3):
+        t = await client.post(
+            f"/api/v1/boards/{board_id}/tasks",
+            json={"title": f"任务{i}", "column_id": col1_id, "position": i},
+        )
+        ids.append(t.json()["id"])
+
+    response = await client.patch(
+        f"/api/v1/tasks/{ids[0]}/move",
+        json={"column_id": col1_id, "position": 99},
+    )
+    assert response.json()["position"] == 2
+
+    tasks = (await client.get(f"/api/v1/boards/{board_id}/tasks")).json()
+    assert [(t["title"], t["position"]) for t in tasks] == [
+        ("任务1", 0),
+        ("任务2", 1),
+        ("任务0", 2),
+    ]
+
+
 @pytest.mark.asyncio
 async def test_reorder_preserves_positions(
     client: AsyncClient, board_with_columns: tuple[str, str, str]
@@ -191,3 +234,756 @@ async def test_reorder_preserves_positions(
     tasks = sorted(tasks_response.json(), key=lambda x: x["position"])
     positions = [t["position"] for t in tasks]
     assert positions == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_cross_column_move_compacts_source(
+    client: AsyncClient, board_with_columns: tuple[str, str, str]
+) -> None:
+    """测试跨列移动后原列与目标列 position 均保持连续"""
+    board_id, col1_id, col2_id = board_with_columns
+
+    ids = []
+    for i in range(4):
+        t = await client.post(
+            f"/api/v1/boards/{board_id}/tasks",
+            json={"title": f"任务{i}", "column_id": col1_id, "position": i},
+        )
+        ids.append(t.json()["id"])
+    await client.post(
+        f"/api/v1/boards/{board_id}/tasks",
+        json={"title": "目标", "column_id": col2_id, "position": 0},
+    )
+
+    response = await client.patch(
+        f"/api/v1/tasks/{ids[1]}/move",
+        json={"column_id": col2_id, "position": 0},
+    )
+    assert response.json()["position"] == 0
+
+    tasks = (await client.get(f"/api/v1/boards/{board_id}/tasks")).json()
+    col1 = sorted((t for t in tasks if t["column_id"] == col1_id), key=lambda x: x["position"])
+    col2 = sorted((t for t in tasks if t["column_id"] == col2_id), key=lambda x: x["position"])
+    assert [(t["title"], t["position"]) for t in col1] == [("任务0", 0), ("任务2", 1), ("任务3", 2)]
+    assert [(t["title"], t["position"]) for t in col2] == [("任务1", 0), ("目标", 1)]
+
+
+@pytest.mark.asyncio
+async def test_reorder_column_closes_gaps(
+    client: AsyncClient, board_with_columns: tuple[str, str, str], db_session
+) -> None:
+    """测试 reorder_column 压缩 position 空洞"""
+    board_id, col1_id, _ = board_with_columns
+    for i in range(3):
+        t = await client.post(
+            f"/api/v1/boards/{board_id}/tasks",
+            json={"title": f"任务{i}", "column_id": col1_id, "position": i},
+        )
+        # 人为制造空洞: 0, 5, 10
+        await db_session.execute(
+            Task.__table__.update()
+            .where(Task.id == UUID(t.json()["id"]))
+            .values(position=i * 5)
+        )
+    await db_session.commit()
+
+    await reorder_column(db_session, UUID(col1_id))
+    await db_session.commit()
+
+    tasks = (await client.get(f"/api/v1/boards/{board_id}/tasks")).json()
+    assert [(t["title"], t["position"]) for t in tasks] == [
+        ("任务0", 0),
+        ("任务1", 1),
+        ("任务2", 2),
+    ]
+
+
+# -------------------------------------------------------------------------
+#  乐观并发
+# -------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_move_task_version_conflict(
+    client: AsyncClient, board_with_columns: tuple[str, str, str]
+) -> None:
+    """测试移动携带过期版本号返回 409，且移动会递增同列其他任务及列的版本"""
+    board_id, col1_id, _ = board_with_columns
+
+    t1 = (
+        await client.post(
+            f"/api/v1/boards/{board_id}/tasks",
+            json={"title": "任务1", "column_id": col1_id, "position": 0},
+        )
+    ).json()
+    t2 = (
+        await client.post(
+            f"/api/v1/boards/{board_id}/tasks",
+            json={"title": "任务2", "column_id": col1_id, "position": 1},
+        )
+    ).json()
+
+    response = await client.patch(
+        f"/api/v1/tasks/{t2['id']}/move",
+        json={"column_id": col1_id, "position": 0, "expected_version": t2["version"]},
+    )
+    assert response.status_code == 200
+
+    # 任务1 被平移，版本已递增
+    response = await client.patch(
+        f"/api/v1/tasks/{t1['id']}/move",
+        json={"column_id": col1_id, "position": 0},
+        headers={"If-Match": str(t1["version"])},
+    )
+    assert response.status_code == 409
+    assert response.json()["detail"]["current"]["position"] == 1
+
+    # 两次创建与一次移动各递增一次列顺序版本，列属性版本不变
+    columns = (await client.get(f"/api/v1/boards/{board_id}/columns")).json()
+    column = next(c for c in columns if c["id"] == col1_id)
+    assert (column["version"], column["ordering_version"]) == (1, 4)
+
+    # 重命名列只递增列属性版本，之后的移动不会因此冲突
+    await client.patch(f"/api/v1/columns/{col1_id}", json={"title": "改名"})
+    response = await client.patch(
+        f"/api/v1/tasks/{t1['id']}/move", json={"column_id": col1_id, "position": 0}
+    )
+    assert response.status_code == 200
+    columns = (await client.get(f"/api/v1/boards/{board_id}/columns")).json()
+    column = next(c for c in columns if c["id"] == col1_id)
+    assert (column["version"], column["ordering_version"]) == (2, 5)
+
+
+@pytest.mark.asyncio
+async def test_move_stale_task_raises(
+    client: AsyncClient, board_with_columns: tuple[str, str, str], db_session
+) -> None:
+    """测试任务加载后被并发修改时，移动在提交时检测到冲突并整体回滚"""
+    board_id, col1_id, col2_id = board_with_columns
+    t = await client.post(
+        f"/api/v1/boards/{board_id}/tasks",
+        json={"title": "任务", "column_id": col1_id, "position": 0},
+    )
+    task = await db_session.get(Task, UUID(t.json()["id"]))
+
+    # 模拟其他事务修改了该行
+    await db_session.execute(
+        Task.__table__.update()
+        .where(Task.id == task.id)
+        .values(version=Task.__table__.c.version + 1)
+    )
+    await db_session.commit()
+
+    with pytest.raises(StaleDataError):
+        await move_task(db_session, task, UUID(col2_id), 0)
+    await db_session.rollback()
+
+    tasks = (await client.get(f"/api/v1/boards/{board_id}/tasks")).json()
+    assert tasks[0]["column_id"] == col1_id
+
+
+# -------------------------------------------------------------------------
+#  批量移动
+# -------------------------------------------------------------------------
+async def _batch_move(
+    client: AsyncClient, board_with_columns: tuple[str, str, str]
+) -> tuple[Response, AsyncMock, list[list[tuple[str, int]]]]:
+    """
+    列1 有 任务0..3，列2 有 目标；批量: 任务3 -> 列2 首, 任务0 -> 列1 尾, 任务1 -> 列2 位置1
+
+    返回 (响应, 广播 mock, [列1, 列2] 的 (title, position))
+    """
+    board_id, col1_id, col2_id = board_with_columns
+    ids = []
+    for i in range(4):
+        t = await client.post(
+            f"/api/v1/boards/{board_id}/tasks",
+            json={"title": f"任务{i}", "column_id": col1_id, "position": i},
+        )
+        ids.append(t.json()["id"])
+    await client.post(
+        f"/api/v1/boards/{board_id}/tasks",
+        json={"title": "目标", "column_id": col2_id, "position": 0},
+    )
+
+    with patch(
+        "app.api.v1.endpoints.tasks.broadcast_event", new_callable=AsyncMock
+    ) as mock_broadcast:
+        response = await client.patch(
+            f"/api/v1/boards/{board_id}/tasks/move",
+            json={
+                "moves": [
+                    {"task_id": ids[3], "column_id": col2_id, "position": 0},
+                    {"task_id": ids[0], "column_id": col1_id, "position": 99},
+                    {"task_id": ids[1], "column_id": col2_id, "position": 1},
+                ]
+            },
+        )
+
+    tasks = (await client.get(f"/api/v1/boards/{board_id}/tasks")).json()
+    columns = [
+        [(t["title"], t["position"]) for t in tasks if t["column_id"] == col]
+        for col in (col1_id, col2_id)
+    ]
+    return response, mock_broadcast, columns
+
+
+@pytest.mark.asyncio
+async def test_batch_move(
+    client: AsyncClient, board_with_columns: tuple[str, str, str]
+) -> None:
+    """测试批量移动在单事务内按顺序应用，只广播一次聚合事件"""
+    response, mock_broadcast, (col1, col2) = await _batch_move(client, board_with_columns)
+    assert response.status_code == 200
+    assert [(t["title"], t["position"]) for t in response.json()] == [
+        ("任务3", 0),
+        ("任务0", 1),
+        ("任务1", 1),
+    ]
+
+    mock_broadcast.assert_called_once()
+    event_type, payload = mock_broadcast.call_args[0][1:]
+    assert event_type == "tasks_moved"
+    assert len(payload.moves) == 3
+
+    assert col1 == [("任务2", 0), ("任务0", 1)]
+    assert col2 == [("任务3", 0), ("任务1", 1), ("目标", 2)]
+
+
+@pytest.mark.asyncio
+async def test_batch_move_unknown_task(
+    client: AsyncClient, board_with_columns: tuple[str, str, str]
+) -> None:
+    """测试批量移动包含不存在的任务时返回 404 且不做任何修改"""
+    board_id, col1_id, _ = board_with_columns
+    t = await client.post(
+        f"/api/v1/boards/{board_id}/tasks",
+        json={"title": "任务", "column_id": col1_id, "position": 0},
+    )
+
+    response = await client.patch(
+        f"/api/v1/boards/{board_id}/tasks/move",
+        json={
+            "moves": [
+                {"task_id": t.json()["id"], "column_id": col1_id, "position": 0},
+                {
+                    "task_id": "00000000-0000-0000-0000-000000000000",
+                    "column_id": col1_id,
+                    "position": 0,
+                },
+            ]
+        },
+    )
+    assert response.status_code == 404
+
+
+# -------------------------------------------------------------------------
+#  Rank 排序模式
+# -------------------------------------------------------------------------
+@pytest.fixture
+def rank_mode(monkeypatch):
+    """切换到 rank 排序模式"""
+    monkeypatch.setattr(settings, "ordering_mode", "rank")
+
+
+def test_rank_between_orders_keys() -> None:
+    """测试 rank_between 生成的键严格位于两端之间"""
+    lo = rank_between(None, None)
+    hi = rank_between(lo, None)
+    # 反复插入同一位置（lo 之后），键持续变长但保持有序
+    keys = [lo, hi]
+    for _ in range(50):
+        hi = rank_between(lo, hi)
+        keys.insert(1, hi)
+    for _ in range(20):
+        keys.insert(0, rank_between(None, keys[0]))
+    for _ in range(20):
+        keys.append(rank_between(keys[-1], None))
+
+    assert keys == sorted(keys)
+    assert len(set(keys)) == len(keys)
+    assert all(not k.endswith("0") for k in keys)
+
+
+@pytest.mark.asyncio
+async def test_rank_move_updates_single_row(
+    client: AsyncClient,
+    board_with_columns: tuple[str, str, str],
+    db_session,
+    rank_mode,
+) -> None:
+    """测试 rank 模式下移动只改写被移动的任务"""
+    board_id, col1_id, col2_id = board_with_columns
+
+    ids = []
+    for i in range(4):
+        t = await client.post(
+            f"/api/v1/boards/{board_id}/tasks",
+            json={"title": f"任务{i}", "column_id": col1_id, "position": i},
+        )
+        ids.append(t.json()["id"])
+
+    result = await db_session.execute(select(Task.id, Task.rank))
+    before = dict(result.all())
+
+    # 任务3 移动到位置1
+    response = await client.patch(
+        f"/api/v1/tasks/{ids[3]}/move",
+        json={"column_id": col1_id, "position": 1},
+    )
+    assert response.status_code == 200
+    assert response.json()["position"] == 1
+
+    result = await db_session.execute(select(Task.id, Task.rank))
+    after = dict(result.all())
+    changed = [str(k) for k in after if after[k] != before[k]]
+    assert changed == [ids[3]]
+
+    # 列表接口返回连续 position，顺序与 position 模式一致
+    tasks = (await client.get(f"/api/v1/boards/{board_id}/tasks")).json()
+    assert [t["title"] for t in tasks] == ["任务0", "任务3", "任务1", "任务2"]
+    assert [t["position"] for t in tasks] == [0, 1, 2, 3]
+
+    # 跨列移动到末尾
+    response = await client.patch(
+        f"/api/v1/tasks/{ids[0]}/move",
+        json={"column_id": col2_id, "position": 99},
+    )
+    assert response.json()["position"] == 0
+    tasks = (await client.get(f"/api/v1/boards/{board_id}/tasks")).json()
+    col1 = [t["title"] for t in tasks if t["column_id"] == col1_id]
+    assert col1 == ["任务3", "任务1", "任务2"]
+    assert [t["position"] for t in tasks if t["column_id"] == col1_id] == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_rank_move_backfills_legacy_column(
+    client: AsyncClient,
+    board_with_columns: tuple[str, str, str],
+    monkeypatch,
+) -> None:
+    """测试 position 模式创建的存量任务在切换到 rank 模式后顺序不变"""
+    board_id, col1_id, _ = board_with_columns
+    ids = []
+    for i in range(3):
+        t = await client.post(
+            f"/api/v1/boards/{board_id}/tasks",
+            json={"title": f"任务{i}", "column_id": col1_id, "position": i},
+        )
+        ids.append(t.json()["id"])
+
+    monkeypatch.setattr(settings, "ordering_mode", "rank")
+    response = await client.patch(
+        f"/api/v1/tasks/{ids[0]}/move",
+        json={"column_id": col1_id, "position": 2},
+    )
+    assert response.json()["position"] == 2
+
+    tasks = (await client.get(f"/api/v1/boards/{board_id}/tasks")).json()
+    assert [t["title"] for t in tasks] == ["任务1", "任务2", "任务0"]
+
+
+@pytest.mark.asyncio
+async def test_rebalance_shortens_long_ranks(
+    client: AsyncClient,
+    board_with_columns: tuple[str, str, str],
+    db_session,
+    rank_mode,
+) -> None:
+    """测试再平衡缩短过长的 rank 键且保持顺序，并广播 column_rebalanced；默认只检查写入过的列"""
+    board_id, col1_id, col2_id = board_with_columns
+
+    ids = []
+    for i in range(3):
+        t = await client.post(
+            f"/api/v1/boards/{board_id}/tasks",
+            json={"title": f"任务{i}", "column_id": col1_id, "position": 0},
+        )
+        ids.append(t.json()["id"])
+    # 反复插入到列首，构造过长的键
+    for i in range(3):
+        await client.patch(
+            f"/api/v1/tasks/{ids[i]}/move",
+            json={"column_id": col1_id, "position": 0},
+        )
+    long_rank = "0" * 20 + "i"
+    await db_session.execute(
+        Task.__table__.update().where(Task.id == UUID(ids[0])).values(rank=long_rank)
+    )
+    await db_session.commit()
+    order_before = [
+        str(i)
+        for i in (
+            await db_session.execute(
+                select(Task.id).where(Task.column_id == UUID(col1_id)).order_by(Task.rank)
+            )
+        ).scalars()
+    ]
+
+    with patch(
+        "app.services.ordering.broadcast_event", new_callable=AsyncMock
+    ) as mock_broadcast:
+        assert await rebalance_once(db_session) == 1
+
+    result = await db_session.execute(
+        select(Task.id, Task.rank).where(Task.column_id == UUID(col1_id)).order_by(Task.rank)
+    )
+    rows = result.all()
+    assert [str(r.id) for r in rows] == order_before
+    assert max(len(r.rank) for r in rows) <= 2
+
+    mock_broadcast.assert_called_once()
+    args = mock_broadcast.call_args[0]
+    payload = args[2].model_dump(mode="json")
+    assert args[1] == "column_rebalanced"
+    assert payload["task_ids"] == order_before
+
+    # 再次扫描无需处理
+    assert await rebalance_once(db_session) == 0
+
+    # 绕过写入路径的改动不会标记列，只有全表扫描能发现
+    await db_session.execute(
+        Task.__table__.update().where(Task.id == UUID(ids[1])).values(rank=long_rank)
+    )
+    await db_session.commit()
+    with patch("app.services.ordering.broadcast_event", new_callable=AsyncMock):
+        assert await rebalance_once(db_session) == 0
+        assert await rebalance_once(db_session, full_scan=True) == 1
+
+
+@pytest.mark.asyncio
+async def test_rank_batch_move(
+    client: AsyncClient, board_with_columns: tuple[str, str, str], rank_mode
+) -> None:
+    """测试 rank 模式下批量移动结果与 position 模式一致"""
+    response, _, (col1, col2) = await _batch_move(client, board_with_columns)
+    assert response.status_code == 200
+    assert col1 == [("任务2", 0), ("任务0", 1)]
+    assert col2 == [("任务3", 0), ("任务1", 1), ("目标", 2)]
+
+
+# -------------------------------------------------------------------------
+#  列级写锁
+# -------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_keyed_locks_serialize_same_column() -> None:
+    """测试同一列的持有者串行执行，不同列互不阻塞，释放后回收锁"""
+    locks = _KeyedLocks()
+    col_a, col_b = uuid4(), uuid4()
+    events: list[str] = []
+
+    async def writer(name: str, column_id) -> None:
+        async with locks.hold(column_id):
+            events.append(f"{name}+")
+            await asyncio.sleep(0.01)
+            events.append(f"{name}-")
+
+    await asyncio.gather(writer("a1", col_a), writer("a2", col_a), writer("b", col_b))
+
+    assert events.index("a1-") < events.index("a2+")
+    assert events.index("b+") < events.index("a1-")
+    assert len(locks) == 0
+
+
+@pytest.mark.asyncio
+async def test_move_stale_task_waits_with_column_lock(
+    client: AsyncClient, board_with_columns: tuple[str, str, str], db_session, monkeypatch
+) -> None:
+    """测试开启列级写锁时，加载后被修改的任务在拿锁后重新读取，移动成功并记录等待指标"""
+    monkeypatch.setattr(settings, "column_write_lock", True)
+    metrics.reset()
+
+    board_id, col1_id, col2_id = board_with_columns
+    t = await client.post(
+        f"/api/v1/boards/{board_id}/tasks",
+        json={"title": "任务", "column_id": col1_id, "position": 0},
+    )
+    task = await db_session.get(Task, UUID(t.json()["id"]))
+
+    await db_session.execute(
+        Task.__table__.update()
+        .where(Task.id == task.id)
+        .values(version=Task.__table__.c.version + 1)
+    )
+    await db_session.commit()
+
+    await move_task(db_session, task, UUID(col2_id), 0)
+
+    tasks = (await client.get(f"/api/v1/boards/{board_id}/tasks")).json()
+    assert tasks[0]["column_id"] == col2_id
+
+    snapshot = (await client.get("/api/v1/metrics")).json()
+    # 创建锁目标列，移动锁源列与目标列
+    assert snapshot["counters"]["ordering.lock_acquired"] == 3
+    assert snapshot["summaries"]["ordering.lock_wait_ms"]["count"] == 3
+
+
+# -------------------------------------------------------------------------
+#  服务端排序
+# -------------------------------------------------------------------------
+async def _sort_by_title_desc(
+    client: AsyncClient, board_with_columns: tuple[str, str, str]
+) -> tuple[Response, AsyncMock, list[tuple[str, int]]]:
+    """
+    列1 依次插入 b, c, a，按标题降序排序
+
+    返回 (响应, 广播 mock, 列1 的 (title, position))
+    """
+    board_id, col1_id, _ = board_with_columns
+    for title in ["b", "c", "a"]:
+        await client.post(
+            f"/api/v1/boards/{board_id}/tasks",
+            json={"title": title, "column_id": col1_id, "position": 99},
+        )
+
+    with patch(
+        "app.api.v1.endpoints.columns.broadcast_event", new_callable=AsyncMock
+    ) as mock_broadcast:
+        response = await client.post(
+            f"/api/v1/columns/{col1_id}/sort", params={"by": "title", "dir": "desc"}
+        )
+
+    tasks = (await client.get(f"/api/v1/boards/{board_id}/tasks")).json()
+    column = [(t["title"], t["position"]) for t in tasks if t["column_id"] == col1_id]
+    return response, mock_broadcast, column
+
+
+@pytest.mark.asyncio
+async def test_sort_column(
+    client: AsyncClient, board_with_columns: tuple[str, str, str]
+) -> None:
+    """测试按字段排序整列，广播只携带新顺序"""
+    response, mock_broadcast, column = await _sort_by_title_desc(client, board_with_columns)
+    assert response.status_code == 200
+    assert column == [("c", 0), ("b", 1), ("a", 2)]
+
+    mock_broadcast.assert_called_once()
+    args = mock_broadcast.call_args[0]
+    payload = args[2].model_dump(mode="json")
+    assert args[1] == "column_sorted"
+    assert payload["task_ids"] == [t["id"] for t in response.json()]
+
+    _, col1_id, _ = board_with_columns
+    response = await client.post(f"/api/v1/columns/{col1_id}/sort", params={"by": "rank"})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_rank_sort_column(
+    client: AsyncClient, board_with_columns: tuple[str, str, str], db_session, rank_mode
+) -> None:
+    """测试 rank 模式下排序同时写入均匀 rank 键，读取顺序与新 position 一致，后续移动仍可用"""
+    response, _, column = await _sort_by_title_desc(client, board_with_columns)
+    assert response.status_code == 200
+    assert column == [("c", 0), ("b", 1), ("a", 2)]
+
+    board_id, col1_id, _ = board_with_columns
+    result = await db_session.execute(select(Task.title, Task.rank).order_by(Task.position))
+    assert result.all() == list(zip("cba", spread_ranks(3)))
+
+    tasks = (await client.get(f"/api/v1/boards/{board_id}/tasks")).json()
+    await client.patch(
+        f"/api/v1/tasks/{tasks[2]['id']}/move", json={"column_id": col1_id, "position": 0}
+    )
+    tasks = (await client.get(f"/api/v1/boards/{board_id}/tasks")).json()
+    assert [t["title"] for t in tasks] == ["a", "c", "b"]
+
+
+# -------------------------------------------------------------------------
+#  整列迁移
+# -------------------------------------------------------------------------
+async def _move_all(
+    client: AsyncClient, board_with_columns: tuple[str, str, str], placement: str
+) -> tuple[Response, AsyncMock, list[dict]]:
+    """
+    列1 有 a0, a1，列2 有 b0, b1，将列1 整列迁移到列2 的 placement 端
+
+    返回 (响应, 广播 mock, 迁移后看板全部任务)
+    """
+    board_id, col1_id, col2_id = board_with_columns
+    for column_id, prefix in ((col1_id, "a"), (col2_id, "b")):
+        for i in range(2):
+            await client.post(
+                f"/api/v1/boards/{board_id}/tasks",
+                json={"title": f"{prefix}{i}", "column_id": column_id, "position": i},
+            )
+
+    with patch(
+        "app.api.v1.endpoints.columns.broadcast_event", new_callable=AsyncMock
+    ) as mock_broadcast:
+        response = await client.post(
+            f"/api/v1/columns/{col1_id}/move-all",
+            json={"to_column_id": col2_id, "placement": placement},
+        )
+
+    tasks = (await client.get(f"/api/v1/boards/{board_id}/tasks")).json()
+    return response, mock_broadcast, tasks
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["position", "rank"])
+@pytest.mark.parametrize(
+    "placement, expected",
+    [
+        ("top", [("a0", 0), ("a1", 1), ("b0", 2), ("b1", 3)]),
+        ("bottom", [("b0", 0), ("b1", 1), ("a0", 2), ("a1", 3)]),
+    ],
+)
+async def test_move_all_tasks(
+    client: AsyncClient,
+    board_with_columns: tuple[str, str, str],
+    monkeypatch,
+    mode: str,
+    placement: str,
+    expected: list,
+) -> None:
+    """测试整列迁移到目标列首 / 列尾，两种排序模式结果一致"""
+    monkeypatch.setattr(settings, "ordering_mode", mode)
+    response, mock_broadcast, tasks = await _move_all(client, board_with_columns, placement)
+    assert response.status_code == 200
+
+    args = mock_broadcast.call_args[0]
+    payload = args[2].model_dump(mode="json")
+    assert args[1] == "column_tasks_moved"
+    assert len(payload["task_ids"]) == 2
+
+    assert all(t["column_id"] == board_with_columns[2] for t in tasks)
+    assert [(t["title"], t["position"]) for t in tasks] == expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "placement, expected",
+    [
+        ("top", ["a0", "a1", "b0", "b1"]),
+        ("bottom", ["b0", "b1", "a0", "a1"]),
+    ],
+)
+async def test_rank_move_all_respreads_long_keys(
+    client: AsyncClient,
+    board_with_columns: tuple[str, str, str],
+    db_session,
+    rank_mode,
+    monkeypatch,
+    placement: str,
+    expected: list,
+) -> None:
+    """测试拼接前缀会超出 rank_max_length 时改为重新分配均匀键，顺序不变"""
+    monkeypatch.setattr(settings, "rank_max_length", 1)
+    response, _, tasks = await _move_all(client, board_with_columns, placement)
+    assert response.status_code == 200
+    assert [t["title"] for t in tasks] == expected
+
+    result = await db_session.execute(select(Task.title, Task.rank).order_by(Task.rank))
+    assert result.all() == list(zip(expected, spread_ranks(4)))
+
+
+@pytest.mark.asyncio
+async def test_move_all_conflict_returns_current_state(
+    client: AsyncClient, board_with_columns: tuple[str, str, str]
+) -> None:
+    """测试整列迁移与并发重排冲突时，409 携带两列及其任务的当前版本"""
+    board_id, col1_id, col2_id = board_with_columns
+    task = (
+        await client.post(
+            f"/api/v1/boards/{board_id}/tasks",
+            json={"title": "t", "column_id": col1_id, "position": 0},
+        )
+    ).json()
+
+    with patch(
+        "app.api.v1.endpoints.columns.move_all_tasks",
+        new=AsyncMock(side_effect=StaleDataError()),
+    ):
+        response = await client.post(
+            f"/api/v1/columns/{col1_id}/move-all",
+            json={"to_column_id": col2_id, "placement": "top"},
+        )
+    assert response.status_code == 409
+    current = response.json()["detail"]["current"]
+    columns = {c["id"]: c for c in current["columns"]}
+    assert set(columns) == {col1_id, col2_id}
+    assert columns[col1_id]["ordering_version"] == 2
+    assert [(t["id"], t["version"]) for t in current["tasks"]] == [(task["id"], task["version"])]
+
+
+# -------------------------------------------------------------------------
+#  task_moved 位置差异
+# -------------------------------------------------------------------------
+def _apply_move_event(tasks: list[dict], payload: dict) -> dict:
+    """按客户端逻辑应用 task_moved 载荷，返回 {task_id: (column_id, position, version)}"""
+    state = {}
+    for task in tasks:
+        column_id, position, version = task["column_id"], task["position"], task["version"]
+        if task["id"] == payload["id"]:
+            column_id, position = payload["to_column_id"], payload["position"]
+            version = payload["version"]
+        else:
+            for shift in payload["shifts"]:
+                if (
+                    shift["column_id"] == column_id
+                    and position >= shift["start"]
+                    and (shift["end"] is None or position <= shift["end"])
+                ):
+                    position += shift["delta"]
+                    version += shift["version_delta"]
+                    break
+        state[task["id"]] = (column_id, position, version)
+    return state
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["position", "rank"])
+@pytest.mark.parametrize(
+    "target, position",
+    [("same", 0), ("same", 3), ("same", 99), ("other", 1), ("other", 0)],
+)
+async def test_move_event_carries_position_shifts(
+    client: AsyncClient,
+    board_with_columns: tuple[str, str, str],
+    monkeypatch,
+    mode: str,
+    target: str,
+    position: int,
+) -> None:
+    """测试 task_moved 的区间平移与版本号应用到移动前状态后与服务端一致"""
+    monkeypatch.setattr(settings, "ordering_mode", mode)
+    board_id, col1_id, col2_id = board_with_columns
+    for column_id, prefix in ((col1_id, "a"), (col2_id, "b")):
+        for i in range(4):
+            await client.post(
+                f"/api/v1/boards/{board_id}/tasks",
+                json={"title": f"{prefix}{i}", "column_id": column_id, "position": i},
+            )
+    before = (await client.get(f"/api/v1/boards/{board_id}/tasks")).json()
+    moved = next(t for t in before if t["title"] == "a1")
+
+    with patch(
+        "app.api.v1.endpoints.tasks.broadcast_event", new_callable=AsyncMock
+    ) as mock_broadcast:
+        response = await client.patch(
+            f"/api/v1/tasks/{moved['id']}/move",
+            json={"column_id": col1_id if target == "same" else col2_id, "position": position},
+        )
+    assert response.status_code == 200
+    payload = mock_broadcast.call_args[0][2].model_dump(mode="json")
+    assert payload["from_position"] == 1
+
+    after = (await client.get(f"/api/v1/boards/{board_id}/tasks")).json()
+    assert _apply_move_event(before, payload) == {
+        t["id"]: (t["column_id"], t["position"], t["version"]) for t in after
+    }
+    columns = (await client.get(f"/api/v1/boards/{board_id}/columns")).json()
+    if mode == "position":
+        assert payload["column_versions"] == {
+            c["id"]: c["ordering_version"]
+            for c in columns
+            if c["id"] in payload["column_versions"]
+        }
+        assert len(payload["column_versions"]) == (1 if target == "same" else 2)
+    else:
+        assert payload["column_versions"] is None
+
+
+def test_position_shift_rejects_inverted_range() -> None:
+    """测试区间平移描述的边界校验"""
+    with pytest.raises(ValidationError):
+        PositionShift(column_id=uuid4(), start=3, end=1, delta=1)
@@ -133,3 +133,211 @@ async def test_delete_task(
     # 确认删除
     get_response = await client.get(f"/api/v1/tasks/{task_id}")
     assert get_response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_update_task_version_conflict(
+    client: AsyncClient, board_and_column: tuple[str, str]
+) -> None:
+    """测试携带过期版本号更新任务返回 409 及当前状态"""
+    board_id, column_id = board_and_column
+
+    create_response = await client.post(
+        f"/api/v1/boards/{board_id}/tasks",
+        json={"title": "原标题", "column_id": column_id, "position": 0},
+    )
+    task = create_response.json()
+    assert task["version"] == 1
+
+    response = await client.patch(
+        f"/api/v1/tasks/{task['id']}",
+        json={"title": "第一次", "expected_version": 1},
+    )
+    assert response.status_code == 200
+    assert response.json()["version"] == 2
+
+    # 过期版本（body 字段）
+    response = await client.patch(
+        f"/api/v1/tasks/{task['id']}",
+        json={"title": "第二次", "expected_version": 1},
+    )
+    assert response.status_code == 409
+    assert response.json()["detail"]["current"]["title"] == "第一次"
+
+    # 过期版本（If-Match 头）
+    response = await client.patch(
+        f"/api/v1/tasks/{task['id']}",
+        json={"title": "第二次"},
+        headers={"If-Match": '"1"'},
+    )
+    assert response.status_code == 409
+
+    response = await client.patch(
+        f"/api/v1/tasks/{task['id']}",
+        json={"title": "第二次"},
+        headers={"If-Match": 'W/"2"'},
+    )
+    assert response.status_code == 200
+    assert response.json()["version"] == 3
+
+
+async def _create_tasks(client: AsyncClient, board_id: str, column_id: str, n: int) -> list[str]:
+    ids = []
+    for i in range(n):
+        response = await client.post(
+            f"/api/v1/boards/{board_id}/tasks",
+            json={"title": f"任务{i}", "column_id": column_id, "position": i},
+        )
+        ids.append(response.json()["id"])
+    return ids
+
+
+@pytest.mark.asyncio
+async def test_delete_task_compacts_column(
+    client: AsyncClient, board_and_column: tuple[str, str]
+) -> None:
+    """测试删除任务后其后的任务前移，事件携带被平移的区间"""
+    from unittest.mock import AsyncMock, patch
+
+    board_id, column_id = board_and_column
+    ids = await _create_tasks(client, board_id, column_id, 4)
+
+    with patch(
+        "app.api.v1.endpoints.tasks.broadcast_event", new_callable=AsyncMock
+    ) as mock_broadcast:
+        response = await client.delete(f"/api/v1/tasks/{ids[1]}")
+    assert response.status_code == 204
+
+    tasks = (await client.get(f"/api/v1/boards/{board_id}/tasks")).json()
+    assert [(t["title"], t["position"]) for t in tasks] == [
+        ("任务0", 0),
+        ("任务2", 1),
+        ("任务3", 2),
+    ]
+
+    args = mock_broadcast.call_args[0]
+    payload = args[2].model_dump(mode="json")
+    assert args[1] == "task_deleted"
+    assert payload["position"] == 1
+    assert (payload["shifted_from"], payload["shifted_to"]) == (2, 3)
+
+
+@pytest.mark.asyncio
+async def test_delete_tasks_batch(
+    client: AsyncClient, board_and_column: tuple[str, str]
+) -> None:
+    """测试批量删除一次压缩整列，deletions 依次应用可还原最终顺序"""
+    from unittest.mock import AsyncMock, patch
+
+    board_id, column_id = board_and_column
+    ids = await _create_tasks(client, board_id, column_id, 5)
+
+    with patch(
+        "app.api.v1.endpoints.tasks.broadcast_event", new_callable=AsyncMock
+    ) as mock_broadcast:
+        response = await client.post(
+            f"/api/v1/boards/{board_id}/tasks/delete",
+            json={"task_ids": [ids[0], ids[3]]},
+        )
+    assert response.status_code == 204
+
+    tasks = (await client.get(f"/api/v1/boards/{board_id}/tasks")).json()
+    assert [(t["title"], t["position"]) for t in tasks] == [
+        ("任务1", 0),
+        ("任务2", 1),
+        ("任务4", 2),
+    ]
+
+    args = mock_broadcast.call_args[0]
+    payload = args[2].model_dump(mode="json")
+    assert args[1] == "tasks_deleted"
+    local = list(ids)
+    for deletion in payload["deletions"]:
+        assert local.index(deletion["id"]) == deletion["position"]
+        local.remove(deletion["id"])
+    assert local == [ids[1], ids[2], ids[4]]
+
+    response = await client.post(
+        f"/api/v1/boards/{board_id}/tasks/delete", json={"task_ids": [ids[0]]}
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("ordering_mode", ["position", "rank"])
+async def test_list_tasks_keyset_pagination(
+    client: AsyncClient, board_and_column: tuple[str, str], monkeypatch, ordering_mode
+) -> None:
+    """测试任务游标分页：逐页取完与整表一致、列内 position 连续，支持按列过滤"""
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "ordering_mode", ordering_mode)
+    board_id, column_id = board_and_column
+    other_id = (
+        await client.post(f"/api/v1/boards/{board_id}/columns", json={"title": "完成"})
+    ).json()["id"]
+    for i in range(7):
+        await client.post(
+            f"/api/v1/boards/{board_id}/tasks",
+            json={"title": f"任务{i}", "column_id": (column_id, other_id)[i % 2], "position": 0},
+        )
+    url = f"/api/v1/boards/{board_id}/tasks"
+
+    pages, params = [], {"limit": 3}
+    while True:
+        response = await client.get(url, params=params)
+        assert response.status_code == 200
+        pages.append(response.json())
+        if "x-next-cursor" not in response.headers:
+            break
+        params = {"limit": 3, "cursor": response.headers["x-next-cursor"]}
+    assert [len(page) for page in pages] == [3, 3, 1]
+
+    paged = [(t["column_id"], t["position"], t["id"]) for page in pages for t in page]
+    full = (await client.get(url)).json()
+    assert paged == sorted((t["column_id"], t["position"], t["id"]) for t in full)
+    for col in (column_id, other_id):
+        assert [p for c, p, _ in paged if c == col] == list(range(4 if col == column_id else 3))
+
+    only = (await client.get(url, params={"column_id": other_id})).json()
+    assert [t["id"] for t in only] == [i for c, _, i in paged if c == other_id]
+    page = await client.get(url, params={"column_id": other_id, "limit": 2})
+    assert [t["id"] for t in page.json()] == [t["id"] for t in only[:2]]
+
+    assert (await client.get(url, params={"cursor": "not-a-cursor"})).status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_summary_view(
+    client: AsyncClient, board_and_column: tuple[str, str]
+) -> None:
+    """测试摘要视图不返回 description，且查询语句不读取该列"""
+    from sqlalchemy import event
+
+    from tests.conftest import test_engine
+
+    board_id, column_id = board_and_column
+    await client.post(
+        f"/api/v1/boards/{board_id}/tasks",
+        json={"title": "卡片", "description": "很长的描述", "column_id": column_id},
+    )
+    url = f"/api/v1/boards/{board_id}/tasks"
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    event.listen(test_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        summary = (await client.get(url, params={"view": "summary"})).json()
+        page = await client.get(url, params={"view": "summary", "limit": 1})
+    finally:
+        event.remove(test_engine.sync_engine, "before_cursor_execute", record)
+
+    full = (await client.get(url)).json()
+    assert full[0]["description"] == "很长的描述"
+    assert summary == page.json() == [{k: v for k, v in full[0].items() if k != "description"}]
+    assert page.headers["etag"] == (await client.get(url)).headers["etag"]
+    task_queries = [s for s in statements if "FROM tasks" in s]
+    assert len(task_queries) == 2
+    assert not any("description" in s for s in task_queries)
@@ -39,25 +39,34 @@ def board_id():
 def test_connect_to_board(sync_client, board_id):
     """测试 WebSocket 连接到看板"""
     with sync_client.websocket_connect(f"/api/v1/ws/boards/{board_id}") as ws:
+        # 首帧为 hello
+        assert json.loads(ws.receive_text())["type"] == "hello"
         # 发送 ping，验证连接正常
         ws.send_text("ping")
-        response = ws.receive_text()
-        assert response == "pong"
+        assert json.loads(ws.receive_text())["type"] == "pong"
 
 
 def test_connect_multiple_clients(sync_client, board_id):
     """测试多客户端连接同一看板"""
     with sync_client.websocket_connect(f"/api/v1/ws/boards/{board_id}") as ws1:
         with sync_client.websocket_connect(f"/api/v1/ws/boards/{board_id}") as ws2:
+            assert json.loads(ws1.receive_text())["type"] == "hello"
+            assert json.loads(ws2.receive_text())["type"] == "hello"
             ws1.send_text("ping")
             ws2.send_text("ping")
-            assert ws1.receive_text() == "pong"
-            assert ws2.receive_text() == "pong"
+            assert json.loads(ws1.receive_text())["type"] == "pong"
+            assert json.loads(ws2.receive_text())["type"] == "pong"
 
 
 # -------------------------------------------------------------------------
 #  ConnectionManager 单元测试
 # -------------------------------------------------------------------------
+def _sent_events(mock_ws) -> list[dict]:
+    """mock 连接收到的事件帧（跳过 hello / resync 控制帧）"""
+    frames = [json.loads(call[0][0]) for call in mock_ws.send_text.call_args_list]
+    return [f for f in frames if f["type"] not in ("hello", "resync")]
+
+
 @pytest.mark.asyncio
 async def test_manager_broadcast():
     """测试 ConnectionManager 广播功能"""
@@ -70,21 +79,20 @@ async def test_manager_broadcast():
     mock_ws = AsyncMock()
     mock_ws.send_text = AsyncMock()
 
-    # 手动添加连接
-    test_manager._connections[board_uuid] = [mock_ws]
+    await test_manager.connect(mock_ws, board_uuid)
 
-    # 广播消息
+    # 广播消息（入队后由写协程发送）
     await test_manager.broadcast(board_uuid, "task_created", {"id": "123"})
+    await test_manager.drain(board_uuid)
 
-    # 验证 send_text 被调用
-    mock_ws.send_text.assert_called_once()
-    call_args = mock_ws.send_text.call_args[0][0]
-    event = json.loads(call_args)
+    # 验证事件已发送
+    (event,) = _sent_events(mock_ws)
 
     assert event["type"] == "task_created"
     assert event["board_id"] == str(board_uuid)
     assert event["payload"]["id"] == "123"
     assert "ts" in event
+    await test_manager.close()
 
 
 @pytest.mark.asyncio
@@ -104,7 +112,7 @@ async def test_manager_connect_disconnect():
     assert mock_ws in test_manager._connections[board_uuid]
 
     # 断开
-    test_manager.disconnect(mock_ws, board_uuid)
+    test_manager.disconnect(mock_ws)
     assert board_uuid not in test_manager._connections
 
 
@@ -151,10 +159,532 @@ async def test_broadcast_removes_dead_connections():
     # 模拟正常的连接
     live_ws = AsyncMock()
 
-    test_manager._connections[board_uuid] = [dead_ws, live_ws]
+    await test_manager.connect(dead_ws, board_uuid)
+    await test_manager.connect(live_ws, board_uuid)
 
     await test_manager.broadcast(board_uuid, "task_updated", {"id": "abc"})
+    await test_manager.drain(board_uuid)
 
     # 死连接应被移除
     assert dead_ws not in test_manager._connections.get(board_uuid, [])
     assert live_ws in test_manager._connections[board_uuid]
+    await test_manager.close()
+
+
+# -------------------------------------------------------------------------
+#  发送队列与慢客户端
+# -------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_slow_client_does_not_block_broadcast(monkeypatch):
+    """测试卡住的连接不阻塞广播，超时后被踢出，其他连接正常收到消息"""
+    import asyncio
+    from unittest.mock import AsyncMock
+
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "ws_send_timeout", 0.05)
+    test_manager = type(manager)()
+    board_uuid = uuid4()
+
+    async def hang(_):
+        await asyncio.sleep(3600)
+
+    stuck_ws = AsyncMock()
+    stuck_ws.send_text = AsyncMock(side_effect=hang)
+    live_ws = AsyncMock()
+    await test_manager.connect(stuck_ws, board_uuid)
+    await test_manager.connect(live_ws, board_uuid)
+
+    await asyncio.wait_for(
+        test_manager.broadcast(board_uuid, "task_updated", {"id": "abc"}), 0.01
+    )
+    await asyncio.wait_for(test_manager.drain(board_uuid), 1)
+
+    assert len(_sent_events(live_ws)) == 1
+    assert stuck_ws not in test_manager._connections[board_uuid]
+    await asyncio.sleep(0)
+    stuck_ws.close.assert_called_once()
+    await test_manager.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "policy, expected, connected",
+    [
+        ("drop", ["a:1", "b:1"], True),
+        ("coalesce", ["b:1", "a:2"], True),
+        ("disconnect", [], False),
+    ],
+)
+async def test_send_queue_overflow_policy(monkeypatch, policy, expected, connected):
+    """测试发送队列溢出策略"""
+    import asyncio
+    from unittest.mock import AsyncMock
+
+    from app.core.config import settings
+
+    # hello 帧占一个槽位，事件可用两个
+    monkeypatch.setattr(settings, "ws_send_queue_size", 3)
+    monkeypatch.setattr(settings, "ws_overflow_policy", policy)
+    test_manager = type(manager)()
+    board_uuid = uuid4()
+
+    mock_ws = AsyncMock()
+    await test_manager.connect(mock_ws, board_uuid)
+
+    # 写协程尚未运行，三条消息全部在队列中竞争两个槽位
+    await test_manager.broadcast(board_uuid, "a", {"id": "1"})
+    await test_manager.broadcast(board_uuid, "b", {"id": "1"})
+    await test_manager.broadcast(board_uuid, "a", {"id": "1", "n": 2})
+    await test_manager.drain(board_uuid)
+    await asyncio.sleep(0)
+
+    labels = [f"{e['type']}:{e['payload'].get('n', 1)}" for e in _sent_events(mock_ws)]
+    assert labels == expected
+    assert (mock_ws in test_manager._connections.get(board_uuid, {})) is connected
+    await test_manager.close()
+
+
+@pytest.mark.asyncio
+async def test_drop_policy_sends_resync(monkeypatch):
+    """测试 drop 策略丢弃事件后，腾出槽位时向客户端补发携带最新序号的 resync"""
+    import asyncio
+    from unittest.mock import AsyncMock
+
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "ws_send_queue_size", 2)
+    monkeypatch.setattr(settings, "ws_overflow_policy", "drop")
+    test_manager = type(manager)()
+    board_uuid = uuid4()
+    mock_ws = AsyncMock()
+    await test_manager.connect(mock_ws, board_uuid)
+
+    for i in range(3):
+        await test_manager.broadcast(board_uuid, "task_updated", {"id": str(i)})
+    await test_manager.drain(board_uuid)
+    await asyncio.sleep(0)
+
+    frames = [json.loads(call[0][0]) for call in mock_ws.send_text.call_args_list]
+    assert [(f["type"], f["seq"]) for f in frames] == [
+        ("hello", 0),
+        ("task_updated", 1),
+        ("resync", 3),
+    ]
+    assert not test_manager._sockets[mock_ws].stale
+    await test_manager.close()
+
+
+# -------------------------------------------------------------------------
+#  序号与重连补发
+# -------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_reconnect_replays_missed_events(monkeypatch):
+    """测试重连时按 since 补发缺口，缺口超出缓冲区或 epoch 不符时要求 resync"""
+    from unittest.mock import AsyncMock
+
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "ws_replay_buffer_size", 3)
+    test_manager = type(manager)()
+    board_uuid = uuid4()
+
+    for i in range(4):
+        await test_manager.broadcast(board_uuid, "task_updated", {"id": str(i)})
+
+    replay_ws = AsyncMock()
+    epoch = test_manager._logs[board_uuid].epoch
+    await test_manager.connect(replay_ws, board_uuid, since=2, epoch=epoch)
+    await test_manager.drain(board_uuid)
+    hello = json.loads(replay_ws.send_text.call_args_list[0][0][0])
+    assert (hello["type"], hello["seq"]) == ("hello", 4)
+    assert [e["seq"] for e in _sent_events(replay_ws)] == [3, 4]
+
+    # seq 1 已被挤出缓冲区
+    stale_ws = AsyncMock()
+    await test_manager.connect(stale_ws, board_uuid, since=0)
+    # 其他进程 / 重启前的序号空间
+    foreign_ws = AsyncMock()
+    await test_manager.connect(foreign_ws, board_uuid, since=3, epoch="other")
+    await test_manager.drain(board_uuid)
+    for ws in (stale_ws, foreign_ws):
+        frames = [json.loads(call[0][0]) for call in ws.send_text.call_args_list]
+        assert [f["type"] for f in frames] == ["hello", "resync"]
+
+    # 补发之后的新事件序号连续
+    await test_manager.broadcast(board_uuid, "task_deleted", {"id": "0"})
+    await test_manager.drain(board_uuid)
+    assert [e["seq"] for e in _sent_events(replay_ws)] == [3, 4, 5]
+
+    # 日志被淘汰后重建：序号从头开始且 epoch 变化，旧客户端一律 resync
+    monkeypatch.setattr(settings, "ws_replay_boards", 1)
+    await test_manager.broadcast(uuid4(), "task_updated", {"id": "x"})
+    await test_manager.broadcast(board_uuid, "task_updated", {"id": "y"})
+    assert test_manager._logs[board_uuid].epoch != epoch
+    for old_epoch in (epoch, None):
+        ws = AsyncMock()
+        await test_manager.connect(ws, board_uuid, since=5, epoch=old_epoch)
+        await test_manager.drain(board_uuid)
+        frames = [json.loads(call[0][0]) for call in ws.send_text.call_args_list]
+        assert [f["type"] for f in frames] == ["hello", "resync"]
+        assert frames[0]["seq"] == 1
+    await test_manager.close()
+
+
+@pytest.mark.asyncio
+async def test_manager_resync_rotates_epoch():
+    """测试广播后端恢复后 resync：看板日志换代，已连接客户端收到新 epoch 的 resync 帧"""
+    from unittest.mock import AsyncMock
+
+    test_manager = type(manager)()
+    board_uuid = uuid4()
+    ws = AsyncMock()
+    await test_manager.connect(ws, board_uuid)
+    await test_manager.broadcast(board_uuid, "task_updated", {"id": "1"})
+    old_epoch = test_manager._logs[board_uuid].epoch
+
+    test_manager.resync()
+    await test_manager.drain(board_uuid)
+    frames = [json.loads(call[0][0]) for call in ws.send_text.call_args_list]
+    assert [f["type"] for f in frames] == ["hello", "task_updated", "resync"]
+    assert frames[-1]["epoch"] != old_epoch and frames[-1]["seq"] == 0
+    await test_manager.close()
+
+
+# -------------------------------------------------------------------------
+#  帧编码与子协议
+# -------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_broadcast_encodes_payload_model_once():
+    """测试载荷模型直接编码（UUID 无需 str），同格式的订阅者共享同一份编码"""
+    from unittest.mock import AsyncMock
+
+    from app.schemas.events import TaskMovedPayload
+
+    test_manager = type(manager)()
+    board_uuid = uuid4()
+    ws1, ws2 = AsyncMock(), AsyncMock()
+    await test_manager.connect(ws1, board_uuid)
+    await test_manager.connect(ws2, board_uuid)
+
+    task_id, column_id = uuid4(), uuid4()
+    payload = TaskMovedPayload(
+        id=task_id,
+        from_column_id=column_id,
+        to_column_id=column_id,
+        position=3,
+        column_versions={column_id: 2},
+    )
+    await test_manager.broadcast(board_uuid, "task_moved", payload)
+    await test_manager.drain(board_uuid)
+
+    assert ws1.send_text.call_args[0][0] is ws2.send_text.call_args[0][0]
+    (event,) = _sent_events(ws1)
+    assert event["payload"]["id"] == str(task_id)
+    assert event["payload"]["position"] == 3
+    assert event["payload"]["column_versions"] == {str(column_id): 2}
+    await test_manager.close()
+
+
+def test_negotiate_subprotocol(monkeypatch):
+    """测试子协议协商：msgpack 未安装时回落到 JSON"""
+    from app.services import encoding
+
+    assert encoding.negotiate_subprotocol([]) is None
+    assert encoding.negotiate_subprotocol(["kanban.json"]) == "kanban.json"
+
+    monkeypatch.setattr(encoding, "msgpack", None)
+    assert encoding.negotiate_subprotocol(["kanban.msgpack", "kanban.json"]) == "kanban.json"
+
+
+def test_msgpack_binary_frames(sync_client, board_id):
+    """测试协商 kanban.msgpack 后收到二进制帧"""
+    msgpack = pytest.importorskip("msgpack")
+
+    with sync_client.websocket_connect(
+        f"/api/v1/ws/boards/{board_id}", subprotocols=["kanban.msgpack"]
+    ) as ws:
+        hello = msgpack.unpackb(ws.receive_bytes())
+        assert hello["type"] == "hello"
+        assert hello["board_id"] == board_id
+
+
+# -------------------------------------------------------------------------
+#  合并窗口
+# -------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_coalescing_window_merges_into_batch(monkeypatch):
+    """测试合并窗口内同一实体的事件合并，整体以一个 batch 帧发出并记录指标"""
+    import asyncio
+    from unittest.mock import AsyncMock
+
+    from app.core.config import settings
+    from app.core.metrics import metrics
+
+    monkeypatch.setattr(settings, "ws_coalesce_window_ms", 10)
+    metrics.reset()
+    test_manager = type(manager)()
+    board_uuid = uuid4()
+    mock_ws = AsyncMock()
+    await test_manager.connect(mock_ws, board_uuid)
+
+    await test_manager.broadcast(board_uuid, "task_updated", {"id": "1", "title": "a"})
+    await test_manager.broadcast(board_uuid, "task_updated", {"id": "2", "title": "b"})
+    await test_manager.broadcast(board_uuid, "task_updated", {"id": "1", "title": "c"})
+    assert _sent_events(mock_ws) == []
+
+    # 窗口到期后由定时器发出
+    await asyncio.sleep(0.05)
+    await test_manager.drain(board_uuid)
+    (batch,) = _sent_events(mock_ws)
+    assert batch["type"] == "batch"
+    assert [(e["payload"]["id"], e["payload"]["title"]) for e in batch["payload"]["events"]] == [
+        ("2", "b"),
+        ("1", "c"),
+    ]
+
+    # 窗口内只有一个事件时保持原类型
+    await test_manager.broadcast(board_uuid, "task_deleted", {"id": "2"})
+    await test_manager.drain(board_uuid)
+    assert [e["type"] for e in _sent_events(mock_ws)] == ["batch", "task_deleted"]
+
+    # 同一任务的多次移动各自携带差量，全部保留
+    for from_col, to_col in (("c1", "c2"), ("c2", "c2")):
+        await test_manager.broadcast(
+            board_uuid,
+            "task_moved",
+            {"id": "1", "from_column_id": from_col, "to_column_id": to_col, "shifts": []},
+        )
+    await test_manager.drain(board_uuid)
+    moves = _sent_events(mock_ws)[-1]["payload"]["events"]
+    assert [e["payload"]["from_column_id"] for e in moves] == ["c1", "c2"]
+
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"]["ws.coalesced_events"] == 1
+    assert snapshot["summaries"]["ws.batch_size"]["max"] == 2
+    assert snapshot["summaries"]["ws.flush_latency_ms"]["count"] == 3
+    await test_manager.close()
+
+
+@pytest.mark.asyncio
+async def test_close_flushes_pending_batch(monkeypatch):
+    """测试关闭管理器时先发出合并窗口内的待发事件再断开"""
+    from unittest.mock import AsyncMock
+
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "ws_coalesce_window_ms", 60_000)
+    test_manager = type(manager)()
+    board_uuid = uuid4()
+    mock_ws = AsyncMock()
+    await test_manager.connect(mock_ws, board_uuid)
+    await test_manager.broadcast(board_uuid, "task_updated", {"id": "1"})
+    assert _sent_events(mock_ws) == []
+
+    await test_manager.close()
+    assert [e["type"] for e in _sent_events(mock_ws)] == ["task_updated"]
+    assert not test_manager._batches
+
+
+# -------------------------------------------------------------------------
+#  心跳与连接上限
+# -------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_reaper_pings_then_evicts_silent_connection(monkeypatch):
+    """测试静默连接先收到 ping 帧，超时仍无响应被回收；有响应的连接保留"""
+    from unittest.mock import AsyncMock
+
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "ws_ping_interval", 10.0)
+    monkeypatch.setattr(settings, "ws_ping_timeout", 5.0)
+    test_manager = type(manager)()
+    board_uuid = uuid4()
+    silent, alive = AsyncMock(), AsyncMock()
+    await test_manager.connect(silent, board_uuid)
+    await test_manager.connect(alive, board_uuid)
+    room = test_manager._connections[board_uuid]
+
+    for conn in room.values():
+        conn.last_seen -= 11
+    test_manager.reap()
+    await test_manager.drain(board_uuid)
+    for ws in (silent, alive):
+        frames = [json.loads(call[0][0]) for call in ws.send_text.call_args_list]
+        assert [f["type"] for f in frames] == ["hello", "ping"]
+
+    # alive 回复后刷新心跳；silent 超过 interval + timeout 被回收
+    test_manager.touch(alive)
+    room[silent].last_seen -= 5
+    test_manager.reap()
+    assert list(test_manager._connections[board_uuid]) == [alive]
+    assert test_manager.connection_count == 1
+    await test_manager.close()
+    silent.close.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_connection_caps_reject_handshake(monkeypatch):
+    """测试看板 / 进程连接数达到上限时拒绝握手"""
+    from unittest.mock import AsyncMock
+
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "ws_max_connections_per_board", 1)
+    monkeypatch.setattr(settings, "ws_max_connections", 2)
+    test_manager = type(manager)()
+    board_a, board_b, board_c = uuid4(), uuid4(), uuid4()
+
+    assert await test_manager.connect(AsyncMock(), board_a)
+    rejected = AsyncMock()
+    assert not await test_manager.connect(rejected, board_a)
+    rejected.accept.assert_not_called()
+    rejected.close.assert_called_once()
+
+    assert await test_manager.connect(AsyncMock(), board_b)
+    assert not await test_manager.connect(AsyncMock(), board_c)
+    assert test_manager.connection_count == 2
+    await test_manager.close()
+    assert test_manager.connection_count == 0
+
+
+@pytest.mark.asyncio
+async def test_registry_snapshot_reports_send_stats():
+    """测试连接记录的发送统计与注册表快照"""
+    from unittest.mock import AsyncMock
+
+    test_manager = type(manager)()
+    board_a, board_b = uuid4(), uuid4()
+    ws_a1, ws_a2, ws_b = AsyncMock(), AsyncMock(), AsyncMock()
+    for ws, bid in ((ws_a1, board_a), (ws_a2, board_a), (ws_b, board_b)):
+        await test_manager.connect(ws, bid)
+
+    await test_manager.broadcast(board_a, "task_created", {"id": "1"})
+    await test_manager.drain()
+
+    assert len(list(test_manager.connections(board_a))) == 2
+    record = next(test_manager.connections(board_b))
+    assert record.info()["sent"] == 1  # 仅 hello
+    snapshot = test_manager.snapshot(top=1)
+    assert snapshot["connections"] == 3 and snapshot["boards"] == 2
+    assert snapshot["sent"] == 5 and snapshot["queued"] == 0
+    assert snapshot["sent_bytes"] == sum(
+        len(call[0][0].encode()) for ws in (ws_a1, ws_a2, ws_b) for call in ws.send_text.call_args_list
+    )
+    assert snapshot["largest_boards"] == [{"board_id": str(board_a), "connections": 2}]
+
+    test_manager.disconnect(ws_a1)
+    assert test_manager.snapshot()["connections"] == 2
+    await test_manager.close()
+
+
+# -------------------------------------------------------------------------
+#  订阅过滤
+# -------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_subscription_filters_skip_non_matching_connections():
+    """测试按列 / 事件类型订阅：不匹配的事件不入队，看板级事件照常送达"""
+    from unittest.mock import AsyncMock
+
+    test_manager = type(manager)()
+    board_uuid = uuid4()
+    col_a, col_b = str(uuid4()), str(uuid4())
+    by_column, by_type, everything = AsyncMock(), AsyncMock(), AsyncMock()
+    for ws in (by_column, by_type, everything):
+        await test_manager.connect(ws, board_uuid)
+    test_manager.subscribe(by_column, columns=[col_a])
+    test_manager.subscribe(by_type, events=["task_deleted"])
+
+    await test_manager.broadcast(board_uuid, "task_created", {"id": "1", "column_id": col_b})
+    await test_manager.broadcast(
+        board_uuid,
+        "tasks_moved",
+        {"moves": [{"id": "1", "from_column_id": col_b, "to_column_id": col_a}]},
+    )
+    await test_manager.broadcast(board_uuid, "columns_reordered", {"column_ids": [col_b, col_a]})
+    await test_manager.broadcast(board_uuid, "task_deleted", {"id": "1", "column_id": col_a})
+    await test_manager.drain()
+
+    def received(ws) -> list[str]:
+        return [e["type"] for e in _sent_events(ws) if e["type"] != "subscribed"]
+
+    assert received(by_column) == ["tasks_moved", "columns_reordered", "task_deleted"]
+    assert received(by_type) == ["task_deleted"]
+    assert len(received(everything)) == 4
+
+    # 清空订阅后恢复接收全部事件
+    test_manager.subscribe(by_type)
+    await test_manager.broadcast(board_uuid, "task_created", {"id": "2", "column_id": col_b})
+    await test_manager.drain()
+    assert received(by_type)[-1] == "task_created"
+    await test_manager.close()
+
+
+def test_subscribe_message_over_socket(sync_client, board_id):
+    """测试经 WebSocket 发送订阅消息：合法时回复 subscribed，非法时回复 error"""
+    column_id = str(uuid4())
+    with sync_client.websocket_connect(f"/api/v1/ws/boards/{board_id}") as ws:
+        assert json.loads(ws.receive_text())["type"] == "hello"
+        ws.send_text(json.dumps({"type": "subscribe", "events": ["nope"]}))
+        assert json.loads(ws.receive_text())["type"] == "error"
+
+        ws.send_text(
+            json.dumps({"type": "subscribe", "columns": [column_id], "events": ["task_moved"]})
+        )
+        ack = json.loads(ws.receive_text())
+        assert ack["type"] == "subscribed"
+        assert ack["columns"] == [column_id] and ack["events"] == ["task_moved"]
+
+
+# -------------------------------------------------------------------------
+#  多路复用端点
+# -------------------------------------------------------------------------
+def test_multiplexed_socket_joins_and_leaves_boards(sync_client):
+    """测试一个 /ws 连接加入多个看板，事件按 board_id 区分，退出后不再收到该看板事件"""
+    board_a, board_b = str(uuid4()), str(uuid4())
+    with sync_client.websocket_connect("/api/v1/ws") as ws:
+        for bid in (board_a, board_b):
+            ws.send_text(json.dumps({"type": "join", "board_id": bid}))
+            hello = json.loads(ws.receive_text())
+            assert hello["type"] == "hello" and hello["board_id"] == bid
+        assert manager.connection_count == 1
+
+        for bid in (board_a, board_b):
+            sync_client.portal.call(manager.broadcast, UUID(bid), "task_created", {"id": bid})
+        received = [json.loads(ws.receive_text()) for _ in range(2)]
+        assert [(e["type"], e["board_id"]) for e in received] == [
+            ("task_created", board_a),
+            ("task_created", board_b),
+        ]
+
+        ws.send_text(json.dumps({"type": "leave", "board_id": board_a}))
+        assert json.loads(ws.receive_text())["type"] == "left"
+        sync_client.portal.call(manager.broadcast, UUID(board_a), "task_created", {"id": "x"})
+        sync_client.portal.call(manager.broadcast, UUID(board_b), "task_created", {"id": "y"})
+        event = json.loads(ws.receive_text())
+        assert event["board_id"] == board_b and event["payload"]["id"] == "y"
+
+        ws.send_text(json.dumps({"type": "join", "board_id": "not-a-uuid"}))
+        assert json.loads(ws.receive_text())["type"] == "error"
+
+
+@pytest.mark.asyncio
+async def test_multiplexed_connection_board_limit(monkeypatch):
+    """测试单连接可加入的看板数上限，断开时从所有看板房间移除"""
+    from unittest.mock import AsyncMock
+
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "ws_max_boards_per_connection", 2)
+    test_manager = type(manager)()
+    mock_ws = AsyncMock()
+    boards = [uuid4() for _ in range(3)]
+    assert await test_manager.connect(mock_ws)
+    assert test_manager.join(mock_ws, boards[0])
+    assert test_manager.join(mock_ws, boards[1])
+    assert not test_manager.join(mock_ws, boards[2])
+    assert test_manager.join(mock_ws, boards[0])  # 已加入时重新同步不受上限影响
+
+    test_manager.disconnect(mock_ws)
+    assert not test_manager._connections and test_manager.connection_count == 0
+    await test_manager.close()
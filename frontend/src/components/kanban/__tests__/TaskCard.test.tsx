@@ -28,6 +28,7 @@ const mockTask: Task = {
   title: "Test Task",
   description: "Test Description",
   position: 0,
+  version: 1,
   created_at: "2024-01-01T00:00:00Z",
   updated_at: "2024-01-01T00:00:00Z",
 };
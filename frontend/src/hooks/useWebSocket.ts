@@ -8,15 +8,31 @@
 import { useEffect, useRef, useCallback } from "react";
 import { useQueryClient } from "@tanstack/react-query";
 import { boardKeys } from "./useBoard";
-import type { Task } from "../types/kanban";
+import type { Column, Task } from "../types/kanban";
 
 interface WebSocketEvent {
   type: string;
   board_id: string;
-  ts: string;
+  /** 看板内单调递增的事件序号 */
+  seq: number;
+  /** 仅 hello / resync / ping 控制帧携带：服务端序号空间标识 */
+  epoch?: string;
+  ts?: string;
   payload: Record<string, unknown>;
 }
 
+/**
+ * task_moved 携带的区间平移：移动前 position 位于 [start, end] 的任务平移 delta，
+ * 版本号增加 version_delta
+ */
+interface PositionShift {
+  column_id: string;
+  start: number;
+  end: number | null;
+  delta: number;
+  version_delta: number;
+}
+
 interface UseWebSocketOptions {
   /** 是否有进行中的移动操作，用于避免干扰乐观更新 */
   isMovePending?: boolean;
@@ -30,6 +46,9 @@ export function useWebSocket(
   const wsRef = useRef<WebSocket | null>(null);
   const queryClient = useQueryClient();
   const reconnectTimeoutRef = useRef<number | null>(null);
+  // 最后收到的事件序号与服务端 epoch，重连时据此补发缺口
+  const lastSeqRef = useRef<number | null>(null);
+  const epochRef = useRef<string | null>(null);
   // 用 ref 追踪最新的 isMovePending，避免 callback 依赖变化
   const isMovePendingRef = useRef(isMovePending);
   isMovePendingRef.current = isMovePending;
@@ -41,7 +60,10 @@ export function useWebSocket(
     const wsProtocol = window.location.protocol === "https:" ? "wss:" : "ws:";
     const wsHost = window.location.hostname;
     const wsPort = "8000"; // 后端端口
-    const wsUrl = `${wsProtocol}//${wsHost}:${wsPort}/api/v1/ws/boards/${boardId}`;
+    let wsUrl = `${wsProtocol}//${wsHost}:${wsPort}/api/v1/ws/boards/${boardId}`;
+    if (lastSeqRef.current !== null && epochRef.current !== null) {
+      wsUrl += `?since=${lastSeqRef.current}&epoch=${epochRef.current}`;
+    }
 
     const ws = new WebSocket(wsUrl);
     wsRef.current = ws;
@@ -79,6 +101,39 @@ export function useWebSocket(
       const { type, payload } = event;
       const tasksKey = boardKeys.tasks(boardId);
 
+      if (type === "ping") {
+        // 服务端心跳：回复任意消息即可，不占用事件序号
+        wsRef.current?.send("pong");
+        return;
+      }
+      if (type === "pong") {
+        // 客户端 ping 的应答（控制帧，不占用事件序号）
+        return;
+      }
+      if (type === "hello") {
+        // 首次连接以服务端当前序号为起点；重连时补发帧随后到达
+        epochRef.current = event.epoch ?? null;
+        if (lastSeqRef.current === null) lastSeqRef.current = event.seq;
+        return;
+      }
+      if (type === "resync") {
+        // 缺口已无法补发：整体重新拉取看板
+        epochRef.current = event.epoch ?? null;
+        lastSeqRef.current = event.seq;
+        queryClient.invalidateQueries({ queryKey: boardKeys.detail(boardId) });
+        return;
+      }
+      lastSeqRef.current = event.seq;
+
+      if (type === "batch") {
+        // 合并窗口内的多个事件，按序逐个应用
+        const events = payload.events as Pick<WebSocketEvent, "type" | "payload">[];
+        for (const inner of events) {
+          handleEvent({ ...event, type: inner.type, payload: inner.payload });
+        }
+        return;
+      }
+
       switch (type) {
         case "task_created": {
           // 添加新任务到缓存
@@ -91,6 +146,7 @@ export function useWebSocket(
               title: payload.title as string,
               description: (payload.description as string) || null,
               position: payload.position as number,
+              version: (payload.version as number) ?? 1,
               created_at: new Date().toISOString(),
               updated_at: new Date().toISOString(),
             };
@@ -126,24 +182,158 @@ export function useWebSocket(
           if (isMovePendingRef.current) {
             break;
           }
-          // 其他客户端的移动，触发完整刷新
+          const shifts = payload.shifts as PositionShift[] | null | undefined;
+          const cached = queryClient.getQueryData<Task[]>(tasksKey);
+          if (!shifts || !cached?.some((task) => task.id === payload.id)) {
+            // 无位置差异或本地缺少该任务，触发完整刷新
+            queryClient.invalidateQueries({ queryKey: tasksKey });
+            break;
+          }
+          // 按区间平移就地更新两列顺序，再放置被移动的任务
+          queryClient.setQueryData<Task[]>(tasksKey, (old) =>
+            old?.map((task) => {
+              if (task.id === payload.id) {
+                return {
+                  ...task,
+                  column_id: payload.to_column_id as string,
+                  position: payload.position as number,
+                  version: (payload.version as number) ?? task.version,
+                };
+              }
+              const shift = shifts.find(
+                (s) =>
+                  s.column_id === task.column_id &&
+                  task.position >= s.start &&
+                  (s.end === null || task.position <= s.end)
+              );
+              return shift
+                ? {
+                    ...task,
+                    position: task.position + shift.delta,
+                    version: task.version + (shift.version_delta ?? 0),
+                  }
+                : task;
+            })
+          );
+          break;
+        }
+
+        case "tasks_moved": {
+          // 批量移动不携带兄弟任务的平移，重新拉取任务列表
+          if (isMovePendingRef.current) {
+            break;
+          }
           queryClient.invalidateQueries({ queryKey: tasksKey });
           break;
         }
 
         case "task_deleted": {
+          // 移除任务，并将同列 [shifted_from, shifted_to] 内的任务前移一位
+          const from = payload.shifted_from as number | null | undefined;
+          const to = payload.shifted_to as number | null | undefined;
           queryClient.setQueryData<Task[]>(tasksKey, (old) => {
             if (!old) return old;
-            return old.filter((task) => task.id !== payload.id);
+            return old
+              .filter((task) => task.id !== payload.id)
+              .map((task) =>
+                from != null &&
+                to != null &&
+                task.column_id === payload.column_id &&
+                task.position >= from &&
+                task.position <= to
+                  ? { ...task, position: task.position - 1 }
+                  : task
+              );
           });
           break;
         }
+
+        case "tasks_deleted": {
+          // 批量删除：deletions 已按应用顺序排列，逐个按单条删除处理
+          const deletions = payload.deletions as Record<string, unknown>[];
+          for (const deletion of deletions) {
+            handleEvent({ ...event, type: "task_deleted", payload: deletion });
+          }
+          break;
+        }
+
+        case "column_rebalanced": {
+          // 再平衡只改写 rank 键，顺序不变；列内任务版本号各加一
+          const rebalanced = new Set(payload.task_ids as string[]);
+          queryClient.setQueryData<Task[]>(tasksKey, (old) =>
+            old?.map((task) =>
+              rebalanced.has(task.id) ? { ...task, version: task.version + 1 } : task
+            )
+          );
+          break;
+        }
+
+        case "column_tasks_moved": {
+          // 整列迁移：被迁移任务按源列顺序放到目标列首 / 列尾
+          const taskIds = payload.task_ids as string[];
+          const toColumnId = payload.to_column_id as string;
+          const cached = queryClient.getQueryData<Task[]>(tasksKey);
+          if (!cached) break;
+          const movedIndex = new Map(taskIds.map((id, index) => [id, index]));
+          const targetCount = cached.filter(
+            (task) => task.column_id === toColumnId && !movedIndex.has(task.id)
+          ).length;
+          const top = payload.placement === "top";
+          queryClient.setQueryData<Task[]>(tasksKey, (old) =>
+            old?.map((task) => {
+              const index = movedIndex.get(task.id);
+              if (index !== undefined) {
+                return {
+                  ...task,
+                  column_id: toColumnId,
+                  position: top ? index : targetCount + index,
+                };
+              }
+              return top && task.column_id === toColumnId
+                ? { ...task, position: task.position + taskIds.length }
+                : task;
+            })
+          );
+          // 版本号的改写范围取决于服务端排序模式，后台重新拉取以对齐
+          queryClient.invalidateQueries({ queryKey: tasksKey });
+          break;
+        }
+
+        case "columns_reordered": {
+          // 按新的列 ID 顺序重排列缓存；本地缺列时重新拉取
+          const columnIds = payload.column_ids as string[];
+          const columnsKey = boardKeys.columns(boardId);
+          const cached = queryClient.getQueryData<Column[]>(columnsKey);
+          if (!cached) break;
+          const byId = new Map(cached.map((column) => [column.id, column]));
+          if (
+            columnIds.length !== cached.length ||
+            !columnIds.every((id) => byId.has(id))
+          ) {
+            queryClient.invalidateQueries({ queryKey: columnsKey });
+            break;
+          }
+          queryClient.setQueryData<Column[]>(
+            columnsKey,
+            columnIds.map((id, index) => ({ ...byId.get(id)!, order_index: index }))
+          );
+          break;
+        }
+
+        default: {
+          // 未识别的事件：无法就地应用，整体重新拉取看板
+          queryClient.invalidateQueries({ queryKey: boardKeys.detail(boardId) });
+          break;
+        }
       }
     },
     [boardId, queryClient]
   );
 
   useEffect(() => {
+    // 切换看板时重置序号，新连接从 hello 重新开始
+    lastSeqRef.current = null;
+    epochRef.current = null;
     connect();
 
     return () => {
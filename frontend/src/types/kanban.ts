@@ -29,6 +29,8 @@ export interface Task {
   title: string;
   description: string | null;
   position: number;
+  /** 乐观并发版本号（If-Match / expected_version） */
+  version: number;
   created_at: string;
   updated_at: string;
 }